@@ -0,0 +1,45 @@
+"""Files per second of the regex, ast and hybrid import extraction engines.
+
+Usage:
+    python Benchmarks/extractor_benchmark.py [source_folder]
+
+Without a folder, a synthetic corpus is generated in a temporary directory
+in which one file in ten has an import example inside a docstring, so the
+hybrid engine has to fall back to ast for it.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.extractors import EXTRACTORS
+from Model.imports_helper import scan_imports_from_bytes
+from imports_benchmark import files_per_second, write_synthetic_corpus
+
+
+def add_ambiguous_docstrings(folder, every=10):
+    files = sorted(Path(folder).rglob("*.py"))
+    for path in files[::every]:
+        source = path.read_text()
+        path.write_text('"""Example:\n\nimport example_dependency\n"""\n' + source)
+
+
+def run_benchmark(folder):
+    files = [str(path) for path in Path(folder).rglob("*.py")]
+    ambiguous = sum(scan_imports_from_bytes(Path(file_path).read_bytes(), file_path)[1] for file_path in files)
+    print(f"Benchmarking import extractors on {len(files)} files in {folder}")
+    print(f"{ambiguous} files ({100 * ambiguous / max(len(files), 1):.0f}%) are ambiguous to the regex engine\n")
+
+    for name, extractor in EXTRACTORS.items():
+        print(f"  {name:<8} {files_per_second(extractor.imports_from_file, files):>10.0f} files/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_benchmark(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            write_synthetic_corpus(folder)
+            add_ambiguous_docstrings(folder)
+            run_benchmark(folder)
@@ -0,0 +1,72 @@
+"""Memory of a dependency graph held as nx.DiGraph with Modules and as a CompactGraph.
+
+Usage:
+    python Benchmarks/graph_memory_benchmark.py [module_count] [dependencies_per_module]
+"""
+import os
+import random
+import sys
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import networkx as nx
+
+from Model.common import get_parent_module
+from Model.compact_graph import CompactGraphBuilder
+from Model.module import Module
+
+
+def synthetic_modules(module_count, dependencies_per_module, seed=0):
+    """Module names in packages of 20 modules, each with random internal dependencies."""
+    rng = random.Random(seed)
+    names = [f"project.package_{i // 400}.sub_{i // 20}.module_{i}" for i in range(module_count)]
+    return [(name, rng.sample(names, dependencies_per_module)) for name in names]
+
+
+def build_digraph(modules):
+    G = nx.DiGraph()
+    for name, dependencies in modules:
+        module = Module(name, get_parent_module(name), name.replace('.', '/') + '.py')
+        G.add_node(name, module=module)
+    for name, dependencies in modules:
+        for dependency in dependencies:
+            G.add_edge(name, dependency)
+            G.nodes[name]['module'].add_dependency(dependency)
+    return G
+
+
+def build_compact(modules):
+    builder = CompactGraphBuilder()
+    for name, _ in modules:
+        builder.add_node(name, name.replace('.', '/') + '.py')
+    for name, dependencies in modules:
+        source_id = builder.ids[name]
+        for dependency in dependencies:
+            builder.add_edge(source_id, builder.ids[dependency])
+    return builder.build([False] * len(modules))
+
+
+def measure(build, modules):
+    tracemalloc.start()
+    graph = build(modules)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, current
+
+
+def run_benchmark(module_count=100_000, dependencies_per_module=8):
+    modules = synthetic_modules(module_count, dependencies_per_module)
+    edge_count = module_count * dependencies_per_module
+    print(f"{module_count} modules, {edge_count} edges\n")
+
+    for label, build in (("nx.DiGraph + Module", build_digraph), ("CompactGraph", build_compact)):
+        graph, size = measure(build, modules)
+        print(f"  {label:<20} {size / 2**20:>8.1f} MiB  {size / edge_count:>6.1f} bytes/edge (total)")
+        if hasattr(graph, 'memory_usage'):
+            print(f"  {'':<20} {graph.memory_usage() / 2**20:>8.1f} MiB  "
+                  f"{graph.memory_usage() / edge_count:>6.1f} bytes/edge (adjacency arrays)")
+        del graph
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:3]))
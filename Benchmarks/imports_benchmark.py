@@ -0,0 +1,120 @@
+"""Files per second and allocation of the import extractors.
+
+Compares the old per-line parser, the single-pass text extractor and the
+byte prefilter used by imports_from_file (with and without mmap).
+
+Usage:
+    python Benchmarks/imports_benchmark.py [source_folder]
+
+Without a folder, two synthetic corpora are generated in a temporary
+directory: many ordinary modules, and a few large generated modules.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.imports_helper import import_from_line, imports_from_file, imports_from_source, resolve_relative_import
+
+
+def imports_from_file_by_line(file_path):
+    """The extractor imports_from_file used before the single-pass engine."""
+    all_imports = []
+
+    with open(file_path) as f:
+        lines = f.readlines()
+
+    for line in lines:
+        if line.strip().startswith('import '):
+            sublines = [subline if subline.strip().startswith('import') else 'import ' + subline
+                        for subline in line.split(',')]
+        else:
+            sublines = [line]
+        for subline in sublines:
+            for module in import_from_line(subline):
+                if module.startswith('.'):
+                    all_imports.append(resolve_relative_import(file_path, module))
+                else:
+                    all_imports.append(module)
+
+    return all_imports
+
+
+def imports_from_text(file_path):
+    """The single-pass extractor fed with the whole file decoded as text."""
+    with open(file_path) as f:
+        return imports_from_source(f.read(), file_path)
+
+
+EXTRACTORS = [
+    ("per-line (old)", imports_from_file_by_line),
+    ("single-pass text", imports_from_text),
+    ("byte prefilter", lambda file_path: imports_from_file(file_path, use_mmap=False)),
+    ("byte prefilter mmap", lambda file_path: imports_from_file(file_path, use_mmap=True)),
+]
+
+
+def write_synthetic_corpus(folder, file_count=2000, body_lines=400):
+    header = (
+        "import os\n"
+        "import sys, json\n"
+        "from collections import defaultdict\n"
+        "from .models import user\n"
+        "from ..core.util import (\n"
+        "    helper,\n"
+        "    other,\n"
+        ")\n"
+    )
+    body = "".join(f"def function_{i}(value):\n    return value + {i}\n" for i in range(body_lines // 2))
+    for i in range(file_count):
+        path = os.path.join(folder, f"pkg{i % 20}", "sub", f"module_{i}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(header + body)
+
+
+def files_per_second(extractor, files, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path in files:
+            extractor(file_path)
+        best = min(best, time.perf_counter() - start)
+    return len(files) / best
+
+
+def peak_allocation_per_file(extractor, files):
+    peaks = []
+    for file_path in files:
+        tracemalloc.start()
+        extractor(file_path)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def run_benchmark(folder):
+    files = [str(path) for path in Path(folder).rglob("*.py")]
+    print(f"Benchmarking import extraction on {len(files)} files in {folder}\n")
+
+    for name, extractor in EXTRACTORS:
+        rate = files_per_second(extractor, files)
+        peak = peak_allocation_per_file(extractor, files)
+        print(f"  {name:<20} {rate:>10.0f} files/s  {peak / 1024:>10.1f} KB peak allocation per file")
+    print()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_benchmark(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            write_synthetic_corpus(folder)
+            run_benchmark(folder)
+        with tempfile.TemporaryDirectory() as folder:
+            # Generated modules: three imports on top of 20k lines
+            write_synthetic_corpus(folder, file_count=20, body_lines=20000)
+            run_benchmark(folder)
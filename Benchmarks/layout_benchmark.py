@@ -0,0 +1,46 @@
+"""Seconds to lay out a level in Python, per layout and level size.
+
+The force-directed layout is quadratic in the number of nodes and is used up
+to FORCE_LAYOUT_MAX_NODES; above that the linear spiral layout takes over.
+Both are timed up to FORCE_BENCHMARK_LIMIT nodes.
+
+Usage:
+    python Benchmarks/layout_benchmark.py [node_count ...]
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from constants import FORCE_LAYOUT_MAX_NODES
+from gui.utils.graph_layout import force_directed_positions, spiral_positions
+
+FORCE_BENCHMARK_LIMIT = 2_000
+EDGES_PER_NODE = 3
+
+
+def time_layout(positions_of, node_count, sources, targets):
+    start = time.perf_counter()
+    positions_of(node_count, sources, targets)
+    return time.perf_counter() - start
+
+
+def run_benchmark(node_counts=(100, 500, 1_000, 10_000, 50_000)):
+    print(f"Force-directed layout up to {FORCE_LAYOUT_MAX_NODES} nodes, spiral above\n")
+    rng = np.random.default_rng(0)
+    for node_count in node_counts:
+        sources = rng.integers(0, node_count, EDGES_PER_NODE * node_count)
+        targets = rng.integers(0, node_count, EDGES_PER_NODE * node_count)
+        spiral = time_layout(spiral_positions, node_count, sources, targets)
+        print(f"{node_count:>6} nodes: spiral {spiral:>7.3f}s", end='')
+        if node_count > FORCE_BENCHMARK_LIMIT:
+            print("  force-directed skipped")
+            continue
+        force = time_layout(force_directed_positions, node_count, sources, targets)
+        print(f"  force-directed {force:>7.3f}s")
+
+
+if __name__ == "__main__":
+    run_benchmark(tuple(int(arg) for arg in sys.argv[1:]) or (100, 500, 1_000, 10_000, 50_000))
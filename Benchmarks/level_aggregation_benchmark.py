@@ -0,0 +1,67 @@
+"""Seconds to aggregate a large edge set to every depth of a package tree.
+
+Compares the vectorised LevelAggregator with a Python dictionary roll-up
+(on a sample of the edges, as it is too slow for all of them).
+
+Usage:
+    python Benchmarks/level_aggregation_benchmark.py [module_count] [edge_count]
+"""
+import os
+import sys
+import time
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from Model.level_aggregation import LevelAggregator
+from Model.package_tree import PackageTree
+
+PYTHON_SAMPLE = 1_000_000
+
+
+def synthetic_tree(module_count):
+    """Modules six levels deep: 10 top-level packages, 10 sub-packages each, and so on."""
+    names = [f"p{i % 10}.s{i // 10 % 10}.a{i // 100 % 10}.b{i // 1000 % 10}.c{i // 10000 % 10}.m{i}"
+             for i in range(module_count)]
+    return PackageTree(names), names
+
+
+def python_roll_up(tree, sources, targets, depth):
+    counts = Counter()
+    names = tree.names
+    for source, target in zip(sources.tolist(), targets.tolist()):
+        source_unit = '.'.join(names[source].split('.')[:depth + 1])
+        target_unit = '.'.join(names[target].split('.')[:depth + 1])
+        if source_unit != target_unit:
+            counts[(source_unit, target_unit)] += 1
+    return counts
+
+
+def run_benchmark(module_count=200_000, edge_count=10_000_000):
+    start = time.perf_counter()
+    tree, names = synthetic_tree(module_count)
+    module_ids = np.array([tree.ids[name] for name in names], dtype=np.int32)
+    rng = np.random.default_rng(0)
+    sources = module_ids[rng.integers(0, module_count, edge_count)]
+    targets = module_ids[rng.integers(0, module_count, edge_count)]
+    print(f"{len(tree)} tree nodes, {edge_count} edges (generated in {time.perf_counter() - start:.1f}s)\n")
+
+    start = time.perf_counter()
+    aggregator = LevelAggregator(tree, sources, targets)
+    print(f"  ancestor table        {time.perf_counter() - start:>7.2f}s")
+    for depth in range(aggregator.max_depth + 1):
+        start = time.perf_counter()
+        level_sources, _, _ = aggregator.aggregate(depth)
+        print(f"  depth {depth} (vectorised) {time.perf_counter() - start:>7.2f}s  {len(level_sources)} weighted edges")
+
+    sample = slice(0, PYTHON_SAMPLE)
+    start = time.perf_counter()
+    python_roll_up(tree, sources[sample], targets[sample], 2)
+    seconds = time.perf_counter() - start
+    print(f"\n  depth 2 (Python dict) {seconds:>7.2f}s for {PYTHON_SAMPLE} edges, "
+          f"~{seconds * edge_count / PYTHON_SAMPLE:.0f}s for all of them")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:3]))
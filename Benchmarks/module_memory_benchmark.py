@@ -0,0 +1,76 @@
+"""Bytes per node of the Module records of a synthetic module tree.
+
+Compares the plain class Module used to be with the slotted, interned one.
+
+Usage:
+    python Benchmarks/module_memory_benchmark.py [module_count]
+
+The tree mirrors what build_graph creates: one package node per 20
+modules, source modules importing a few siblings and one placeholder node
+per source module for a dependency without a source file of its own.
+"""
+import os
+import random
+import sys
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.common import get_parent_module
+from Model.module import Module
+
+
+class LegacyModule:
+    """Module as it was before it got __slots__ and interned strings."""
+
+    def __init__(self, name: str, parent_module: str, file_path: str):
+        self.name = name
+        self.parent_module = parent_module
+        self.file_path = file_path
+        self.dependencies = set()
+        self.is_package = False
+        self.depth = 0
+
+    def add_dependency(self, name):
+        self.dependencies.add(name)
+
+
+def synthetic_tree(module_count, seed=0):
+    """(name, file path, dependencies) per node, every string freshly built like a scan builds it."""
+    rng = random.Random(seed)
+    nodes = []
+    sources = module_count // 2
+    for i in range(sources):
+        package = f"project.area_{i // 2000}.package_{i // 20}"
+        if i % 20 == 0:
+            nodes.append((package, "/".join(package.split('.')) + "/", []))
+        name = f"{package}.module_{i}"
+        dependencies = [f"{package}.module_{rng.randrange(i - i % 20, i - i % 20 + 20)}" for _ in range(3)]
+        nodes.append((name, "/".join(name.split('.')) + ".py", dependencies))
+        # Placeholder node of a dependency, holding the importing file's path
+        nodes.append((f"{package}.generated_{i}", "/".join(name.split('.')) + ".py", []))
+    return nodes[:module_count]
+
+
+def bytes_per_node(module_class, nodes):
+    tracemalloc.start()
+    modules = []
+    for name, file_path, dependencies in nodes:
+        module = module_class(name, get_parent_module(name), file_path)
+        for dependency in dependencies:
+            module.add_dependency(dependency)
+        modules.append(module)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(modules)
+
+
+def run_benchmark(module_count=200_000):
+    print(f"Synthetic tree of {module_count} nodes\n")
+    for label, module_class in (("Module (before)", LegacyModule), ("Module (slotted)", Module)):
+        # A fresh copy of the strings for each run, so interning is measured fairly
+        nodes = synthetic_tree(module_count)
+        print(f"  {label:<18} {bytes_per_node(module_class, nodes):>7.0f} bytes/node")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
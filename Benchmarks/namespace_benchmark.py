@@ -0,0 +1,61 @@
+"""Classification throughput of the old startswith loop and the NamespaceIndex.
+
+Usage:
+    python Benchmarks/namespace_benchmark.py
+
+Imports are drawn from repositories with a growing number of top-level
+packages; a third of them are internal, the rest stdlib or third-party.
+"""
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.namespace_index import NamespaceIndex
+
+IMPORT_COUNT = 100_000
+EXTERNAL_IMPORTS = ['os', 'os.path', 'json', 'numpy', 'django.db.models', 'requests', 'sqlalchemy.orm']
+
+
+def dependency_is_internal(dependency, top_level_packages):
+    """The classifier add_source_file used before the NamespaceIndex."""
+    for dir in top_level_packages:
+        if dependency.startswith(dir):
+            return True
+    return False
+
+
+def synthetic_imports(top_level_packages, count=IMPORT_COUNT, seed=0):
+    rng = random.Random(seed)
+    imports = []
+    for i in range(count):
+        if i % 3 == 0:
+            imports.append(f"{rng.choice(top_level_packages)}.module_{rng.randrange(50)}.sub")
+        else:
+            imports.append(rng.choice(EXTERNAL_IMPORTS))
+    return imports
+
+
+def imports_per_second(is_internal, imports):
+    start = time.perf_counter()
+    for dependency in imports:
+        is_internal(dependency)
+    return len(imports) / (time.perf_counter() - start)
+
+
+def run_benchmark():
+    print(f"Classifying {IMPORT_COUNT} imports\n")
+    print(f"  {'top-level':>10} {'startswith (old)':>18} {'NamespaceIndex':>16}")
+    for top_level_count in (10, 100, 500, 1000):
+        top_level_packages = [f"package_{i}" for i in range(top_level_count)]
+        imports = synthetic_imports(top_level_packages)
+        namespace = NamespaceIndex(top_level_packages)
+
+        old = imports_per_second(lambda dependency: dependency_is_internal(dependency, top_level_packages), imports)
+        new = imports_per_second(namespace.is_internal, imports)
+        print(f"  {top_level_count:>10} {old:>16.0f}/s {new:>14.0f}/s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
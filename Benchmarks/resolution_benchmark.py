@@ -0,0 +1,113 @@
+"""Stage timings of a graph build and hierarchy with and without the resolution caches.
+
+The uncached run swaps in the name/path helpers Model/common had before
+they were memoized.
+
+Usage:
+    python Benchmarks/resolution_benchmark.py [file_count]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Model.common
+import Model.compact_graph
+import Model.graph_builder
+import Model.hierarchy
+import Model.imports_helper
+import Model.sources
+
+# Every module that imported one of the helpers by name
+HELPER_USERS = (Model.graph_builder, Model.hierarchy, Model.imports_helper, Model.compact_graph)
+
+
+def legacy_module_name_from_file_path(full_path):
+    relative = Path(full_path)
+    try:
+        relative = relative.relative_to(Path(Model.common.CODE_ROOT_FOLDER))
+    except ValueError:
+        pass
+    module_name = str(relative)
+    module_name = module_name.replace("/__init__.py", "")
+    module_name = module_name.replace("/", ".")
+    return module_name.replace(".py", "")
+
+
+def legacy_file_path_from_module_name(module_name, directories=None):
+    full_path = os.path.join(Model.common.CODE_ROOT_FOLDER, os.path.join(*module_name.split('.')))
+    is_dir = directories.is_directory(module_name) if directories is not None else os.path.isdir(full_path)
+    return full_path + os.path.sep if is_dir else f"{full_path}.py"
+
+
+def legacy_get_parent_module(module_name):
+    path = module_name.split('.')
+    parent_depth = len(path) - 1
+    parent_path = ""
+    for i in range(parent_depth):
+        if i == parent_depth - 1:
+            parent_path += path[i]
+        else:
+            parent_path += path[i] + "."
+    return parent_path
+
+
+LEGACY_HELPERS = {
+    'module_name_from_file_path': legacy_module_name_from_file_path,
+    'file_path_from_module_name': legacy_file_path_from_module_name,
+    'get_parent_module': legacy_get_parent_module,
+}
+
+
+def write_synthetic_repo(root, file_count):
+    for i in range(file_count):
+        package = os.path.join(root, f"pkg{i % 20}", f"area{i % 200}", f"sub{i % 1000}")
+        os.makedirs(package, exist_ok=True)
+        Path(package, "__init__.py").touch()
+        with open(os.path.join(package, f"module_{i}.py"), 'w') as f:
+            f.write(f"import pkg{(i + 1) % 20}.area{(i + 3) % 200}.sub{(i + 7) % 1000}.module_{(i + 11) % file_count}\n"
+                    "from . import sibling\n"
+                    "from ..util import helpers\n")
+
+
+def timed_analysis():
+    timings = {}
+    G = Model.graph_builder.get_dependencies_digraph(workers=1, use_cache=False, enumeration='walk')
+    timings.update(G.graph['timings'])
+    start = time.perf_counter()
+    Model.hierarchy.ModuleHierarchy(G)
+    timings['hierarchy'] = time.perf_counter() - start
+    return timings
+
+
+def run_benchmark(file_count=20_000):
+    with tempfile.TemporaryDirectory() as folder:
+        root = os.path.join(folder, "repo") + os.path.sep
+        write_synthetic_repo(root, file_count)
+        for module in (Model.common, Model.sources):
+            module.CODE_ROOT_FOLDER = root
+        Model.graph_builder.SCAN_CACHE_FILE = os.path.join(folder, "scan_cache.json")
+
+        cached = timed_analysis()
+        originals = {}
+        for module in HELPER_USERS:
+            for name, helper in LEGACY_HELPERS.items():
+                if hasattr(module, name):
+                    originals[(module, name)] = getattr(module, name)
+                    setattr(module, name, helper)
+        try:
+            uncached = timed_analysis()
+        finally:
+            for (module, name), helper in originals.items():
+                setattr(module, name, helper)
+
+    print(f"\n{file_count} files, single worker\n")
+    print(f"  {'stage':<15} {'uncached':>10} {'cached':>10}")
+    for stage in cached:
+        print(f"  {stage:<15} {uncached[stage]:>9.3f}s {cached[stage]:>9.3f}s")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,98 @@
+"""Seconds to turn one hierarchy level into vis-network nodes and edges.
+
+Compares the direct DataSet emitter with the pyvis Network construction the
+panel used before, for levels of 1k, 10k and 50k nodes. pyvis is only run
+up to PYVIS_LIMIT nodes, as its linear membership checks make it quadratic.
+
+Usage:
+    python Benchmarks/vis_emitter_benchmark.py [node_count ...]
+"""
+import json
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import networkx as nx
+from pyvis.network import Network
+
+from Model.hierarchy import ModuleHierarchy
+from Model.module import Module
+from gui.utils.vis_emitter import dataset_diff, level_network
+
+PYVIS_LIMIT = 10_000
+DEPENDENCIES_PER_MODULE = 3
+
+
+def synthetic_level(node_count, seed=0):
+    """Hierarchy whose 'app' level holds node_count modules and packages."""
+    rng = random.Random(seed)
+    package_count = node_count // 10
+    names = [f"app.pkg{i}" for i in range(package_count)]
+    names += [f"app.pkg{i}.inner" for i in range(package_count)]
+    names += [f"app.m{i}" for i in range(node_count - package_count)]
+
+    G = nx.DiGraph()
+    for name in ['app'] + names:
+        module = Module(name, name.rpartition('.')[0], name.replace('.', '/') + '.py')
+        module.is_package = name == 'app' or name.count('.') == 1 and name.startswith('app.pkg')
+        G.add_node(name, module=module)
+    for name in names:
+        for dependency in rng.sample(names, DEPENDENCIES_PER_MODULE):
+            if dependency != name:
+                G.add_edge(name, dependency)
+                G.nodes[name]['module'].add_dependency(dependency)
+    return ModuleHierarchy(G)
+
+
+def pyvis_level_network(hierarchy, path):
+    """The panel's former construction: one pyvis node and edge at a time."""
+    net = Network(directed=True)
+    level_view = hierarchy.get_level_view(path)
+    for package in level_view['packages']:
+        net.add_node(package, label=package, title=f"{path}.{package}", color="#ff9900", shape="box", size=25)
+    for module in level_view['modules']:
+        display_name = module.name[len(path) + 1:]
+        net.add_node(display_name, label=display_name, title=module.name, color="#66ccff", shape="dot", size=15)
+    for (source, target), weight in hierarchy.get_aggregated_dependencies(path).items():
+        source_display, target_display = source, target
+        if source.startswith(path + '.') and target.startswith(path + '.'):
+            source_display, target_display = source.split('.')[-1], target.split('.')[-1]
+        elif source.startswith(path + '.'):
+            source_display = source[len(path) + 1:]
+        # The old panel called net.get_node for both ends, a scan of the node list each
+        if source_display not in net.get_nodes() or target_display not in net.get_nodes():
+            continue
+        net.add_edge(source_display, target_display, label=str(weight),
+                     title=f"{source} → {target}: {weight} dependencies",
+                     color="#3182bd", arrows={'to': True}, width=1.5)
+    return net.nodes, net.edges
+
+
+def run_benchmark(node_counts=(1_000, 10_000, 50_000)):
+    for node_count in node_counts:
+        hierarchy = synthetic_level(node_count)
+        # Roll-up once up front, both implementations then only read it
+        hierarchy.get_aggregated_dependencies('app')
+
+        start = time.perf_counter()
+        nodes, edges = level_network(hierarchy, 'app')
+        emit_seconds = time.perf_counter() - start
+        # What the panel pushes to an empty viewer page
+        start = time.perf_counter()
+        payload = json.dumps({'nodes': dataset_diff({}, nodes), 'edges': dataset_diff({}, edges)})
+        push_seconds = time.perf_counter() - start
+        print(f"{len(nodes):>6} nodes {len(edges):>7} edges: direct {emit_seconds:>7.3f}s "
+              f"(+{push_seconds:.3f}s diff, {len(payload) / 2**20:.1f} MiB)", end='')
+
+        if node_count > PYVIS_LIMIT:
+            print("  pyvis skipped")
+            continue
+        start = time.perf_counter()
+        pyvis_level_network(hierarchy, 'app')
+        print(f"  pyvis {time.perf_counter() - start:>7.3f}s")
+
+
+if __name__ == "__main__":
+    run_benchmark(tuple(int(arg) for arg in sys.argv[1:]) or (1_000, 10_000, 50_000))
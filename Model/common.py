@@ -1,6 +1,73 @@
 import os
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from constants import CODE_ROOT_FOLDER
+from constants import CODE_ROOT_FOLDER, RESOLUTION_CACHE_SIZE
+
+# Root folder the resolution caches were filled for
+_cached_root = None
+
+
+def clear_resolution_cache():
+    """Empty the memoized name/path resolutions, e.g. at the start of an analysis."""
+    global _cached_root
+    _cached_root = CODE_ROOT_FOLDER
+    for cached in (_module_name_from_file_path, _module_file_path, get_parent_module):
+        cached.cache_clear()
+
+
+def resolution_cache_info():
+    """Hits and misses of the resolution caches, by helper."""
+    return {
+        'module_name_from_file_path': _module_name_from_file_path.cache_info(),
+        'file_path_from_module_name': _module_file_path.cache_info(),
+        'get_parent_module': get_parent_module.cache_info(),
+    }
+
+
+def _check_root():
+    # Resolutions depend on CODE_ROOT_FOLDER, so a new root starts from empty caches
+    if CODE_ROOT_FOLDER != _cached_root:
+        clear_resolution_cache()
+
+
+@contextmanager
+def stage_timer(timings, stage):
+    """Record the wall-clock seconds of a stage in the timings dict."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def print_stage_timings(timings):
+    stages = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in timings.items())
+    print(f"Stage timings: {stages}")
+
+
+class AnalysisCancelled(Exception):
+    """Raised by a progress callback to stop an analysis at its next checkpoint."""
+
+
+def report_progress(progress, stage, done=0, total=0):
+    """
+    Pass the progress of an analysis stage to an optional callback.
+
+    Every call is a cancellation checkpoint: the callback may raise
+    AnalysisCancelled, so only call this where stopping leaves no
+    half-updated state behind.
+
+    Args:
+        progress: Callable taking (stage, done, total), or None
+        stage: Name of the current stage (e.g. 'scan')
+        done: Items of the stage finished so far
+        total: Items in the stage, 0 if unknown
+    """
+    if progress is not None:
+        progress(stage, done, total)
+
 
 # Extracts modules from file names
 def module_name_from_file_path(full_path):
@@ -10,9 +77,14 @@ def module_name_from_file_path(full_path):
         zeeguu/core/model/user.py -> zeeguu.core.model.user
         zeeguu/core/model/__init__.py -> zeeguu.core.model
     """
+    _check_root()
+    return _module_name_from_file_path(full_path, CODE_ROOT_FOLDER)
+
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def _module_name_from_file_path(full_path, code_root_folder):
     # Convert to Path object for safer path manipulation
     path = Path(full_path)
-    root = Path(CODE_ROOT_FOLDER)
+    root = Path(code_root_folder)
     
     # Get relative path from root
     try:
@@ -30,7 +102,7 @@ def module_name_from_file_path(full_path):
 
     return module_name
 
-def file_path_from_module_name(module_name):
+def file_path_from_module_name(module_name, directories=None):
     """Convert a module name to a file path.
     
     Examples:
@@ -39,25 +111,35 @@ def file_path_from_module_name(module_name):
     
     Args:
         module_name: Dotted module name (e.g., 'zeeguu.core.model')
+        directories: DirectorySnapshot of CODE_ROOT_FOLDER; the file system
+            is checked when not given
         
     Returns:
         str: File path corresponding to the module name
     """
 
-    # Convert dots to directory separators
-    path_parts = module_name.split('.')
-    relative_path = os.path.join(*path_parts)
-    
-    # Full path in the filesystem
-    full_path = os.path.join(CODE_ROOT_FOLDER, relative_path)
+    _check_root()
+    full_path = _module_file_path(module_name, CODE_ROOT_FOLDER)
     
     # Check if this is a package (directory)
-    if os.path.isdir(full_path):
+    is_dir = directories.is_directory(module_name) if directories is not None else os.path.isdir(full_path)
+    if is_dir:
         return full_path + os.path.sep  # Return directory with trailing slash
     
     # Otherwise, it's a regular module
     return f"{full_path}.py"
 
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
+def _module_file_path(module_name, code_root_folder):
+    """Full path of a module name without extension, e.g. <root>/zeeguu/core/model."""
+    # Convert dots to directory separators
+    path_parts = module_name.split('.')
+    relative_path = os.path.join(*path_parts)
+    
+    # Full path in the filesystem
+    return os.path.join(code_root_folder, relative_path)
+
+@lru_cache(maxsize=RESOLUTION_CACHE_SIZE)
 def get_parent_module(module_name):
     """Extract the parent module name from a dotted module path.
     
@@ -65,17 +147,7 @@ def get_parent_module(module_name):
     - 'app.components' -> 'app'
     - 'app' -> ''  (a top-level module has no parent)
     """
-    path = module_name.split('.')
-    parent_depth = len(path) - 1
-    parent_path = ""
-    
-    for i in range(parent_depth):
-        if i == parent_depth - 1:
-            parent_path += path[i]
-        else:
-            parent_path += path[i] + "."
-
-    return parent_path
+    return module_name.rpartition('.')[0]
 
 def file_path(file_name):
     """Convert a relative file path to absolute path using CODE_ROOT_FOLDER."""
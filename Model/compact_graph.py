@@ -0,0 +1,283 @@
+import sys
+from array import array
+
+import networkx as nx
+import numpy as np
+
+from .common import file_path_from_module_name, get_parent_module
+from .module import Module
+
+
+class CompactGraph:
+    """Read-only dependency graph stored as integer IDs and CSR adjacency arrays.
+
+    Module names are interned and numbered 0..n-1 in insertion order. The
+    dependencies of node i are successors[successor_offsets[i]:successor_offsets[i + 1]]
+    and its dependants are the matching slice of the reverse arrays, so an
+    edge costs 8 bytes (4 each way) instead of a NetworkX adjacency entry and
+    a string in a Module's dependency set.
+
+    The `nodes` view behaves like the parts of a NetworkX NodeView that
+    ModuleHierarchy and the GUI use; its Module-like objects are created on
+    access and read everything from the arrays. Conversion to and from
+    nx.DiGraph only happens through to_digraph() and from_digraph().
+    """
+
+    def __init__(self, names, source_paths, is_package, successor_offsets, successors, attributes=None, ids=None):
+        """
+        Args:
+            names: Module names, the index of a name being its node ID
+            source_paths: {node ID: file path} of the nodes backed by a source file
+            is_package: Boolean array, True for packages
+            successor_offsets: int64 array of n + 1 offsets into successors
+            successors: int32 array of dependency node IDs, sorted per node
+            attributes: Graph attributes (commit, engine, ...) as in nx.DiGraph.graph
+            ids: {name: node ID}, derived from names when not given
+        """
+        self.names = names
+        self.ids = ids if ids is not None else {name: node_id for node_id, name in enumerate(names)}
+        self.source_paths = source_paths
+        self.is_package = is_package
+        self.depth = np.fromiter((name.count('.') for name in names), dtype=np.int16, count=len(names))
+        self.successor_offsets = successor_offsets
+        self.successors_array = successors
+        self.predecessor_offsets, self.predecessors_array = _reverse_csr(successor_offsets, successors)
+        self.graph = dict(attributes or {})
+        self.nodes = CompactNodeView(self)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def number_of_nodes(self):
+        return len(self.names)
+
+    def number_of_edges(self):
+        return len(self.successors_array)
+
+    def successor_ids(self, node_id):
+        return self.successors_array[self.successor_offsets[node_id]:self.successor_offsets[node_id + 1]]
+
+    def predecessor_ids(self, node_id):
+        return self.predecessors_array[self.predecessor_offsets[node_id]:self.predecessor_offsets[node_id + 1]]
+
+    def successors(self, name):
+        """Names of the modules the given module depends on."""
+        return [self.names[node_id] for node_id in self.successor_ids(self.ids[name]).tolist()]
+
+    def predecessors(self, name):
+        """Names of the modules depending on the given module."""
+        return [self.names[node_id] for node_id in self.predecessor_ids(self.ids[name]).tolist()]
+
+    def out_degree(self, name):
+        node_id = self.ids[name]
+        return int(self.successor_offsets[node_id + 1] - self.successor_offsets[node_id])
+
+    def in_degree(self, name):
+        node_id = self.ids[name]
+        return int(self.predecessor_offsets[node_id + 1] - self.predecessor_offsets[node_id])
+
+    def edge_arrays(self):
+        """(source IDs, target IDs) of every edge, for vectorised computations."""
+        sources = np.repeat(np.arange(len(self.names), dtype=np.int32), np.diff(self.successor_offsets))
+        return sources, self.successors_array
+
+    @property
+    def edges(self):
+        sources, targets = self.edge_arrays()
+        return [(self.names[source], self.names[target]) for source, target in zip(sources.tolist(), targets.tolist())]
+
+    def file_path(self, name):
+        """Source file of a module, or the path file_path_from_module_name derives for it."""
+        node_id = self.ids[name]
+        if node_id in self.source_paths:
+            return self.source_paths[node_id]
+        return file_path_from_module_name(name, self.graph.get('directories'))
+
+    def module(self, name):
+        return CompactModule(self, self.ids[name])
+
+    def memory_usage(self):
+        """Bytes held by the adjacency arrays and package flags."""
+        arrays = (self.successor_offsets, self.successors_array, self.predecessor_offsets,
+                  self.predecessors_array, self.is_package, self.depth)
+        return sum(a.nbytes for a in arrays)
+
+    @classmethod
+    def from_digraph(cls, G):
+        """Compact copy of a dependency graph built by graph_builder.
+
+        Only the file paths of source files (G.graph['sources']) are kept;
+        the paths of other nodes are derived from their names again.
+        """
+        builder = CompactGraphBuilder()
+        for node_name in G.nodes:
+            builder.add_node(node_name)
+        for source, target in G.edges:
+            builder.add_edge(builder.ids[source], builder.ids[target])
+        for module_name, file_path in G.graph.get('sources', {}).items():
+            if module_name in builder.ids:
+                builder.add_node(module_name, file_path)
+        packages = [G.nodes[node_name]['module'].is_package for node_name in G.nodes]
+        # Source counts are derived from the sources, and rebuilt by the first incremental update
+        attributes = {key: value for key, value in G.graph.items() if key not in ('sources', 'source_descendants')}
+        return builder.build(packages, attributes)
+
+    def to_digraph(self):
+        """nx.DiGraph with a Module per node, as graph_builder builds it."""
+        G = nx.DiGraph()
+        G.graph.update(self.graph)
+        G.graph['sources'] = {self.names[node_id]: path for node_id, path in self.source_paths.items()}
+        for node_id, name in enumerate(self.names):
+            module = Module(name, get_parent_module(name), self.file_path(name))
+            module.is_package = bool(self.is_package[node_id])
+            module.depth = int(self.depth[node_id])
+            module.dependencies = {self.names[target] for target in self.successor_ids(node_id).tolist()}
+            G.add_node(name, module=module)
+        G.add_edges_from(self.edges)
+        return G
+
+
+class CompactModule:
+    """Module-like view of one node of a CompactGraph.
+
+    Two views of the same node compare equal, so they can be stored in the
+    sets ModuleHierarchy keeps per level.
+    """
+
+    __slots__ = ('graph', 'node_id')
+
+    def __init__(self, graph, node_id):
+        self.graph = graph
+        self.node_id = node_id
+
+    @property
+    def name(self):
+        return self.graph.names[self.node_id]
+
+    @property
+    def parent_module(self):
+        return get_parent_module(self.name)
+
+    @property
+    def file_path(self):
+        return self.graph.file_path(self.name)
+
+    @property
+    def is_package(self):
+        return bool(self.graph.is_package[self.node_id])
+
+    @property
+    def depth(self):
+        return int(self.graph.depth[self.node_id])
+
+    @property
+    def dependencies(self):
+        names = self.graph.names
+        return frozenset(names[target] for target in self.graph.successor_ids(self.node_id).tolist())
+
+    def get_dependencies(self):
+        return self.dependencies
+
+    def get_number_of_dependencies(self):
+        return len(self.graph.successor_ids(self.node_id))
+
+    def __eq__(self, other):
+        return isinstance(other, CompactModule) and other.graph is self.graph and other.node_id == self.node_id
+
+    def __hash__(self):
+        return hash(self.node_id)
+
+    def __repr__(self):
+        return f"CompactModule({self.name!r})"
+
+
+class CompactNodeView:
+    """The subset of a NetworkX NodeView used by ModuleHierarchy and the GUI."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        if not data:
+            return iter(self._graph.names)
+        return ((name, {'module': CompactModule(self._graph, node_id)})
+                for node_id, name in enumerate(self._graph.names))
+
+    def __iter__(self):
+        return iter(self._graph.names)
+
+    def __len__(self):
+        return len(self._graph.names)
+
+    def __contains__(self, name):
+        return name in self._graph.ids
+
+    def __getitem__(self, name):
+        return {'module': CompactModule(self._graph, self._graph.ids[name])}
+
+    def get(self, name, default=None):
+        if name not in self._graph.ids:
+            return default
+        return self[name]
+
+
+class CompactGraphBuilder:
+    """Collects interned nodes and integer edges, then freezes them into a CompactGraph."""
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.source_paths = {}
+        self._edge_sources = array('i')
+        self._edge_targets = array('i')
+
+    def add_node(self, name, file_path=None):
+        """ID of the node, added if new. A file path marks the node as backed by a source file."""
+        node_id = self.ids.get(name)
+        if node_id is None:
+            name = sys.intern(name)
+            node_id = len(self.names)
+            self.ids[name] = node_id
+            self.names.append(name)
+        if file_path is not None:
+            self.source_paths[node_id] = file_path
+        return node_id
+
+    def add_edge(self, source_id, target_id):
+        self._edge_sources.append(source_id)
+        self._edge_targets.append(target_id)
+
+    def build(self, is_package, attributes=None):
+        """
+        Args:
+            is_package: One package flag per node, in ID order
+            attributes: Graph attributes to copy onto the CompactGraph
+        """
+        node_count = len(self.names)
+        sources = np.frombuffer(self._edge_sources, dtype=np.int32).astype(np.int64)
+        targets = np.frombuffer(self._edge_targets, dtype=np.int32).astype(np.int64)
+
+        # Sorting the combined keys orders edges by source, then target, and drops duplicates
+        keys = np.unique(sources * max(node_count, 1) + targets)
+        edge_sources = keys // max(node_count, 1)
+        successors = (keys % max(node_count, 1)).astype(np.int32)
+        offsets = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_sources, minlength=node_count), out=offsets[1:])
+
+        return CompactGraph(self.names, self.source_paths, np.asarray(is_package, dtype=bool),
+                            offsets, successors, attributes, self.ids)
+
+
+def _reverse_csr(offsets, targets):
+    node_count = len(offsets) - 1
+    sources = np.repeat(np.arange(node_count, dtype=np.int32), np.diff(offsets))
+    order = np.argsort(targets, kind='stable')
+    reverse_offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=node_count), out=reverse_offsets[1:])
+    return reverse_offsets, sources[order]
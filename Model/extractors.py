@@ -0,0 +1,107 @@
+import ast
+from abc import ABC, abstractmethod
+
+from constants import IMPORT_EXTRACTOR
+from .imports_helper import imports_from_bytes, read_source, resolve_relative_import, scan_imports_from_bytes
+
+
+class ImportExtractor(ABC):
+    """Interface of the engines build_graph can use to extract imports from a file.
+
+    Engines are looked up by name with get_extractor, so the one used for an
+    analysis run can be picked with a plain string that also travels to scan
+    worker processes and into the scan cache.
+    """
+    name = None
+
+    def imports_from_file(self, file_path, use_mmap=None):
+        """
+        Extract the modules imported by a file.
+
+        Files of at least MMAP_THRESHOLD bytes are memory-mapped rather than
+        read, so imports_from_bytes may get an mmap instead of bytes.
+
+        Args:
+            file_path: Path to the Python source file
+            use_mmap: Force (True) or avoid (False) mapping the file, None to decide by size
+
+        Returns:
+            list: Module names in order of appearance, relative imports resolved
+        """
+        return read_source(file_path, lambda data: self.imports_from_bytes(data, file_path), use_mmap)
+
+    @abstractmethod
+    def imports_from_bytes(self, data, file_path):
+        """
+        Extract the modules imported by source code that is already in memory.
+
+        Args:
+            data: Raw contents of the file, as bytes or an mmap
+            file_path: Path the contents belong to, used to resolve relative imports
+
+        Returns:
+            list: Module names in order of appearance, relative imports resolved
+        """
+
+
+class RegexExtractor(ImportExtractor):
+    """Byte-level pattern matching. Fast, but blind to strings and odd formatting."""
+    name = 'regex'
+
+    def imports_from_bytes(self, data, file_path):
+        return imports_from_bytes(data, file_path)
+
+
+class AstExtractor(ImportExtractor):
+    """Parses the whole file with the ast module. Exact, but several times slower."""
+    name = 'ast'
+
+    def imports_from_bytes(self, data, file_path):
+        try:
+            # ast needs the whole source in memory, so a mapped file is copied here
+            tree = ast.parse(data if isinstance(data, bytes) else data[:], filename=file_path)
+        except (SyntaxError, ValueError):
+            # Not valid Python 3 (e.g. Python 2 sources), fall back to the pattern scan
+            return scan_imports_from_bytes(data, file_path, detect_ambiguity=False)[0]
+        return imports_from_tree(tree, file_path)
+
+
+class HybridExtractor(ImportExtractor):
+    """Runs the regex engine everywhere and the AST engine only on ambiguous files."""
+    name = 'hybrid'
+
+    def __init__(self):
+        self.ast_extractor = AstExtractor()
+
+    def imports_from_bytes(self, data, file_path):
+        imports, ambiguous = scan_imports_from_bytes(data, file_path)
+        if ambiguous:
+            return self.ast_extractor.imports_from_bytes(data, file_path)
+        return imports
+
+
+def imports_from_tree(tree, file_path):
+    """Module names imported anywhere in a parsed module, in source order."""
+    statements = [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
+    statements.sort(key=lambda node: (node.lineno, node.col_offset))
+
+    all_imports = []
+    for node in statements:
+        if isinstance(node, ast.Import):
+            all_imports.extend(alias.name for alias in node.names)
+        elif node.level:
+            relative_import = '.' * node.level + (node.module or '')
+            all_imports.append(resolve_relative_import(file_path, relative_import))
+        else:
+            all_imports.append(node.module)
+    return all_imports
+
+
+EXTRACTORS = {extractor.name: extractor for extractor in (RegexExtractor(), AstExtractor(), HybridExtractor())}
+
+
+def get_extractor(name=IMPORT_EXTRACTOR):
+    """Get the import extraction engine registered under name ('regex', 'ast' or 'hybrid')."""
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown import extractor '{name}', expected one of {sorted(EXTRACTORS)}")
+    return EXTRACTORS[name]
@@ -1,18 +1,38 @@
+import multiprocessing
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from . import common
 from .module import Module
 from matplotlib import pyplot as plt
 import networkx as nx
-from pathlib import Path
 
-from .common import file_path_from_module_name, get_parent_module, module_name_from_file_path
-from constants import CODE_ROOT_FOLDER
-from .imports_helper import imports_from_file
+from .common import (file_path_from_module_name, get_parent_module, module_name_from_file_path,
+                     clear_resolution_cache, resolution_cache_info, stage_timer, print_stage_timings,
+                     report_progress)
+from constants import (CODE_ROOT_FOLDER, SCAN_WORKERS, SCAN_CHUNK_SIZE, SCAN_CACHE_FILE, IMPORT_EXTRACTOR,
+                       SOURCE_ENUMERATION)
+from .extractors import get_extractor
+from .ignore_rules import ignore_file_contents
+from .scan_cache import ScanCache
+from .sources import list_sources, current_commit, current_repository, uncommitted_source_files
+from .namespace_index import NamespaceIndex, INTERNAL, EXTERNAL, STDLIB
+from .compact_graph import CompactGraphBuilder
 from .hierarchy import ModuleHierarchy
 
-def get_dependencies_digraph():
-    G = build_graph()
-    G = set_package_flags(G)
-    G = set_depth(G)
+def get_dependencies_digraph(workers=SCAN_WORKERS, use_cache=True, engine=IMPORT_EXTRACTOR,
+                             enumeration=SOURCE_ENUMERATION, progress=None):
+    G = build_graph(workers, use_cache=use_cache, engine=engine, enumeration=enumeration, progress=progress)
+    timings = G.graph['timings']
+    report_progress(progress, 'package flags')
+    with stage_timer(timings, 'package flags'):
+        G = set_package_flags(G)
+    with stage_timer(timings, 'depth'):
+        G = set_depth(G)
+    print_stage_timings(timings)
+    cache_info = resolution_cache_info()
+    print("Resolution cache: " + ", ".join(f"{helper} {info.hits} hits/{info.misses} misses"
+                                           for helper, info in cache_info.items()) + "\n")
     return G
 
 def get_module_hierarchy():
@@ -20,74 +40,252 @@ def get_module_hierarchy():
     G = get_dependencies_digraph()
     return ModuleHierarchy(G)
 
-def dependency_is_internal(dependency, top_level_packages):
-    for dir in top_level_packages:
-        if dependency.startswith(dir):
-            return True
-    return False
-
-
-def get_top_level_packages():
+def get_top_level_packages(enumeration=SOURCE_ENUMERATION):
     print(f"Identifying top level packages...\n")
-    dirs = Path(CODE_ROOT_FOLDER).glob("[!.]*/")  # Exclude directories starting with '.'
-    dirs = [dir.name for dir in dirs]
-    return dirs
+    return list_sources(enumeration).top_level_packages
 
 
-def set_ancestor_paths(G, source_module_name):
+def set_ancestor_paths(G, source_module_name, directories=None):
     parts = source_module_name.split('.')
     current = ''
     for _, part in enumerate(parts[:-1]):  # Skip the last part (actual module)
         parent = current
         current = f"{current}.{part}" if current else part
         if current not in G.nodes:
-            G.add_node(current, module=Module(current, parent, file_path_from_module_name(current)))
+            G.add_node(current, module=Module(current, parent, file_path_from_module_name(current, directories)))
     return G
 
 
-def build_graph():
+def scan_files(file_paths, workers=SCAN_WORKERS, chunk_size=SCAN_CHUNK_SIZE, cache=None, engine=IMPORT_EXTRACTOR,
+               progress=None, retain=False):
+    """Extract the imports of every file, in parallel when more than one worker is used.
+
+    Files are handed to a process pool in batches of chunk_size. The results
+    come back in the same order as file_paths, so a graph built from them is
+    identical to one built from a serial scan. When a ScanCache is given, only
+    files whose fingerprint changed since the last scan are parsed.
+
+    Args:
+        file_paths: List of paths to Python source files
+        workers: Number of worker processes (None uses every CPU core)
+        chunk_size: Number of files sent to a worker at a time
+        cache: Optional ScanCache holding the imports of previously scanned files
+        engine: Name of the import extractor to use ('regex', 'ast' or 'hybrid')
+        progress: Optional callback, told after every file how many are scanned
+        retain: Drop the cache entries of every file not in file_paths. Only for
+            scans of the whole repository, not of a few changed files
+
+    Returns:
+        list: One list of imported module names per file
+    """
+    extractor = get_extractor(engine)
+    if cache is None:
+        return _extract_imports(file_paths, workers, chunk_size, extractor, progress)
+
+    results = [cache.lookup(file_path) for file_path in file_paths]
+    changed = [i for i, imports in enumerate(results) if imports is None]
+    print(f"Scan cache: {cache.hits} unchanged, {cache.misses} to parse")
+
+    # Files found in the cache count as scanned already
+    extracted = _extract_imports([file_paths[i] for i in changed], workers, chunk_size, extractor, progress,
+                                 scanned=len(file_paths) - len(changed), total=len(file_paths))
+    for i, imports in zip(changed, extracted):
+        results[i] = imports
+        cache.store(file_paths[i], imports)
+
+    if retain:
+        cache.retain(file_paths)
+    cache.save()
+    return results
+
+
+def _extract_imports(file_paths, workers, chunk_size, extractor, progress=None, scanned=0, total=None):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    total = len(file_paths) if total is None else total
+    report_progress(progress, 'scan', scanned, total)
+
+    # A process pool is not worth starting for a handful of files
+    if workers <= 1 or len(file_paths) <= chunk_size:
+        return _collect_imports(map(extractor.imports_from_file, file_paths), progress, scanned, total)
+
+    print(f"Scanning {len(file_paths)} files with {workers} workers...")
+    # Workers import the modules afresh, so they are told the root relative imports resolve against
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                             initializer=_set_code_root, initargs=(common.CODE_ROOT_FOLDER,)) as executor:
+        results = executor.map(extractor.imports_from_file, file_paths, chunksize=chunk_size)
+        try:
+            return _collect_imports(results, progress, scanned, total)
+        except BaseException:
+            # Do not wait for the chunks nobody will read any more
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def _pool_context():
+    """
+    Start method for scan workers. Forking a process whose Qt threads hold locks
+    can deadlock the children, so workers come from a fork server, or are
+    spawned where there is none (Windows).
+    """
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(start_method)
+
+
+def _set_code_root(code_root):
+    common.CODE_ROOT_FOLDER = code_root
+
+
+def _collect_imports(results, progress, scanned, total):
+    file_imports = []
+    for imports in results:
+        file_imports.append(imports)
+        report_progress(progress, 'scan', scanned + len(file_imports), total)
+    return file_imports
+
+
+def build_graph(workers=SCAN_WORKERS, chunk_size=SCAN_CHUNK_SIZE, use_cache=True, engine=IMPORT_EXTRACTOR,
+                enumeration=SOURCE_ENUMERATION, progress=None):
     print(f"Building dependencies digraph...")
-    files = Path(CODE_ROOT_FOLDER).rglob("*.py")
+    timings = {}
+    sources, namespace, file_imports = scan_sources(workers, chunk_size, use_cache, engine, enumeration, timings,
+                                                    progress)
     G = nx.DiGraph()
-    
-    top_level_packages = get_top_level_packages()
 
-    for file in files:
-        file_path = str(file)
+    with stage_timer(timings, 'graph'):
+        for done, (file_path, imports) in enumerate(zip(sources.files, file_imports), start=1):
+            add_source_file(G, file_path, imports, namespace, sources.directories)
+            report_progress(progress, 'graph', done, len(sources.files))
 
-        source_module_name = module_name_from_file_path(file_path)
-        parent_module_name = get_parent_module(source_module_name)
+    # Recorded so the graph can later be patched from a git diff
+    G.graph.update(graph_attributes(sources, namespace, engine))
+    G.graph['timings'] = timings
 
-        G = set_ancestor_paths(G, source_module_name)
+    print(f"Nodes created: {len(G.nodes)}\n")
+    return G
 
-        if "__init__" in file_path:
-            source_module = Module(source_module_name, parent_module_name, file_path)
-            source_module.is_package = True
-        else:
-            # Creates a module object with module name, parent module, file path, and dependencies
-            source_module = Module(source_module_name, parent_module_name, file_path)
+def build_compact_graph(workers=SCAN_WORKERS, chunk_size=SCAN_CHUNK_SIZE, use_cache=True, engine=IMPORT_EXTRACTOR,
+                        enumeration=SOURCE_ENUMERATION, progress=None):
+    """Build the dependency graph straight into a CompactGraph, without NetworkX or Module objects.
 
-        if source_module_name not in G.nodes:
-            G.add_node(source_module_name, module=source_module)
+    Nodes, edges and package flags are the same as those of get_dependencies_digraph().
+    """
+    print(f"Building compact dependencies graph...")
+    timings = {}
+    sources, namespace, file_imports = scan_sources(workers, chunk_size, use_cache, engine, enumeration, timings,
+                                                    progress)
+    builder = CompactGraphBuilder()
 
-        for dependency in imports_from_file(file_path):
-            if dependency_is_internal(dependency, top_level_packages):
-                if dependency not in G.nodes:
-                    G.add_node(dependency, module=Module(dependency, get_parent_module(dependency), file_path))
-                G.add_edge(source_module_name, dependency)
-                G.nodes[source_module_name]['module'].dependencies.add(dependency)
+    with stage_timer(timings, 'graph'):
+        for done, (file_path, imports) in enumerate(zip(sources.files, file_imports), start=1):
+            source_module_name = module_name_from_file_path(file_path)
+            parts = source_module_name.split('.')
+            for i in range(1, len(parts)):
+                builder.add_node('.'.join(parts[:i]))
+            source_id = builder.add_node(source_module_name, file_path)
+            for dependency in imports:
+                if namespace.is_internal(dependency):
+                    builder.add_edge(source_id, builder.add_node(dependency))
+            report_progress(progress, 'graph', done, len(sources.files))
 
-    print(f"Nodes created: {len(G.nodes)}\n")
+    report_progress(progress, 'package flags')
+    with stage_timer(timings, 'package flags'):
+        is_package = [sources.directories.is_directory(name) for name in builder.names]
+        for node_id, file_path in builder.source_paths.items():
+            is_package[node_id] = is_package[node_id] or "__init__" in file_path
+    with stage_timer(timings, 'compact arrays'):
+        G = builder.build(is_package, graph_attributes(sources, namespace, engine))
+    G.graph['timings'] = timings
+
+    print(f"Nodes created: {len(G)}, edges: {G.number_of_edges()} ({G.memory_usage() / 1024:.0f} KiB of arrays)")
+    print_stage_timings(timings)
     return G
 
-def set_package_flags(G):
+def scan_sources(workers, chunk_size, use_cache, engine, enumeration, timings, progress=None):
+    """List the source files, index their namespace and extract their imports."""
+    # Each analysis starts from empty name/path resolution caches
+    clear_resolution_cache()
+    report_progress(progress, 'listing')
+    with stage_timer(timings, 'listing'):
+        sources = list_sources(enumeration)
+    print(f"Found {len(sources.files)} source files ({sources.mode})")
+
+    namespace = NamespaceIndex(sources.top_level_packages)
+    cache = ScanCache(SCAN_CACHE_FILE, engine) if use_cache else None
+    with stage_timer(timings, 'scan'):
+        file_imports = scan_files(sources.files, workers, chunk_size, cache, engine, progress, retain=True)
+
+    import_kinds = Counter(namespace.classify(dependency) for imports in file_imports for dependency in imports)
+    print(f"Imports: {import_kinds[INTERNAL]} internal, {import_kinds[EXTERNAL]} external, "
+          f"{import_kinds[STDLIB]} stdlib")
+    return sources, namespace, file_imports
+
+def graph_attributes(sources, namespace, engine):
+    return {
+        'repository': current_repository(),
+        'commit': current_commit(),
+        'engine': engine,
+        'enumeration': sources.mode,
+        'top_level_packages': set(sources.top_level_packages),
+        'namespace': namespace,
+        'directories': sources.directories,
+        # What incremental updates compare against besides the commit
+        'uncommitted': uncommitted_source_files(include_untracked=sources.mode == 'walk'),
+        'ignore_file': ignore_file_contents(CODE_ROOT_FOLDER),
+    }
+
+def add_source_file(G, file_path, imports, namespace, directories=None):
+    """Add the module of a source file, its ancestors and its internal dependencies to the graph.
+
+    Args:
+        G: Dependency graph to add the module to
+        file_path: Path of the source file
+        imports: Module names imported by the file
+        namespace: NamespaceIndex of the repository's top-level packages
+        directories: DirectorySnapshot resolving the paths of ancestor packages;
+            the file system is checked when not given
+    """
+    source_module_name = module_name_from_file_path(file_path)
+    parent_module_name = get_parent_module(source_module_name)
+
+    G = set_ancestor_paths(G, source_module_name, directories)
+
+    if "__init__" in file_path:
+        source_module = Module(source_module_name, parent_module_name, file_path)
+        source_module.is_package = True
+    else:
+        # Creates a module object with module name, parent module, file path, and dependencies
+        source_module = Module(source_module_name, parent_module_name, file_path)
+
+    if source_module_name not in G.nodes:
+        G.add_node(source_module_name, module=source_module)
+    G.graph.setdefault('sources', {})[source_module_name] = file_path
+
+    for dependency in imports:
+        if namespace.is_internal(dependency):
+            if dependency not in G.nodes:
+                G.add_node(dependency, module=Module(dependency, get_parent_module(dependency), file_path))
+            G.add_edge(source_module_name, dependency)
+            G.nodes[source_module_name]['module'].add_dependency(dependency)
+    return G
+
+def set_package_flags(G, node_names=None):
+    """Flag the nodes backed by a directory as packages.
+
+    Directories come from the snapshot taken while listing the sources
+    (G.graph['directories']), or from the file system without one.
+    """
     print("Setting package flags...")
     packages_found = 0
+    directories = G.graph.get('directories')
     
-    for node_name, node_data in G.nodes(data=True):
+    for node_name in G.nodes if node_names is None else node_names:
+        node_data = G.nodes[node_name]
         if 'module' in node_data:
-            path = file_path_from_module_name(node_data['module'].name)
-            is_dir = os.path.isdir(path)
+            if directories is not None:
+                is_dir = directories.is_directory(node_name)
+            else:
+                is_dir = os.path.isdir(file_path_from_module_name(node_data['module'].name))
             
             # Debug output
             if is_dir:
@@ -1,7 +1,10 @@
 import os
 from collections import defaultdict
+from fnmatch import fnmatch
 from .module import Module
 from .common import get_parent_module
+from .package_tree import PackageTree
+from .level_aggregation import LevelAggregator
 
 class ModuleHierarchy:
     """Organizes modules hierarchically for navigation and visualization."""
@@ -16,6 +19,10 @@ class ModuleHierarchy:
         self.graph = graph
         # Dictionary to store modules by depth
         self.depth_dict = {}
+        # Aggregated dependencies of every level and DFS-numbered tree, computed on first use
+        self._aggregated = None
+        self._tree = None
+        self._aggregator = None
         self._build_hierarchy()
     
     def _build_hierarchy(self, debug=True):
@@ -25,64 +32,180 @@ class ModuleHierarchy:
             'modules': set(),
             'packages': set()
         }
+        # Number of nodes below each package path, so levels can be patched later
+        self._descendant_counts = defaultdict(int)
         
         node_count = 0
 
         # Process all nodes
         for node_name, node_data in self.graph.nodes(data=True):
             node_count += 1 # For debugging
-            module = node_data['module']
-            parts = node_name.split('.')
-            
-            # Handle root level modules (no dots)
-            if len(parts) == 1:
-                if module.is_package:
-                    self.depth_dict['']['packages'].add(node_name)
-                else:
-                    self.depth_dict['']['modules'].add(module)
-                continue
+            self._add_to_levels(node_name, node_data['module'])
+    
+    def _add_to_levels(self, node_name, module):
+        parts = node_name.split('.')
+        
+        # Handle root level modules (no dots)
+        if len(parts) == 1:
+            if module.is_package:
+                self.depth_dict['']['packages'].add(node_name)
+            else:
+                self.depth_dict['']['modules'].add(module)
+            return
 
+        # For modules with dots, add them only to their immediate parent
+        parent_path = get_parent_module(node_name)
+        last_part = parts[-1]  # The last part of the path
+        
+        # Initialize the dictionary for this level if needed
+        if parent_path not in self.depth_dict:
+            self.depth_dict[parent_path] = {
+                'modules': set(),
+                'packages': set()
+            }
         
 
-            # For modules with dots, add them only to their immediate parent
-            parent_path = get_parent_module(node_name)
-            last_part = parts[-1]  # The last part of the path
+        # Add as a module or package to the immediate parent level
+        if module.is_package:
+            self.depth_dict[parent_path]['packages'].add(last_part)
+        else:
+            self.depth_dict[parent_path]['modules'].add(module)
+        
+        # Also ensure all ancestor paths are created and include this as a sub-package
+        current = ''
+        for i in range(len(parts) - 1):  # Skip the last part which we already handled
             
-            # Initialize the dictionary for this level if needed
-            if parent_path not in self.depth_dict:
-                self.depth_dict[parent_path] = {
+            part = parts[i]
+            # Get the current path up to this part
+            if current:
+                parent = current
+                current = f"{current}.{part}"
+            else:
+                parent = ''
+                current = part
+            # Initialize dictionary for this level if needed
+            if parent not in self.depth_dict:
+                self.depth_dict[parent] = {
                     'modules': set(),
                     'packages': set()
                 }
             
-
-            # Add as a module or package to the immediate parent level
-            if module.is_package:
-                self.depth_dict[parent_path]['packages'].add(last_part)
-            else:
-                self.depth_dict[parent_path]['modules'].add(module)
+            # Add as a package to its parent
+            self.depth_dict[parent]['packages'].add(part)
+            self._descendant_counts[current] += 1
+    
+    def update_nodes(self, added=(), removed=()):
+        """
+        Patch the levels after nodes were added to or removed from the graph.
+        
+        Args:
+            added: Names of nodes now in the graph
+            removed: (name, Module, is_package) of nodes no longer in the graph,
+                with the package flag the hierarchy last saw for them
+        """
+        for node_name, module, is_package in removed:
+            self._remove_from_levels(node_name, module, is_package)
+        for node_name in added:
+            self._add_to_levels(node_name, self.graph.nodes[node_name]['module'])
+        # Edges may have changed as well, so the roll-up is recomputed on next use
+        self._aggregated = None
+        self._tree = None
+        self._aggregator = None
+    
+    def _remove_from_levels(self, node_name, module, is_package):
+        parent_path = get_parent_module(node_name)
+        level = self.depth_dict.get(parent_path)
+        if level is not None:
+            if not is_package:
+                level['modules'].discard(module)
+            elif not self._descendant_counts.get(node_name):
+                level['packages'].discard(node_name.split('.')[-1])
+        
+        # Walk up the ancestors, dropping packages that have nothing left below them
+        ancestor = parent_path
+        while ancestor:
+            self._descendant_counts[ancestor] -= 1
+            if self._descendant_counts[ancestor] <= 0:
+                del self._descendant_counts[ancestor]
+                node_data = self.graph.nodes.get(ancestor)
+                if not (node_data and node_data['module'].is_package):
+                    parent = get_parent_module(ancestor)
+                    if parent in self.depth_dict:
+                        self.depth_dict[parent]['packages'].discard(ancestor.split('.')[-1])
+            level = self.depth_dict.get(ancestor)
+            if level is not None and not level['modules'] and not level['packages']:
+                del self.depth_dict[ancestor]
+            ancestor = get_parent_module(ancestor)
+    
+    @property
+    def tree(self):
+        """PackageTree of the graph nodes, numbered in depth-first order."""
+        if self._tree is None:
+            self._tree = PackageTree(list(self.graph.nodes))
+        return self._tree
+    
+    @property
+    def aggregator(self):
+        """LevelAggregator over the graph edges, keyed by package tree IDs."""
+        if self._aggregator is None:
+            self._aggregator = LevelAggregator.from_graph(self.tree, self.graph)
+        return self._aggregator
+    
+    def level_edge_arrays(self, depths=None, path=None):
+        """
+        Aggregate the dependencies to several depths at once, for exports and metrics.
+        
+        Unlike get_aggregated_dependencies, every level of a depth is covered at
+        once and modules shallower than the depth stand for themselves.
+        
+        Args:
+            depths: Depths to aggregate to, every depth of the tree by default
+            path: Only count dependencies inside this package
             
-            # Also ensure all ancestor paths are created and include this as a sub-package
-            current = ''
-            for i in range(len(parts) - 1):  # Skip the last part which we already handled
-                
-                part = parts[i]
-                # Get the current path up to this part
-                if current:
-                    parent = current
-                    current = f"{current}.{part}"
-                else:
-                    parent = ''
-                    current = part
-                # Initialize dictionary for this level if needed
-                if parent not in self.depth_dict:
-                    self.depth_dict[parent] = {
-                        'modules': set(),
-                        'packages': set()
-                    }
-                
-                # Add as a package to its parent
-                self.depth_dict[parent]['packages'].add(part)
+        Returns:
+            dict: {depth: (source IDs, target IDs, weights)}, IDs indexing self.tree.names
+        """
+        if depths is None:
+            depths = range(self.aggregator.max_depth + 1)
+        return {depth: self.aggregator.aggregate(depth, path) for depth in depths}
+    
+    def nodes_under(self, path=''):
+        """
+        Get the graph nodes anywhere below a package, as a slice of the package tree.
+        
+        Args:
+            path: Package path (e.g., 'zeeguu.core'), '' for the whole graph
+            
+        Returns:
+            list: Node names in depth-first order
+        """
+        if path and path not in self.tree:
+            return []
+        return [name for name in self.tree.descendants(path) if name in self.graph.nodes]
+    
+    def is_inside(self, module_name, path):
+        """Check with a range test whether a module is a package or lies below it."""
+        return self.tree.contains(path, module_name)
+    
+    def matches_filter(self, path, pattern):
+        """
+        Check whether a package or module should stay visible under a name filter.
+        
+        A name matches a glob pattern in full or from any of its segments on
+        ('core.*' matches 'zeeguu.core.model'). A package stays visible if it
+        or anything below it matches, found by slicing the package tree.
+        
+        Args:
+            path: Full name of the package or module
+            pattern: Glob pattern, '' to match everything
+            
+        Returns:
+            bool: True if the item matches
+        """
+        if not pattern:
+            return True
+        names = [path] + (self.tree.descendants(path) if path in self.tree else [])
+        return any(fnmatch(name, pattern) or fnmatch(name, '*.' + pattern) for name in names)
     
     def get_level_view(self, path=''):
         """
@@ -100,7 +223,85 @@ class ModuleHierarchy:
     
     def get_aggregated_dependencies(self, path=''):
         """
-        Calculate aggregated dependencies between modules/packages at this level.
+        Get aggregated dependencies between modules/packages at this level.
+        
+        The dependencies of every level are rolled up together the first time
+        any level is asked for, so each call after that is a dictionary fetch.
+        
+        Args:
+            path: Package path (e.g., 'zeeguu.core')
+            
+        Returns:
+            dict: {(source, target): weight, ...}
+        """
+        if self._aggregated is None:
+            self._aggregated = self._aggregate_all_levels()
+        return dict(self._aggregated.get(path, {}))
+    
+    def _aggregate_all_levels(self):
+        """
+        Compute the aggregated dependencies of every level in one pass over the edges.
+        
+        Gives the same result as aggregate_dependencies_by_scan for every level:
+        - a module counts its dependencies into the sub-packages of its own level,
+          keyed by the sub-package's full path (by name and only if it is a
+          known package at the root)
+        - a package counts the dependencies of every node in its subtree into
+          the other packages of its level, keyed by package names
+        In both cases, dependencies on a package node itself are not counted.
+        
+        Returns:
+            dict: {path: {(source, target): weight, ...}, ...}
+        """
+        aggregated = defaultdict(lambda: defaultdict(int))
+        nodes = self.graph.nodes
+        
+        # Modules, counted at the level that holds them
+        for path, level in self.depth_dict.items():
+            depth = path.count('.') + 1 if path else 0
+            for module in level['modules']:
+                for dep in module.dependencies:
+                    if dep not in nodes:
+                        continue
+                    dep_parts = dep.split('.')
+                    if len(dep_parts) < depth + 2:
+                        continue
+                    if not path:
+                        if dep_parts[0] in level['packages']:
+                            aggregated[path][(module.name, dep_parts[0])] += 1
+                    elif dep.startswith(path + '.'):
+                        aggregated[path][(module.name, f"{path}.{dep_parts[depth]}")] += 1
+        
+        # Packages, counted at every level where a node's subtree is one of the packages
+        for node_name in nodes:
+            module = nodes[node_name].get('module')
+            if module is None:
+                continue
+            dependencies = [dep.split('.') for dep in module.dependencies if dep in nodes]
+            if not dependencies:
+                continue
+            parts = node_name.split('.')
+            for depth, package in enumerate(parts):
+                path = '.'.join(parts[:depth])
+                level = self.depth_dict.get(path)
+                if level is None or package not in level['packages']:
+                    continue
+                for dep_parts in dependencies:
+                    if len(dep_parts) < depth + 2 or dep_parts[:depth] != parts[:depth]:
+                        continue
+                    target = dep_parts[depth]
+                    if target != package and target in level['packages']:
+                        aggregated[path][(package, target)] += 1
+        
+        return {path: dict(dependencies) for path, dependencies in aggregated.items()}
+    
+    def aggregate_dependencies_by_scan(self, path=''):
+        """
+        Calculate aggregated dependencies between modules/packages at this level
+        by scanning every graph node for each package of the level.
+        
+        This is how get_aggregated_dependencies used to work. It is kept as the
+        reference the precomputed roll-up is checked against.
         
         Args:
             path: Package path (e.g., 'zeeguu.core')
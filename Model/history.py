@@ -0,0 +1,151 @@
+import csv
+from pathlib import Path
+
+import git
+import networkx as nx
+
+from constants import CODE_ROOT_FOLDER, IMPORT_EXTRACTOR
+from .extractors import get_extractor
+from .graph_builder import add_source_file
+from .ignore_rules import IgnoreRules
+from .namespace_index import NamespaceIndex
+from .sources import DirectorySnapshot, is_path_ignored
+
+
+class HistorySnapshot:
+    """The dependency graph of one commit and a few metrics describing it."""
+
+    def __init__(self, commit, committed_date, graph, metrics):
+        self.commit = commit
+        self.committed_date = committed_date
+        self.graph = graph
+        self.metrics = metrics
+
+
+class HistoryAnalyser:
+    """Builds dependency graphs for a range of commits straight from the git object database.
+
+    Nothing is checked out: the file list of each commit comes from its tree
+    and file contents are streamed through git's persistent 'cat-file --batch'
+    process. Imports are cached per blob, so a file is only parsed again in a
+    commit that changed it, and a commit whose Python files are all unchanged
+    reuses the previous graph.
+    """
+
+    def __init__(self, engine=IMPORT_EXTRACTOR):
+        self.repo = git.Repo(CODE_ROOT_FOLDER)
+        self.extractor = get_extractor(engine)
+        self.ignore_rules = IgnoreRules.for_folder(CODE_ROOT_FOLDER)
+        self.blob_imports = {}
+        self.blobs_read = 0
+
+    def analyse(self, revision_range='HEAD', max_commits=None):
+        """
+        Build a snapshot for every commit in a range, oldest first.
+
+        Args:
+            revision_range: Anything git rev-list accepts, e.g. 'v1.0..main'
+            max_commits: Only analyse the most recent max_commits commits
+
+        Returns:
+            list: HistorySnapshot objects in commit order
+        """
+        options = ['--reverse', '--first-parent']
+        if max_commits:
+            options.append(f'--max-count={max_commits}')
+        commits = self.repo.git.rev_list(*options, revision_range).split()
+        print(f"Analysing {len(commits)} commits...")
+
+        snapshots = []
+        previous_files = None
+        for commit in commits:
+            directories, files = self._list_tree(commit)
+            if snapshots and files == previous_files:
+                graph = snapshots[-1].graph
+            else:
+                graph = self._build_commit_graph(directories, files)
+            previous_files = files
+
+            committed_date = self.repo.commit(commit).committed_datetime
+            snapshots.append(HistorySnapshot(commit, committed_date, graph, graph_metrics(graph)))
+
+        print(f"Read {self.blobs_read} blobs for {len(commits)} commits\n")
+        return snapshots
+
+    def _list_tree(self, commit):
+        """Directories and (path, blob) pairs of the Python files in a commit, relative to the root."""
+        output = self.repo.git.ls_tree('-r', '-t', '-z', '--full-tree', commit)
+        directories = []
+        files = []
+        ignored_directories = {}
+        for entry in output.split('\0'):
+            if not entry:
+                continue
+            info, path = entry.split('\t', 1)
+            _, object_type, sha = info.split()
+            if object_type == 'tree':
+                directories.append(path)
+            elif object_type == 'blob' and path.endswith('.py'):
+                if not is_path_ignored(path, self.ignore_rules, ignored_directories):
+                    files.append((path, sha))
+        return directories, tuple(files)
+
+    def _read_imports(self, relative_path, file_path, sha):
+        # Relative imports are resolved against the path, so it is part of the key
+        key = (sha, relative_path)
+        if key not in self.blob_imports:
+            data = self.repo.git.get_object_data(sha)[3]
+            self.blobs_read += 1
+            self.blob_imports[key] = self.extractor.imports_from_bytes(data, file_path)
+        return self.blob_imports[key]
+
+    def _build_commit_graph(self, directories, files):
+        root = Path(CODE_ROOT_FOLDER)
+        top_level_packages = {path.split('/')[0] for path, _ in files if '/' in path}
+        top_level_packages = [package for package in top_level_packages if not package.startswith('.')]
+
+        namespace = NamespaceIndex(top_level_packages)
+        # Package flags and paths come from the tree instead of the file system
+        snapshot = DirectorySnapshot(directories)
+
+        G = nx.DiGraph()
+        for relative_path, sha in files:
+            file_path = str(root / relative_path)
+            add_source_file(G, file_path, self._read_imports(relative_path, file_path, sha), namespace, snapshot)
+
+        for node_name, node_data in G.nodes(data=True):
+            module = node_data['module']
+            module.is_package = module.is_package or snapshot.is_directory(node_name)
+            module.depth = node_name.count('.')
+
+        G.graph['top_level_packages'] = set(top_level_packages)
+        G.graph['namespace'] = namespace
+        G.graph['directories'] = snapshot
+        return G
+
+
+def graph_metrics(G):
+    """Size and shape metrics of a dependency graph."""
+    modules = G.graph.get('sources', {})
+    cyclic_groups = [group for group in nx.strongly_connected_components(G) if len(group) > 1]
+    return {
+        'modules': len(modules),
+        'nodes': G.number_of_nodes(),
+        'edges': G.number_of_edges(),
+        'packages': sum(1 for _, data in G.nodes(data=True) if data['module'].is_package),
+        'max_depth': max((data['module'].depth for _, data in G.nodes(data=True)), default=0),
+        'top_level_packages': len(G.graph.get('top_level_packages', ())),
+        'cyclic_groups': len(cyclic_groups),
+        'modules_in_cycles': sum(len(group) for group in cyclic_groups),
+    }
+
+
+def write_history_csv(snapshots, csv_file):
+    """Write the metrics of every snapshot as one CSV row per commit."""
+    metric_names = list(snapshots[0].metrics) if snapshots else []
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['commit', 'date'] + metric_names)
+        for snapshot in snapshots:
+            writer.writerow([snapshot.commit, snapshot.committed_date.isoformat()]
+                            + [snapshot.metrics[name] for name in metric_names])
@@ -0,0 +1,159 @@
+import os
+import re
+
+from constants import IGNORE_FILE_NAME
+
+# Folders that are never part of a project's own architecture
+DEFAULT_IGNORE_PATTERNS = [
+    '.git/',
+    '.hg/',
+    '.tox/',
+    '.nox/',
+    '.venv/',
+    'venv/',
+    'virtualenv/',
+    'site-packages/',
+    'dist-packages/',
+    'node_modules/',
+    '__pycache__/',
+    '*.egg-info/',
+    'migrations/',
+    '/build/',
+    '/dist/',
+]
+
+
+class IgnoreRule:
+    """A single line of an ignore file, in gitignore syntax."""
+
+    def __init__(self, pattern):
+        self.negated = pattern.startswith('!')
+        if self.negated:
+            pattern = pattern[1:]
+        self.directory_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        # A slash anywhere but at the end anchors the pattern to the root folder
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+        prefix = '' if anchored else '(?:.*/)?'
+        self.regex = f'{prefix}{translate_pattern(pattern)}'
+
+
+def translate_pattern(pattern):
+    """Translate a gitignore glob into a regular expression matching whole relative paths."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            char_class = pattern[i + 1:end]
+            if char_class.startswith('!'):
+                char_class = '^' + char_class[1:]
+            parts.append(f'[{char_class}]')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+
+class IgnoreRules:
+    """Compiled ignore rules deciding which paths of the analysed repository are skipped.
+
+    Without negated ('!') rules, all rules are compiled into a single regular
+    expression per path kind. Otherwise rules are checked in order and the
+    last matching rule wins, as in git.
+    """
+
+    def __init__(self, patterns):
+        self.rules = []
+        for line in patterns:
+            line = line.rstrip('\n').rstrip()
+            if line and not line.startswith('#'):
+                self.rules.append(IgnoreRule(line))
+
+        self._has_negations = any(rule.negated for rule in self.rules)
+        if self._has_negations:
+            self._ordered = [(re.compile(rule.regex + '$'), rule) for rule in self.rules]
+        else:
+            self._directory_regex = self._combine(self.rules)
+            self._file_regex = self._combine([rule for rule in self.rules if not rule.directory_only])
+
+    @staticmethod
+    def _combine(rules):
+        if not rules:
+            return None
+        return re.compile('(?:' + '|'.join(rule.regex for rule in rules) + ')$')
+
+    @classmethod
+    def for_folder(cls, root, use_defaults=True):
+        """Rules for a repository: the built-in defaults plus its ignore file, if any."""
+        patterns = list(DEFAULT_IGNORE_PATTERNS) if use_defaults else []
+        patterns.extend(ignore_file_contents(root).splitlines(keepends=True))
+        return cls(patterns)
+
+    def is_ignored(self, relative_path, is_dir):
+        """
+        Check a path against the rules.
+
+        Args:
+            relative_path: Path relative to the repository root, with '/' separators
+            is_dir: Whether the path is a directory
+
+        Returns:
+            bool: True if the path should be skipped
+        """
+        if not self._has_negations:
+            regex = self._directory_regex if is_dir else self._file_regex
+            return bool(regex and regex.match(relative_path))
+
+        ignored = False
+        for regex, rule in self._ordered:
+            if (is_dir or not rule.directory_only) and regex.match(relative_path):
+                ignored = not rule.negated
+        return ignored
+
+
+class PruneStats:
+    """What the ignore rules kept out of a scan."""
+
+    def __init__(self, measured=True):
+        self.directories = 0
+        self.files = 0
+        self.bytes = 0
+        # Whether the Python files inside pruned directories were counted too
+        self.measured = measured
+
+    def add_file(self, path):
+        self.files += 1
+        self.bytes += os.path.getsize(path)
+
+    def __str__(self):
+        summary = f"Pruned {self.directories} directories and {self.files} files ({self.bytes / 1024:.1f} KB)"
+        if not self.measured:
+            summary += ", not counting the contents of pruned directories"
+        return summary
+
+
+def ignore_file_contents(root):
+    """Text of a repository's ignore file, '' without one. Graphs record it to notice rule changes."""
+    ignore_file = os.path.join(root, IGNORE_FILE_NAME)
+    if not os.path.exists(ignore_file):
+        return ''
+    with open(ignore_file, 'r', encoding='utf-8') as f:
+        return f.read()
@@ -1,6 +1,33 @@
 from Model.common import get_parent_module, module_name_from_file_path
+import mmap
+import os
 import re
 
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 256 * 1024
+
+# Whitespace inside a statement, including backslash line continuations
+_STATEMENT_SPACE = r'(?:[ \t]|\\\r?\n)'
+
+# An import statement at the start of a line. For 'from' imports only the
+# base module is captured, so a parenthesised name list spanning several
+# lines never needs to be read.
+_IMPORT_STATEMENT_BODY = (
+    rf'[ \t]*(?:'
+    rf'from{_STATEMENT_SPACE}+(?P<base>\.+{{name}}*|{{name}}+){_STATEMENT_SPACE}+import\b'
+    rf'|import{_STATEMENT_SPACE}+(?P<names>(?:[^\n;#\\]|\\\r?\n)+)'
+    rf')'
+)
+# The text pattern starts with the newline itself so the regex engine can
+# skip ahead with a fast literal search (callers prepend a newline to the
+# buffer). The bytes pattern is only ever matched at a known line start.
+# In bytes, \w is ASCII only, so UTF-8 encoded identifiers are let through.
+IMPORT_STATEMENT_PATTERN = r'\n' + _IMPORT_STATEMENT_BODY.format(name=r'[\w.]')
+_IMPORT_STATEMENT = re.compile(IMPORT_STATEMENT_PATTERN)
+_IMPORT_STATEMENT_BYTES = re.compile(_IMPORT_STATEMENT_BODY.format(name=r'[\w.\x80-\xff]').encode())
+_IMPORTED_NAME = re.compile(r'\s*([\w.]+)')
+_LINE_CONTINUATION = re.compile(r'\\\r?\n')
+
 
 def resolve_relative_import(importing_file_path, relative_import):
     """Resolve a relative import to its full module name."""
@@ -68,36 +95,162 @@ def import_from_line(line):
     
     return result  # Return empty list if no matches
 
-def imports_from_file(file_path):
-    """Extract all imported modules from a Python file.
+def imports_from_source(source, file_path):
+    """Extract all imported modules from the source code of a Python file.
     
-    Returns a list of module names (e.g., ['os', 'datetime', 'zeeguu.core'])
+    Makes a single pass over the whole buffer, so statements continued with
+    a backslash or a parenthesised name list are handled like any other.
+    
+    Args:
+        source: Contents of the file
+        file_path: Path of the file, used to resolve relative imports
+        
+    Returns:
+        list: Module names in order of appearance
     """
     all_imports = []
+    for statement in _IMPORT_STATEMENT.finditer('\n' + source):
+        _add_statement_modules(all_imports, statement.group('base'), statement.group('names'), file_path)
+    return all_imports
+
+def imports_from_bytes(data, file_path):
+    """Extract all imported modules from the raw bytes of a Python file.
     
-    with open(file_path) as f:
-        lines = f.readlines()
+    Jumps from one occurrence of b'import' to the next with a byte search and
+    only decodes the statements found there, so the file is never decoded or
+    split into lines as a whole. Undecodable bytes are replaced rather than
+    raising, which makes non-UTF-8 files safe to scan.
+    
+    Args:
+        data: File contents as bytes or an mmap
+        file_path: Path of the file, used to resolve relative imports
+        
+    Returns:
+        list: Module names in order of appearance
+    """
+    return scan_imports_from_bytes(data, file_path, detect_ambiguity=False)[0]
+
+def scan_imports_from_bytes(data, file_path, detect_ambiguity=True):
+    """Extract imports like imports_from_bytes and flag files the byte scan may get wrong.
+    
+    A file is ambiguous when an import statement sits inside what looks like
+    a triple-quoted string, or when the 'import' keyword appears somewhere
+    other than the start of a statement (e.g. 'try: import x').
+    
+    Returns:
+        tuple: (list of module names, True if the file is ambiguous)
+    """
+    all_imports = []
+    ambiguous = False
+    double_quotes = single_quotes = quotes_counted_to = 0
+    position = data.find(b'import')
+    
+    while position != -1:
+        line_start = _logical_line_start(data, position)
+
+        statement = _IMPORT_STATEMENT_BYTES.match(data, line_start)
+        if statement and statement.end() > position:
+            base, names = statement.group('base', 'names')
+            _add_statement_modules(
+                all_imports,
+                base.decode('utf-8', 'replace') if base is not None else None,
+                names.decode('utf-8', 'replace') if names is not None else None,
+                file_path)
+            if detect_ambiguity and not ambiguous:
+                # An odd number of triple quotes before the statement means it is in a string
+                double_quotes += _count(data, b'"""', quotes_counted_to, line_start)
+                single_quotes += _count(data, b"'''", quotes_counted_to, line_start)
+                quotes_counted_to = line_start
+                ambiguous = bool(double_quotes % 2 or single_quotes % 2)
+            position = statement.end()
+        elif detect_ambiguity and not ambiguous:
+            ambiguous = _looks_like_import_keyword(data, position)
         
-    for line in lines:
-        # Handle multiple imports on one line by splitting at commas
-        if line.strip().startswith('import '):
-            for subline in line.split(','):
-                imported_modules = import_from_line(subline if subline.strip().startswith('import') else 'import ' + subline)
-                if imported_modules:
-                    for module in imported_modules:
-                        if module.startswith('.'):
-                            resolved = resolve_relative_import(file_path, module)
-                            all_imports.append(resolved)
-                        else:
-                            all_imports.append(module)
+        # Any other occurrence on this line belongs to the same statement
+        line_end = data.find(b'\n', position)
+        if line_end == -1:
+            break
+        position = data.find(b'import', line_end)
+        
+    return all_imports, ambiguous
+
+def _count(data, needle, start, end):
+    """Non-overlapping occurrences of needle in data[start:end], for bytes and mmaps alike (mmap has no count)."""
+    if isinstance(data, bytes):
+        return data.count(needle, start, end)
+    occurrences = 0
+    position = data.find(needle, start, end)
+    while position != -1:
+        occurrences += 1
+        position = data.find(needle, position + len(needle), end)
+    return occurrences
+
+def _looks_like_import_keyword(data, position):
+    """True if the b'import' at position is a whole word followed by whitespace."""
+    before = data[position - 1:position] if position > 0 else b' '
+    after = data[position + 6:position + 7]
+    return not (before.isalnum() or before == b'_') and after in (b' ', b'\t', b'\\')
+
+def _logical_line_start(data, position):
+    """Offset of the line holding position, stepping back over backslash continuations."""
+    line_start = data.rfind(b'\n', 0, position) + 1
+    while line_start > 0:
+        previous_end = line_start - 1
+        if previous_end > 0 and data[previous_end - 1] == 0x0d:  # '\r'
+            previous_end -= 1
+        if previous_end == 0 or data[previous_end - 1] != 0x5c:  # '\\'
+            break
+        line_start = data.rfind(b'\n', 0, previous_end - 1) + 1
+    return line_start
+
+def _add_statement_modules(all_imports, base_module, names, file_path):
+    if base_module is not None:
+        modules = [base_module]
+    else:
+        # 'import a.b as c, d' -> ['a.b', 'd']
+        names = _LINE_CONTINUATION.sub(' ', names)
+        modules = []
+        for part in names.split(','):
+            name_match = _IMPORTED_NAME.match(part)
+            if name_match:
+                modules.append(name_match.group(1))
+    
+    for module in modules:
+        if module.startswith('.'):
+            all_imports.append(resolve_relative_import(file_path, module))
         else:
-            imported_modules = import_from_line(line)
-            if imported_modules:
-                for module in imported_modules:
-                    if module.startswith('.'):
-                        resolved = resolve_relative_import(file_path, module)
-                        all_imports.append(resolved)
-                    else:
-                        all_imports.append(module)
+            all_imports.append(module)
+
+def imports_from_file(file_path, use_mmap=None):
+    """Extract all imported modules from a Python file.
+    
+    The file is read as raw bytes, or memory-mapped when use_mmap is True.
+    By default only files of at least MMAP_THRESHOLD bytes are mapped.
+    
+    Returns a list of module names (e.g., ['os', 'datetime', 'zeeguu.core'])
+    """
+    return read_source(file_path, lambda data: imports_from_bytes(data, file_path), use_mmap)
+
+
+def read_source(file_path, parse, use_mmap=None):
+    """Pass the contents of a file to parse, as bytes or, for large files, as an mmap.
+    
+    Args:
+        file_path: Path of the file
+        parse: Callable taking the contents; the mmap is closed once it returns
+        use_mmap: Map the file (True), read it (False), or map it from MMAP_THRESHOLD bytes (None)
+        
+    Returns:
+        Whatever parse returns
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = size >= MMAP_THRESHOLD
             
-    return all_imports
\ No newline at end of file
+        # Empty files cannot be mapped
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return parse(data)
+                
+        return parse(f.read())
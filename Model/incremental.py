@@ -0,0 +1,280 @@
+import os
+from collections import Counter, deque
+from pathlib import Path
+
+import git
+
+from constants import CODE_ROOT_FOLDER, SCAN_WORKERS, SCAN_CACHE_FILE, IMPORT_EXTRACTOR
+from .common import get_parent_module, module_name_from_file_path
+from .graph_builder import add_source_file, get_dependencies_digraph, scan_files, set_package_flags
+from .hierarchy import ModuleHierarchy
+from .ignore_rules import IgnoreRules, ignore_file_contents
+from .scan_cache import ScanCache
+from .sources import current_commit, is_path_ignored, uncommitted_source_files
+
+
+class SourceChanges:
+    """Python files added, modified and deleted between two commits, as paths relative to the root."""
+
+    def __init__(self):
+        self.added = []
+        self.modified = []
+        self.deleted = []
+
+    def __len__(self):
+        return len(self.added) + len(self.modified) + len(self.deleted)
+
+
+def changed_source_files(old_commit, new_commit):
+    """
+    Ask git which Python files changed between two commits.
+
+    Renames are reported by git as such and recorded here as a deletion of
+    the old path plus an addition of the new one. Paths excluded by the
+    ignore rules are left out.
+
+    Returns:
+        SourceChanges: The changed files
+    """
+    repo = git.Repo(CODE_ROOT_FOLDER)
+    output = repo.git.diff('--name-status', '-z', '-M', old_commit, new_commit, '--', '*.py')
+    fields = [field for field in output.split('\0') if field]
+    ignore_rules = IgnoreRules.for_folder(CODE_ROOT_FOLDER)
+
+    changes = SourceChanges()
+    i = 0
+    while i < len(fields):
+        status = fields[i][0]
+        if status in 'RC':
+            # Renames and copies carry the old and the new path
+            old_path, new_path = fields[i + 1], fields[i + 2]
+            i += 3
+            if status == 'R':
+                changes.deleted.append(old_path)
+            changes.added.append(new_path)
+        else:
+            path = fields[i + 1]
+            i += 2
+            if status == 'A':
+                changes.added.append(path)
+            elif status == 'D':
+                changes.deleted.append(path)
+            else:
+                changes.modified.append(path)
+
+    ignored_directories = {}
+    for paths in (changes.added, changes.modified, changes.deleted):
+        paths[:] = [path for path in paths if not is_path_ignored(path, ignore_rules, ignored_directories)]
+    return changes
+
+
+def update_dependencies_digraph(G, hierarchy=None, workers=SCAN_WORKERS, use_cache=True, progress=None):
+    """
+    Bring a graph built by get_dependencies_digraph up to date with the commit now checked out.
+
+    Only the files git reports as changed since the commit the graph was
+    built from are re-scanned, and only their nodes and edges are patched,
+    in the graph and in the hierarchy. Files edited in the working tree, now
+    or when the graph was built, are re-checked against the disk as well.
+    When the set of top-level packages or the ignore file changes, the graph
+    is rebuilt.
+
+    Args:
+        G: Graph to patch in place
+        hierarchy: ModuleHierarchy of G to patch in place, if any
+        progress: Optional callback told about the scan. Cancelling it leaves G
+            untouched, as nothing is patched before the changed files are scanned
+
+    Returns:
+        tuple: (graph, hierarchy), the same objects unless a full rebuild was needed
+    """
+    old_commit = G.graph.get('commit')
+    new_commit = current_commit()
+    if old_commit is None or new_commit is None:
+        print("Not a git clone, rebuilding the graph...")
+        return _rebuild(G, hierarchy, progress)
+    if G.graph.get('ignore_file') != ignore_file_contents(CODE_ROOT_FOLDER):
+        print("Ignore file changed, rebuilding the graph...")
+        return _rebuild(G, hierarchy, progress)
+
+    # Only a walk picks up files git does not track
+    uncommitted = uncommitted_source_files(include_untracked=G.graph.get('enumeration') == 'walk')
+    rechecked = uncommitted | G.graph.get('uncommitted', set())
+    if old_commit == new_commit and not rechecked:
+        print("Graph is already up to date")
+        return G, hierarchy
+
+    changes = changed_source_files(old_commit, new_commit) if old_commit != new_commit else SourceChanges()
+    _recheck_working_tree(changes, rechecked, G.graph.get('sources', {}))
+    print(f"Updating graph from {old_commit[:8]} to {new_commit[:8]} and the working tree: "
+          f"{len(changes.added)} added, {len(changes.modified)} modified, {len(changes.deleted)} deleted")
+
+    top_level_packages = G.graph['top_level_packages']
+    new_top_level = {path.split('/')[0] for path in changes.added if '/' in path} - top_level_packages
+    emptied_top_level = {path.split('/')[0] for path in changes.deleted if '/' in path
+                         and not os.path.isdir(os.path.join(CODE_ROOT_FOLDER, path.split('/')[0]))}
+    if new_top_level or emptied_top_level & top_level_packages:
+        print("Top-level packages changed, rebuilding the graph...")
+        return _rebuild(G, hierarchy, progress)
+
+    # Re-scan added and modified files, through the scan cache like a full build.
+    # This is the last point the update can be cancelled, the graph is patched from here on.
+    scanned = [_full_path(relative_path) for relative_path in changes.added + changes.modified]
+    engine = G.graph['engine']
+    cache = ScanCache(SCAN_CACHE_FILE, engine) if use_cache else None
+    file_imports = scan_files(scanned, workers, cache=cache, engine=engine, progress=progress)
+
+    directories = G.graph.get('directories')
+    if directories is not None:
+        _update_directories(directories, changes)
+
+    sources = G.graph.setdefault('sources', {})
+    source_counts = _source_descendant_counts(G, sources)
+    touched = set()
+
+    # Drop the outgoing edges of every file that changed or disappeared
+    for relative_path in changes.modified + changes.deleted:
+        module_name = module_name_from_file_path(_full_path(relative_path))
+        if module_name not in G.nodes:
+            continue
+        touched.update(G.successors(module_name))
+        G.remove_edges_from(list(G.out_edges(module_name)))
+        G.nodes[module_name]['module'].clear_dependencies()
+        if relative_path in changes.deleted:
+            if sources.pop(module_name, None) is not None:
+                _count_source(source_counts, module_name, -1)
+            touched.add(module_name)
+
+    # Add the re-scanned files back
+    nodes_before = set(G.nodes)
+    for file_path, imports in zip(scanned, file_imports):
+        module_name = module_name_from_file_path(file_path)
+        if module_name not in sources:
+            _count_source(source_counts, module_name, 1)
+        add_source_file(G, file_path, imports, G.graph['namespace'], directories)
+    added_nodes = set(G.nodes) - nodes_before
+
+    removed_nodes = _remove_orphans(G, touched, sources, source_counts)
+
+    # Package flags can change for new nodes and for the ancestors of added or deleted files
+    flagged = set(added_nodes)
+    for relative_path in changes.added + changes.deleted:
+        ancestor = get_parent_module(module_name_from_file_path(_full_path(relative_path)))
+        while ancestor:
+            if ancestor in G.nodes:
+                flagged.add(ancestor)
+            ancestor = get_parent_module(ancestor)
+    # The package flags the hierarchy last saw, for the nodes whose flag may change
+    package_flags = {node_name: G.nodes[node_name]['module'].is_package for node_name in flagged - added_nodes}
+    for node_name in flagged:
+        module = G.nodes[node_name]['module']
+        # Anything defined by an __init__.py is a package, folder or not
+        module.is_package = "__init__" in sources.get(node_name, '')
+        module.depth = node_name.count('.')
+    set_package_flags(G, flagged)
+
+    if hierarchy is not None:
+        reflagged = [node_name for node_name in flagged - added_nodes
+                     if G.nodes[node_name]['module'].is_package != package_flags[node_name]]
+        # Removed nodes are never re-flagged, so their Module still holds the old flag
+        removed = [(node_name, module, module.is_package) for node_name, module in removed_nodes]
+        removed += [(node_name, G.nodes[node_name]['module'], package_flags[node_name]) for node_name in reflagged]
+        hierarchy.update_nodes(added=list(added_nodes) + reflagged, removed=removed)
+
+    G.graph['commit'] = new_commit
+    G.graph['uncommitted'] = uncommitted
+    print(f"Graph updated: {len(added_nodes)} nodes added, {len(removed_nodes)} removed, {len(G.nodes)} total\n")
+    return G, hierarchy
+
+
+def _full_path(relative_path):
+    """Path of a file given relative to the root, in the form the source listing uses."""
+    return str(Path(CODE_ROOT_FOLDER) / relative_path)
+
+
+def _recheck_working_tree(changes, paths, sources):
+    """
+    Classify paths by what is on disk and in the graph, overriding what the commits said about them.
+
+    Args:
+        changes: SourceChanges between the two commits, patched in place
+        paths: Paths relative to the root that may differ from both commits
+        sources: Source files of the graph, by module name
+    """
+    for changed in (changes.added, changes.modified, changes.deleted):
+        changed[:] = [path for path in changed if path not in paths]
+    for relative_path in sorted(paths):
+        on_disk = os.path.isfile(_full_path(relative_path))
+        in_graph = module_name_from_file_path(_full_path(relative_path)) in sources
+        if on_disk and in_graph:
+            changes.modified.append(relative_path)
+        elif on_disk:
+            changes.added.append(relative_path)
+        elif in_graph:
+            changes.deleted.append(relative_path)
+
+
+def _update_directories(directories, changes):
+    """Patch the directory snapshot, checking the file system only for directories that lost files."""
+    for relative_path in changes.added:
+        directories.add_parents(relative_path)
+    for relative_path in changes.deleted:
+        parts = relative_path.split('/')
+        for depth in range(len(parts) - 1, 0, -1):
+            directory = '/'.join(parts[:depth])
+            if os.path.isdir(os.path.join(CODE_ROOT_FOLDER, directory)):
+                break
+            directories.discard(directory)
+
+
+def _source_descendant_counts(G, sources):
+    """
+    Number of source files below every package, kept in G.graph and patched by each update.
+
+    Counted once on the first update of a graph, so later updates answer
+    "is this an ancestor of a source file" with a lookup.
+    """
+    counts = G.graph.get('source_descendants')
+    if counts is None:
+        counts = Counter()
+        for module_name in sources:
+            _count_source(counts, module_name, 1)
+        G.graph['source_descendants'] = counts
+    return counts
+
+
+def _count_source(counts, module_name, delta):
+    """Add delta to the source count of every ancestor of module_name."""
+    ancestor = get_parent_module(module_name)
+    while ancestor:
+        counts[ancestor] += delta
+        if not counts[ancestor]:
+            del counts[ancestor]
+        ancestor = get_parent_module(ancestor)
+
+
+def _remove_orphans(G, candidates, sources, source_counts):
+    """Remove nodes that a full build would no longer create, walking up to their parents.
+
+    A node exists in a full build if it is a source file, an ancestor of a
+    source file (a package in source_counts), or the target of an internal import.
+    """
+    removed = []
+    pending = deque(sorted(candidates, key=lambda name: name.count('.'), reverse=True))
+    while pending:
+        node_name = pending.popleft()
+        if node_name not in G.nodes or node_name in sources or G.in_degree(node_name) > 0:
+            continue
+        if source_counts.get(node_name):
+            continue
+        removed.append((node_name, G.nodes[node_name]['module']))
+        G.remove_node(node_name)
+        parent = get_parent_module(node_name)
+        if parent and parent in G.nodes:
+            pending.append(parent)
+    return removed
+
+
+def _rebuild(G, hierarchy, progress=None):
+    G = get_dependencies_digraph(engine=G.graph.get('engine', IMPORT_EXTRACTOR), progress=progress)
+    return G, ModuleHierarchy(G) if hierarchy is not None else None
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class LevelAggregator:
+    """Vectorised roll-up of module dependencies to any depth of the package tree.
+
+    Edges are kept as two arrays of PackageTree IDs. For every depth d, an
+    ancestor table maps each tree node to its ancestor at depth d, or to
+    itself when it is not that deep, i.e. the tree cut off at depth d.
+    Aggregating to a depth is a gather through that table followed by a
+    grouped count of the (source, target) pairs, with no Python loop over
+    edges. Dependencies inside one unit of the cut tree are not counted.
+    """
+
+    def __init__(self, tree, sources, targets):
+        """
+        Args:
+            tree: PackageTree the IDs refer to
+            sources: Tree IDs of the dependent modules, one per edge
+            targets: Tree IDs of the modules depended on, one per edge
+        """
+        self.tree = tree
+        self.sources = np.asarray(sources, dtype=np.int32)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.max_depth = int(tree.depths.max()) if len(tree) else 0
+        self.ancestors = self._ancestor_table()
+
+    @classmethod
+    def from_graph(cls, tree, graph):
+        """Aggregator over the edges of an nx.DiGraph or CompactGraph whose nodes are in tree."""
+        if hasattr(graph, 'edge_arrays'):
+            # CompactGraph: translate its node IDs to tree IDs with one gather
+            tree_ids = np.fromiter((tree.ids[name] for name in graph.names), dtype=np.int32, count=len(graph.names))
+            sources, targets = graph.edge_arrays()
+            return cls(tree, tree_ids[sources], tree_ids[targets])
+        ids = tree.ids
+        edges = np.fromiter((ids[name] for edge in graph.edges for name in edge), dtype=np.int32,
+                            count=2 * graph.number_of_edges()).reshape(-1, 2)
+        return cls(tree, edges[:, 0], edges[:, 1])
+
+    def _ancestor_table(self):
+        """ancestors[d][i]: ancestor of node i at depth d, or i itself when it is not deeper than d."""
+        table = np.empty((self.max_depth + 1, len(self.tree)), dtype=np.int32)
+        table[self.max_depth] = np.arange(len(self.tree), dtype=np.int32)
+        depths = self.tree.depths
+        for depth in range(self.max_depth - 1, -1, -1):
+            below = table[depth + 1]
+            # Nodes whose cut at depth + 1 is still deeper than depth move up to the parent
+            table[depth] = np.where(depths[below] > depth, self.tree.parents[below], below)
+        return table
+
+    def aggregate(self, depth, path=None):
+        """
+        Weighted edges between the units of the tree cut off at depth.
+
+        Args:
+            depth: Depth to aggregate to (0 for top-level packages and modules)
+            path: Only count edges with both ends strictly inside this package
+
+        Returns:
+            tuple: (source IDs, target IDs, weights) as arrays, sorted by source then target
+        """
+        sources, targets = self.sources, self.targets
+        if path:
+            start, end = self.tree.subtree_range(path)
+            inside = (sources > start) & (sources < end) & (targets > start) & (targets < end)
+            sources, targets = sources[inside], targets[inside]
+
+        ancestors = self.ancestors[min(depth, self.max_depth)]
+        sources, targets = ancestors[sources], ancestors[targets]
+        between = sources != targets
+        node_count = max(len(self.tree), 1)
+        keys, weights = np.unique(sources[between].astype(np.int64) * node_count + targets[between],
+                                  return_counts=True)
+        return (keys // node_count).astype(np.int32), (keys % node_count).astype(np.int32), weights
+
+    def aggregate_all(self):
+        """{depth: (source IDs, target IDs, weights)} for every depth of the tree."""
+        return {depth: self.aggregate(depth) for depth in range(self.max_depth + 1)}
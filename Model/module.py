@@ -1,12 +1,37 @@
+import sys
+
+# Shared by every module without dependencies, replaced by a set on the first add
+_NO_DEPENDENCIES = frozenset()
+
+
 class Module:
+    __slots__ = ('name', 'parent_module', 'file_path', 'is_package', 'depth', '_dependencies')
+
     def __init__(self, name: str, parent_module: str, file_path: str):
-        self.name = name
-        self.parent_module = parent_module
-        self.file_path = file_path
-        self.dependencies = set()
+        # Interned, so a parent name or file path repeated across nodes is stored once
+        self.name = sys.intern(name)
+        self.parent_module = sys.intern(parent_module)
+        self.file_path = sys.intern(file_path)
+        self._dependencies = _NO_DEPENDENCIES
         self.is_package = False
         self.depth = 0
 
+    @property
+    def dependencies(self):
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, dependencies):
+        self._dependencies = {sys.intern(name) for name in dependencies} if dependencies else _NO_DEPENDENCIES
+
+    def add_dependency(self, name: str):
+        if self._dependencies is _NO_DEPENDENCIES:
+            self._dependencies = set()
+        self._dependencies.add(sys.intern(name))
+
+    def clear_dependencies(self):
+        self._dependencies = _NO_DEPENDENCIES
+
     def get_dependencies(self):
         return self.dependencies
 
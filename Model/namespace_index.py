@@ -0,0 +1,65 @@
+import sys
+
+INTERNAL = "internal"
+EXTERNAL = "external"
+STDLIB = "stdlib"
+
+# sys.stdlib_module_names only exists from Python 3.10 on
+STDLIB_MODULES = frozenset(getattr(sys, 'stdlib_module_names', ())) | frozenset(sys.builtin_module_names)
+
+
+class NamespaceIndex:
+    """Prefix trie over the dotted namespaces of the analysed repository.
+
+    Built once per analysis from the top-level packages, it decides in
+    O(segments) whether an imported module belongs to the repository. Matching
+    is done on whole dotted segments, so with a top-level 'api' package
+    'api.models' is internal but 'apimux' is not.
+    """
+
+    def __init__(self, namespaces=()):
+        self._root = {}
+        self._terminal = object()
+        for namespace in namespaces:
+            self.add(namespace)
+
+    def add(self, namespace):
+        """Register a dotted namespace (and everything below it) as internal."""
+        node = self._root
+        for segment in namespace.split('.'):
+            node = node.setdefault(segment, {})
+        node[self._terminal] = True
+
+    def longest_prefix(self, module_name):
+        """Longest registered namespace that module_name lies in, or None.
+
+        Example:
+            with 'app' registered: 'app.models.user' -> 'app', 'apps' -> None
+        """
+        node = self._root
+        match = None
+        segments = module_name.split('.')
+        for depth, segment in enumerate(segments):
+            node = node.get(segment)
+            if node is None:
+                break
+            if self._terminal in node:
+                match = depth + 1
+        return '.'.join(segments[:match]) if match else None
+
+    def is_internal(self, module_name):
+        return self.longest_prefix(module_name) is not None
+
+    def classify(self, module_name):
+        """Classify an imported module as INTERNAL, STDLIB or EXTERNAL.
+
+        A repository package shadowing a standard library name counts as internal.
+        """
+        if self.is_internal(module_name):
+            return INTERNAL
+        if module_name.partition('.')[0] in STDLIB_MODULES:
+            return STDLIB
+        return EXTERNAL
+
+    def __contains__(self, module_name):
+        return self.is_internal(module_name)
@@ -0,0 +1,83 @@
+import numpy as np
+
+from .common import get_parent_module
+
+
+class PackageTree:
+    """The module tree of a repository, numbered in depth-first order.
+
+    Every package and module gets the ID of its position in a pre-order walk,
+    with children in name order. A subtree then owns the contiguous ID range
+    [id, end), so "is m inside p" is a range check and "everything under p"
+    is a slice, instead of a startswith scan over every node name.
+
+    Example:
+        app (0), app.core (1), app.core.engine (2), app.util (3), main (4)
+        -> app owns [0, 4), app.core owns [1, 3)
+    """
+
+    def __init__(self, names):
+        """
+        Args:
+            names: Dotted module names; their missing ancestors are added
+        """
+        paths = set(names)
+        for name in names:
+            parent = get_parent_module(name)
+            while parent and parent not in paths:
+                paths.add(parent)
+                parent = get_parent_module(parent)
+
+        # Sorting by segments puts every name right before its subtree
+        self.names = sorted(paths, key=lambda path: path.split('.'))
+        self.ids = {name: node_id for node_id, name in enumerate(self.names)}
+        self.depths = np.fromiter((name.count('.') for name in self.names), dtype=np.int32, count=len(self.names))
+        self.parents = np.fromiter((self.ids.get(get_parent_module(name), -1) for name in self.names),
+                                   dtype=np.int32, count=len(self.names))
+        self.ends = self._subtree_ends()
+
+    def _subtree_ends(self):
+        ends = np.empty(len(self.names), dtype=np.int32)
+        depths = self.depths.tolist()
+        open_ids = []
+        for node_id, depth in enumerate(depths):
+            while open_ids and depths[open_ids[-1]] >= depth:
+                ends[open_ids.pop()] = node_id
+            open_ids.append(node_id)
+        for node_id in open_ids:
+            ends[node_id] = len(self.names)
+        return ends
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def subtree_range(self, path=''):
+        """[start, end) IDs of the subtree rooted at path ('' for the whole tree)."""
+        if not path:
+            return 0, len(self.names)
+        node_id = self.ids[path]
+        return node_id, int(self.ends[node_id])
+
+    def contains(self, path, name):
+        """True if name is path itself or lies anywhere below it."""
+        node_id = self.ids.get(name)
+        if node_id is None or (path and path not in self.ids):
+            return False
+        start, end = self.subtree_range(path)
+        return start <= node_id < end
+
+    def descendants(self, path=''):
+        """Names of everything below path, in depth-first order."""
+        start, end = self.subtree_range(path)
+        return self.names[start + 1 if path else start:end]
+
+    def children(self, path=''):
+        """Names directly below path, skipping over each child's subtree."""
+        start, end = self.subtree_range(path)
+        node_id = start + 1 if path else start
+        while node_id < end:
+            yield self.names[node_id]
+            node_id = int(self.ends[node_id])
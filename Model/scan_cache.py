@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+
+from constants import SCAN_CACHE_FILE, IMPORT_EXTRACTOR
+
+# Bump whenever the extracted imports for an unchanged file could differ
+CACHE_VERSION = 4
+
+
+def content_hash(data):
+    """Hash of a file's raw bytes, used to detect real content changes."""
+    return hashlib.sha1(data).hexdigest()
+
+
+class ScanCache:
+    """On-disk cache of the imports extracted from each source file.
+
+    Entries are kept per import extractor, keyed by file path, and carry the
+    file's fingerprint (modification time, size and content hash). A file whose mtime and size
+    are unchanged is trusted without being read. A file whose mtime changed
+    but whose size did not is hashed, and only re-parsed if the hash differs.
+    """
+
+    def __init__(self, cache_file=SCAN_CACHE_FILE, engine=IMPORT_EXTRACTOR):
+        self.cache_file = cache_file
+        self.engine = engine
+        # Entries of every engine, so switching engines does not wipe the others
+        self.engines = {}
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Read the cache file, starting empty if it is missing, corrupt or outdated."""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable scan cache {self.cache_file}: {str(e)}")
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.engines = data.get('engines', {})
+            self.entries = self.engines.get(self.engine, {})
+
+    def save(self):
+        """Write the cache back to disk if anything changed since it was loaded."""
+        if not self._dirty:
+            return
+        self.engines[self.engine] = self.entries
+        temp_file = self.cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'engines': self.engines}, f)
+        os.replace(temp_file, self.cache_file)
+        self._dirty = False
+
+    def lookup(self, file_path):
+        """
+        Get the cached imports of a file if its fingerprint is unchanged.
+
+        Args:
+            file_path: Path to the source file
+
+        Returns:
+            list: Cached module names, or None if the file must be re-parsed
+        """
+        entry = self.entries.get(file_path)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stat = os.stat(file_path)
+        if stat.st_size != entry['size']:
+            self.misses += 1
+            return None
+
+        if stat.st_mtime_ns != entry['mtime']:
+            # Touched but maybe not changed, e.g. by a checkout
+            with open(file_path, 'rb') as f:
+                if content_hash(f.read()) != entry['hash']:
+                    self.misses += 1
+                    return None
+            entry['mtime'] = stat.st_mtime_ns
+            self._dirty = True
+
+        self.hits += 1
+        return entry['imports']
+
+    def store(self, file_path, imports):
+        """Record the imports extracted from a file along with its current fingerprint."""
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            digest = content_hash(f.read())
+        self.entries[file_path] = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': digest,
+            'imports': imports,
+        }
+        self._dirty = True
+
+    def retain(self, file_paths):
+        """Drop the entries of files that are no longer part of the scan."""
+        keep = set(file_paths)
+        stale = [path for path in self.entries if path not in keep]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self._dirty = True
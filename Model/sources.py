@@ -0,0 +1,248 @@
+import os
+from pathlib import Path
+
+import git
+
+from constants import CODE_ROOT_FOLDER, SOURCE_ENUMERATION
+from .ignore_rules import IgnoreRules, PruneStats
+
+
+class SourceListing:
+    """The Python files of the analysed repository, its top-level packages and directories."""
+
+    def __init__(self, files, top_level_packages, mode, pruned, directories=None):
+        self.files = files
+        self.top_level_packages = top_level_packages
+        self.mode = mode
+        self.pruned = pruned
+        self.directories = directories if directories is not None else DirectorySnapshot()
+
+
+class DirectorySnapshot:
+    """The directories under CODE_ROOT_FOLDER, captured while listing the sources.
+
+    Directories are stored under their dotted module name, so package
+    checks and module path resolution are set lookups instead of stat calls.
+    """
+
+    def __init__(self, relative_paths=()):
+        self.module_names = set()
+        for relative_path in relative_paths:
+            self.add(relative_path)
+
+    def add(self, relative_path):
+        """Add a directory given relative to the root, with '/' separators."""
+        self.module_names.add(relative_path.replace('/', '.'))
+
+    def add_parents(self, relative_path):
+        """Add every directory containing the file at relative_path."""
+        parts = relative_path.split('/')
+        for depth in range(1, len(parts)):
+            self.module_names.add('.'.join(parts[:depth]))
+
+    def discard(self, relative_path):
+        self.module_names.discard(relative_path.replace('/', '.'))
+
+    def is_directory(self, module_name):
+        return module_name in self.module_names
+
+    def __len__(self):
+        return len(self.module_names)
+
+
+def list_sources(mode=SOURCE_ENUMERATION, ignore_rules=None, measure_pruned=False):
+    """
+    Enumerate the Python source files under CODE_ROOT_FOLDER.
+
+    Args:
+        mode: 'walk' to search the file system, 'git' to read the tracked files
+            from the git index, or 'auto' to use git whenever the folder is a clone
+        ignore_rules: IgnoreRules to apply (defaults plus the repository's
+            ignore file when not given)
+        measure_pruned: Count the files inside pruned directories when walking,
+            which means descending into them after all
+
+    Returns:
+        SourceListing: File paths in the same form Path.rglob produces them
+    """
+    if ignore_rules is None:
+        ignore_rules = IgnoreRules.for_folder(CODE_ROOT_FOLDER)
+    if mode == 'auto':
+        mode = 'git' if is_git_repository(CODE_ROOT_FOLDER) else 'walk'
+        
+    if mode == 'git':
+        listing = list_sources_from_git_index(ignore_rules)
+    elif mode == 'walk':
+        listing = list_sources_from_walk(ignore_rules, measure_pruned)
+    else:
+        raise ValueError(f"Unknown source enumeration mode '{mode}', expected 'auto', 'git' or 'walk'")
+        
+    print(listing.pruned)
+    return listing
+
+
+def is_git_repository(path):
+    return os.path.exists(os.path.join(path, '.git'))
+
+
+def current_commit():
+    """SHA of the commit checked out in CODE_ROOT_FOLDER, or None if it is not a git clone."""
+    if not is_git_repository(CODE_ROOT_FOLDER):
+        return None
+    try:
+        return git.Repo(CODE_ROOT_FOLDER).head.commit.hexsha
+    except ValueError:
+        # A repository without any commit yet
+        return None
+
+
+def uncommitted_source_files(include_untracked=False):
+    """
+    Python files of the working tree that differ from the commit checked out.
+
+    Args:
+        include_untracked: Also list files git does not track, which only a
+            'walk' enumeration picks up
+
+    Returns:
+        set: Paths relative to the root, with '/' separators, minus ignored ones.
+        Empty outside a git clone
+    """
+    if current_commit() is None:
+        return set()
+    repo = git.Repo(CODE_ROOT_FOLDER)
+    paths = set(repo.git.diff('--name-only', '-z', '--no-renames', 'HEAD', '--', '*.py').split('\0'))
+    if include_untracked:
+        paths.update(repo.git.ls_files('--others', '-z', '--', '*.py').split('\0'))
+    paths.discard('')
+    ignore_rules = IgnoreRules.for_folder(CODE_ROOT_FOLDER)
+    ignored_directories = {}
+    return {path for path in paths if not is_path_ignored(path, ignore_rules, ignored_directories)}
+
+
+def current_repository():
+    """
+    Identity of the repository cloned into CODE_ROOT_FOLDER, which every clone reuses.
+
+    Returns:
+        str: URL of its origin remote, else its root commit, else '' outside git
+    """
+    if not is_git_repository(CODE_ROOT_FOLDER):
+        return ''
+    repo = git.Repo(CODE_ROOT_FOLDER)
+    try:
+        return repo.remotes.origin.url
+    except AttributeError:
+        # No origin remote, e.g. a repository created locally
+        pass
+    try:
+        return repo.git.rev_list('--max-parents=0', 'HEAD').split()[0]
+    except (git.GitCommandError, IndexError):
+        # A repository without any commit yet
+        return ''
+
+
+def list_sources_from_walk(ignore_rules, measure_pruned=False):
+    """Walk the file system, pruning ignored directories before descending into them."""
+    root = str(Path(CODE_ROOT_FOLDER))
+    files = []
+    top_level_packages = []
+    directories = DirectorySnapshot()
+    pruned = PruneStats(measured=measure_pruned)
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        relative_dir = os.path.relpath(dirpath, root)
+        prefix = '' if relative_dir == '.' else relative_dir.replace(os.sep, '/') + '/'
+
+        kept = []
+        for dirname in dirnames:
+            # Pruned directories still exist, so they go into the snapshot too
+            directories.add(prefix + dirname)
+            if ignore_rules.is_ignored(prefix + dirname, True):
+                pruned.directories += 1
+                if measure_pruned:
+                    _measure_directory(os.path.join(dirpath, dirname), pruned)
+            else:
+                kept.append(dirname)
+        dirnames[:] = kept  # os.walk only descends into what is left here
+
+        if not prefix:
+            top_level_packages = [dirname for dirname in kept if not dirname.startswith('.')]
+
+        for filename in filenames:
+            if filename.endswith('.py'):
+                path = os.path.join(dirpath, filename)
+                if ignore_rules.is_ignored(prefix + filename, False):
+                    pruned.add_file(path)
+                else:
+                    files.append(path)
+
+    return SourceListing(files, top_level_packages, 'walk', pruned, directories)
+
+
+def _measure_directory(directory, pruned):
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith('.py'):
+                pruned.add_file(os.path.join(dirpath, filename))
+
+
+def list_sources_from_git_index(ignore_rules):
+    """Read the tracked Python files from the git index with a single ls-files call.
+
+    Untracked files (virtualenvs, build output, ...) are never seen, and files
+    deleted from the working tree but still in the index are left out. Tracked
+    files are filtered through the ignore rules, directory by directory. The
+    directory snapshot holds the directories of the tracked Python files.
+    """
+    repo = git.Repo(CODE_ROOT_FOLDER)
+    # -t tags cached entries with 'H' and entries missing from the working tree with 'R'
+    output = repo.git.ls_files('-z', '-t', '--cached', '--deleted', '--', '*.py')
+    tracked = []
+    deleted = set()
+    for entry in output.split('\0'):
+        if not entry:
+            continue
+        tag, relative_path = entry[0], entry[2:]
+        if tag == 'R':
+            deleted.add(relative_path)
+        else:
+            tracked.append(relative_path)
+
+    root = Path(CODE_ROOT_FOLDER)
+    files = []
+    top_level_packages = set()
+    directories = DirectorySnapshot()
+    pruned = PruneStats()
+    ignored_directories = {}
+    for relative_path in tracked:
+        if relative_path in deleted:
+            continue
+        directories.add_parents(relative_path)
+        path = str(root / relative_path)
+        if is_path_ignored(relative_path, ignore_rules, ignored_directories):
+            pruned.add_file(path)
+            continue
+        files.append(path)
+        top_level, separator, _ = relative_path.partition('/')
+        if separator and not top_level.startswith('.'):
+            top_level_packages.add(top_level)
+
+    pruned.directories = sum(ignored_directories.values())
+    return SourceListing(files, sorted(top_level_packages), 'git', pruned, directories)
+
+
+def is_path_ignored(relative_path, ignore_rules, ignored_directories=None):
+    """Check a file and each of its directories, remembering the verdict for directories."""
+    if ignored_directories is None:
+        ignored_directories = {}
+    parts = relative_path.split('/')
+    for depth in range(1, len(parts)):
+        directory = '/'.join(parts[:depth])
+        ignored = ignored_directories.get(directory)
+        if ignored is None:
+            ignored = ignored_directories[directory] = ignore_rules.is_ignored(directory, True)
+        if ignored:
+            # Everything below an ignored directory is ignored without further checks
+            return True
+    return ignore_rules.is_ignored(relative_path, False)
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from Model.common import AnalysisCancelled
+from gui.utils.analysis_worker import AnalysisWorker, describe_progress
+
+
+def recorded(worker):
+    """Every signal the worker emits, in order."""
+    events = []
+    worker.progress.connect(lambda *args: events.append(('progress',) + args[:3]))
+    worker.completed.connect(lambda result: events.append(('completed', result)))
+    worker.failed.connect(lambda message: events.append(('failed', message)))
+    worker.cancelled.connect(lambda: events.append(('cancelled',)))
+    return events
+
+
+def counting_task(progress):
+    for done in range(1, 4):
+        progress('scan', done, 3)
+    return 'graph'
+
+
+def test_worker_reports_progress_and_result():
+    worker = AnalysisWorker(counting_task)
+    events = recorded(worker)
+
+    worker.run()
+
+    # The first and last report of a stage always get through the throttle
+    assert events[0] == ('progress', 'scan', 1, 3)
+    assert events[-2:] == [('progress', 'scan', 3, 3), ('completed', 'graph')]
+
+
+def test_rate_counts_only_items_done_during_stage():
+    rates = []
+
+    def task(progress):
+        # 49k files come from the scan cache, the rest are parsed
+        progress('scan', 49_000, 50_000)
+        time.sleep(0.1)
+        progress('scan', 50_000, 50_000)
+
+    worker = AnalysisWorker(task)
+    worker.progress.connect(lambda stage, done, total, rate: rates.append(rate))
+
+    worker.run()
+
+    assert rates[0] == 0.0
+    assert 0 < rates[-1] <= 1_000 / 0.1
+
+
+def test_cancel_stops_task_at_next_checkpoint():
+    reached = []
+
+    def task(progress):
+        progress('scan', 1, 3)
+        worker.cancel()
+        reached.append('cancel requested')
+        progress('scan', 2, 3)
+        reached.append('past checkpoint')
+
+    worker = AnalysisWorker(task)
+    events = recorded(worker)
+
+    worker.run()
+
+    assert reached == ['cancel requested']
+    assert events == [('progress', 'scan', 1, 3), ('cancelled',)]
+
+
+def test_failing_task_reports_its_error():
+    def task(progress):
+        raise ValueError("not a git repository")
+
+    worker = AnalysisWorker(task)
+    events = recorded(worker)
+
+    worker.run()
+
+    assert events == [('failed', "not a git repository")]
+
+
+def test_report_raises_once_cancelled():
+    worker = AnalysisWorker(counting_task)
+    worker.cancel()
+
+    assert worker.is_cancel_requested()
+    with pytest.raises(AnalysisCancelled):
+        worker.report('scan', 1, 3)
+
+
+@pytest.mark.parametrize('args, expected', [
+    (('listing', 0, 0, 0.0), 'listing...'),
+    (('scan', 1200, 5000, 800.0), 'scan: 1200/5000 (800/s, ETA 5s)'),
+    (('scan', 100, 50_000, 200.0), 'scan: 100/50000 (200/s, ETA 4m 10s)'),
+    (('graph', 10, 10, 500.0), 'graph: 10/10'),
+])
+def test_describe_progress(args, expected):
+    assert describe_progress(*args) == expected
@@ -2,7 +2,8 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from Model.common import file_path_from_module_name, module_name_from_file_path
+import Model.common
+from Model.common import file_path_from_module_name, get_parent_module, module_name_from_file_path, resolution_cache_info
 from constants import CODE_ROOT_FOLDER
 
 def test_file_path_from_module_name():
@@ -64,5 +65,21 @@ def test_file_path_from_module_name():
     print(f"\nTest Results: {passed} passed, {failed} failed")
     return passed, failed
 
+def test_get_parent_module():
+    assert get_parent_module('app.core.engine') == 'app.core'
+    assert get_parent_module('app') == ''
+
+
+def test_resolution_cache_is_invalidated_when_root_changes(monkeypatch):
+    monkeypatch.setattr(Model.common, 'CODE_ROOT_FOLDER', '/first/root/')
+    assert module_name_from_file_path('/first/root/app/core/engine.py') == 'app.core.engine'
+    assert module_name_from_file_path('/first/root/app/core/engine.py') == 'app.core.engine'
+    assert resolution_cache_info()['module_name_from_file_path'].hits == 1
+
+    monkeypatch.setattr(Model.common, 'CODE_ROOT_FOLDER', '/second/root/')
+    assert module_name_from_file_path('/first/root/app/core/engine.py') != 'app.core.engine'
+    assert resolution_cache_info()['module_name_from_file_path'].currsize == 1
+    assert file_path_from_module_name('app.core') == '/second/root/app/core.py'
+
 if __name__ == "__main__":
     test_file_path_from_module_name() 
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import networkx as nx
+
+from Model.compact_graph import CompactGraph
+from Model.graph_builder import build_compact_graph, get_dependencies_digraph
+from Model.hierarchy import ModuleHierarchy
+from Model.module import Module
+from graph_builder_test import graph_snapshot
+
+
+def hierarchy_snapshot(hierarchy):
+    levels = {}
+    for path, level in hierarchy.depth_dict.items():
+        levels[path] = (sorted(module.name for module in level['modules']), sorted(level['packages']),
+                        sorted(hierarchy.get_aggregated_dependencies(path).items()))
+    return levels
+
+
+def test_compact_build_matches_networkx_build(synthetic_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    compact = build_compact_graph(workers=1, use_cache=False)
+
+    assert graph_snapshot(compact.to_digraph()) == graph_snapshot(G)
+    assert compact.number_of_edges() == G.number_of_edges()
+    assert compact.graph['top_level_packages'] == G.graph['top_level_packages']
+
+
+def test_round_trip_through_digraph(synthetic_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+
+    compact = CompactGraph.from_digraph(G)
+    restored = compact.to_digraph()
+
+    assert graph_snapshot(restored) == graph_snapshot(G)
+    assert restored.graph['sources'] == G.graph['sources']
+    for node_name in G.nodes:
+        assert restored.nodes[node_name]['module'].depth == G.nodes[node_name]['module'].depth
+
+
+def test_queries(synthetic_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    compact = CompactGraph.from_digraph(G)
+
+    for node_name in G.nodes:
+        assert sorted(compact.successors(node_name)) == sorted(G.successors(node_name))
+        assert sorted(compact.predecessors(node_name)) == sorted(G.predecessors(node_name))
+        assert compact.in_degree(node_name) == G.in_degree(node_name)
+        assert compact.nodes[node_name]['module'].dependencies == G.nodes[node_name]['module'].dependencies
+    assert compact.file_path('app.core.engine') == G.graph['sources']['app.core.engine']
+    assert 'apimux' not in compact.nodes and compact.nodes.get('apimux') is None
+
+
+def test_hierarchy_over_compact_graph(synthetic_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    compact = build_compact_graph(workers=1, use_cache=False)
+
+    assert hierarchy_snapshot(ModuleHierarchy(compact)) == hierarchy_snapshot(ModuleHierarchy(G))
+
+
+def test_memory_per_edge():
+    G = CompactGraph.from_digraph(_chain_digraph(10_000))
+
+    # Forward and reverse int32 targets plus int64 offsets per node
+    assert G.memory_usage() <= 8 * G.number_of_edges() + 20 * len(G) + 64
+
+
+def _chain_digraph(size):
+    G = nx.DiGraph()
+    for i in range(size):
+        G.add_node(f"m{i}", module=Module(f"m{i}", '', f"m{i}.py"))
+    G.add_edges_from((f"m{i}", f"m{(i + 1) % size}") for i in range(size))
+    return G
@@ -0,0 +1,56 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import git
+
+import Model.common
+import Model.graph_builder
+import Model.history
+import Model.incremental
+import Model.sources
+
+# Small project used by the tests that build a graph from disk
+SYNTHETIC_FILES = {
+    'main.py': 'import os\nfrom app.core import engine\n',
+    'app/__init__.py': '',
+    'app/core/__init__.py': 'from .engine import run\n',
+    'app/core/engine.py': 'import sys\nfrom app.util import helpers\nfrom ..util.helpers import log\n',
+    'app/util/__init__.py': '',
+    'app/util/helpers.py': 'import json, app.core\n',
+    'tools/cli.py': 'import app.core.engine as engine\nimport apimux\n',
+}
+
+
+def write_files(root, files):
+    for relative_path, content in files.items():
+        path = os.path.join(root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+@pytest.fixture
+def synthetic_repo(tmp_path, monkeypatch):
+    """Point CODE_ROOT_FOLDER at a freshly written copy of SYNTHETIC_FILES."""
+    root = str(tmp_path / 'repo') + os.path.sep
+    write_files(root, SYNTHETIC_FILES)
+    for module in (Model.common, Model.sources, Model.graph_builder, Model.incremental, Model.history):
+        monkeypatch.setattr(module, 'CODE_ROOT_FOLDER', root)
+    for module in (Model.graph_builder, Model.incremental):
+        monkeypatch.setattr(module, 'SCAN_CACHE_FILE', str(tmp_path / 'scan_cache.json'))
+    return root
+
+
+@pytest.fixture
+def synthetic_git_repo(synthetic_repo):
+    """The synthetic repository committed to a fresh git repository."""
+    repo = git.Repo.init(synthetic_repo)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'ArcRecovery Tests')
+        config.set_value('user', 'email', 'tests@example.com')
+    repo.git.add('--all')
+    repo.index.commit('Initial commit')
+    return synthetic_repo
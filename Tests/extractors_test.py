@@ -0,0 +1,81 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from Model.extractors import ImportExtractor, get_extractor
+from Model.imports_helper import scan_imports_from_bytes
+
+PLAIN_SOURCE = b'''"""Module docstring."""
+import os, sys
+from typing import (
+    List,
+)
+from .sibling import thing
+
+
+def run():
+    import json
+'''
+
+TRICKY_SOURCE = b'''"""Usage example:
+
+import not_a_dependency
+"""
+from typing import TYPE_CHECKING
+if TYPE_CHECKING: import real_dependency
+try: import optional_dependency
+except ImportError: pass
+'''
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / 'pkg' / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize('engine', ['regex', 'ast', 'hybrid'])
+def test_engines_agree_on_plain_files(tmp_path, engine):
+    file_path = write(tmp_path, 'plain.py', PLAIN_SOURCE)
+    assert get_extractor(engine).imports_from_file(file_path) == get_extractor('ast').imports_from_file(file_path)
+    assert not scan_imports_from_bytes(PLAIN_SOURCE, file_path)[1]
+
+
+def test_hybrid_uses_ast_for_ambiguous_files(tmp_path):
+    file_path = write(tmp_path, 'tricky.py', TRICKY_SOURCE)
+
+    assert scan_imports_from_bytes(TRICKY_SOURCE, file_path)[1]
+    assert 'not_a_dependency' in get_extractor('regex').imports_from_file(file_path)
+    assert get_extractor('hybrid').imports_from_file(file_path) == [
+        'typing', 'real_dependency', 'optional_dependency'
+    ]
+
+
+@pytest.mark.parametrize('engine', ['regex', 'ast', 'hybrid'])
+def test_mapped_and_read_files_give_same_imports(tmp_path, engine):
+    extractor = get_extractor(engine)
+    for name, source in (('plain.py', PLAIN_SOURCE), ('tricky.py', TRICKY_SOURCE)):
+        file_path = write(tmp_path, name, source)
+        assert extractor.imports_from_file(file_path, use_mmap=True) == \
+            extractor.imports_from_file(file_path, use_mmap=False), name
+
+
+def test_ast_falls_back_to_regex_on_syntax_errors(tmp_path):
+    file_path = write(tmp_path, 'legacy.py', b'import os\nprint "python 2"\n')
+    assert get_extractor('ast').imports_from_file(file_path) == ['os']
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        get_extractor('tokenizer')
+
+
+def test_engine_without_imports_from_bytes_cannot_be_created():
+    class IncompleteExtractor(ImportExtractor):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        IncompleteExtractor()
@@ -0,0 +1,82 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import git
+import pytest
+
+from Model.common import AnalysisCancelled
+from gui.utils.github_utils import clone_repository
+from conftest import SYNTHETIC_FILES, write_files
+
+
+def make_remote(tmp_path):
+    """A bare repository with two commits, Python sources and other files."""
+    source = str(tmp_path / 'source')
+    write_files(source, SYNTHETIC_FILES)
+    write_files(source, {'docs/guide.md': '# Guide\n', 'static/app.js': 'console.log(1);\n'})
+    repo = git.Repo.init(source)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'ArcRecovery Tests')
+        config.set_value('user', 'email', 'tests@example.com')
+    repo.git.add('--all')
+    repo.index.commit('First commit')
+    write_files(source, {'app/extra.py': 'import app\n'})
+    repo.git.add('--all')
+    repo.index.commit('Second commit')
+
+    remote = str(tmp_path / 'remote.git')
+    bare = git.Repo.clone_from(source, remote, bare=True)
+    bare.git.config('uploadpack.allowFilter', 'true')
+    return remote
+
+
+def checked_out_files(path):
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [dirname for dirname in dirnames if dirname != '.git']
+        files.update(os.path.relpath(os.path.join(dirpath, filename), path) for filename in filenames)
+    return files
+
+
+def test_lean_clone_checks_out_only_latest_python_sources(tmp_path):
+    remote = make_remote(tmp_path)
+    path = str(tmp_path / 'lean')
+
+    clone_repository(remote, path, lean=True)
+
+    assert checked_out_files(path) == set(SYNTHETIC_FILES) | {'app/extra.py'}
+    repo = git.Repo(path)
+    assert repo.git.rev_list('--count', 'HEAD') == '1'
+    assert repo.git.config('remote.origin.partialclonefilter') == 'blob:none'
+
+
+def test_full_clone(tmp_path):
+    remote = make_remote(tmp_path)
+    path = str(tmp_path / 'full')
+
+    clone_repository(remote, path, lean=False)
+
+    assert {'docs/guide.md', 'static/app.js', 'app/extra.py'} <= checked_out_files(path)
+    assert git.Repo(path).git.rev_list('--count', 'HEAD') == '2'
+
+
+def test_clone_reports_progress_and_can_be_cancelled(tmp_path):
+    remote = make_remote(tmp_path)
+    stages = []
+
+    clone_repository(remote, str(tmp_path / 'lean'), lean=True, progress=lambda stage, *_: stages.append(stage))
+    assert stages[-1] == 'clone: sparse checkout'
+
+    cancelled_at = []
+
+    def cancel(stage, done=0, total=0):
+        # Cancel at git's first progress line, while the clone process is running
+        cancelled_at.append(stage)
+        raise AnalysisCancelled(stage)
+
+    path = str(tmp_path / 'cancelled')
+    with pytest.raises(AnalysisCancelled):
+        clone_repository(remote, path, lean=True, progress=cancel)
+    assert cancelled_at[0].startswith('clone: ') and 'clone: sparse checkout' not in cancelled_at
+    assert checked_out_files(path) == set()
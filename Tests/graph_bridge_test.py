@@ -0,0 +1,42 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.utils.graph_bridge import GraphBridge
+
+
+class RecordingPanel:
+    def __init__(self):
+        self.events = []
+
+    def handle_page_ready(self):
+        self.events.append(('ready',))
+
+    def handle_node_click(self, node):
+        self.events.append(('click', node))
+
+    def handle_stable_frame(self, milliseconds):
+        self.events.append(('frame', milliseconds))
+
+
+def test_page_events_reach_the_panel():
+    panel = RecordingPanel()
+    bridge = GraphBridge(panel)
+
+    bridge.pageReady()
+    bridge.nodeClicked({'id': 'core', 'label': 'core'})
+    bridge.stableFrame(12.5)
+
+    assert panel.events == [('ready',), ('click', {'id': 'core', 'label': 'core'}), ('frame', 12.5)]
+
+
+def test_diffs_are_pushed_as_signals():
+    bridge = GraphBridge(RecordingPanel())
+    pushed = []
+    bridge.diffPushed.connect(pushed.append)
+    bridge.physicsChanged.connect(pushed.append)
+
+    bridge.diffPushed.emit('{"nodes": {}}')
+    bridge.physicsChanged.emit('{"physics": {"enabled": true}}')
+
+    assert pushed == ['{"nodes": {}}', '{"physics": {"enabled": true}}']
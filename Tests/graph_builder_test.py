@@ -0,0 +1,133 @@
+import os
+import sys
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import git
+import pytest
+
+from Model.common import AnalysisCancelled
+from Model.graph_builder import build_graph, get_dependencies_digraph, scan_files, set_package_flags
+from Model.scan_cache import ScanCache
+from Model.sources import list_sources
+from conftest import write_files
+
+
+def graph_snapshot(G):
+    """Everything about a graph that should not depend on how it was built."""
+    nodes = {}
+    for node_name, node_data in G.nodes(data=True):
+        module = node_data['module']
+        nodes[node_name] = (module.parent_module, module.is_package, sorted(module.dependencies))
+    return nodes, sorted(G.edges)
+
+
+def test_parallel_scan_matches_serial_scan(synthetic_repo):
+    files = sorted(str(path) for path in Path(synthetic_repo).rglob('*.py'))
+
+    serial = scan_files(files, workers=1)
+    parallel = scan_files(files, workers=2, chunk_size=2)
+
+    assert parallel == serial
+
+
+def test_parallel_graph_matches_serial_graph(synthetic_repo):
+    serial = build_graph(workers=1)
+    parallel = build_graph(workers=2, chunk_size=2)
+
+    assert graph_snapshot(parallel) == graph_snapshot(serial)
+    assert ('tools.cli', 'app.core.engine') in serial.edges
+
+
+def test_scan_cache_only_parses_changed_files(synthetic_repo, tmp_path):
+    files = sorted(str(path) for path in Path(synthetic_repo).rglob('*.py'))
+    cache_file = str(tmp_path / 'cache.json')
+
+    first = scan_files(files, workers=1, cache=ScanCache(cache_file))
+
+    cache = ScanCache(cache_file)
+    assert scan_files(files, workers=1, cache=cache) == first
+    assert (cache.hits, cache.misses) == (len(files), 0)
+
+    changed_file = os.path.join(synthetic_repo, 'tools', 'cli.py')
+    with open(changed_file, 'a') as f:
+        f.write('import app.util\n')
+
+    cache = ScanCache(cache_file)
+    results = scan_files(files, workers=1, cache=cache)
+    assert (cache.hits, cache.misses) == (len(files) - 1, 1)
+    assert 'app.util' in results[files.index(changed_file)]
+
+
+def test_scan_progress_counts_every_file(synthetic_repo):
+    files = sorted(str(path) for path in Path(synthetic_repo).rglob('*.py'))
+    reports = []
+
+    scan_files(files, workers=2, chunk_size=2, progress=lambda *report: reports.append(report))
+
+    assert reports[0] == ('scan', 0, len(files))
+    assert reports[-1] == ('scan', len(files), len(files))
+    assert [done for _, done, _ in reports] == list(range(len(files) + 1))
+
+
+def test_cancelled_progress_stops_the_build(synthetic_repo):
+    stages = []
+
+    def progress(stage, done=0, total=0):
+        stages.append(stage)
+        if stage == 'scan' and done == 2:
+            raise AnalysisCancelled(stage)
+
+    with pytest.raises(AnalysisCancelled):
+        build_graph(workers=2, chunk_size=2, use_cache=False, progress=progress)
+    assert 'graph' not in stages
+
+
+def test_build_graph_uses_scan_cache(synthetic_repo):
+    assert graph_snapshot(build_graph(workers=1)) == graph_snapshot(build_graph(workers=1))
+    assert graph_snapshot(build_graph(workers=1)) == graph_snapshot(build_graph(workers=1, use_cache=False))
+
+
+def test_graph_records_repository_identity(synthetic_git_repo):
+    repo = git.Repo(synthetic_git_repo)
+    root_commit = repo.head.commit.hexsha
+
+    # Without a remote the root commit tells repositories apart, with one its URL
+    assert build_graph(workers=1, use_cache=False).graph['repository'] == root_commit
+    repo.create_remote('origin', 'https://github.com/zeeguu/api')
+    assert build_graph(workers=1, use_cache=False).graph['repository'] == 'https://github.com/zeeguu/api'
+
+
+def test_git_enumeration_skips_untracked_files(synthetic_git_repo):
+    write_files(synthetic_git_repo, {'scratch/experiment.py': 'import app\n'})
+
+    walked = list_sources('walk')
+    indexed = list_sources('git')
+
+    assert sorted(indexed.files) == sorted(file for file in walked.files if '/scratch/' not in file)
+    assert 'scratch' in walked.top_level_packages
+    assert indexed.top_level_packages == ['app', 'tools']
+    assert list_sources('auto').mode == 'git'
+
+
+@pytest.mark.parametrize('enumeration', ['walk', 'git'])
+def test_directory_snapshot_replaces_isdir_calls(synthetic_git_repo, monkeypatch, enumeration):
+    G = get_dependencies_digraph(workers=1, use_cache=False, enumeration=enumeration)
+
+    reference = G.copy()
+    reference.graph.pop('directories')
+    expected = {name: data['module'].is_package for name, data in set_package_flags(reference).nodes(data=True)}
+
+    # GitPython may still look for .git, but no module or package path is checked
+    checked = []
+    real_isdir = os.path.isdir
+    def isdir(path):
+        if '.git' not in str(path):
+            checked.append(path)
+        return real_isdir(path)
+    monkeypatch.setattr(os.path, 'isdir', isdir)
+    snapshot_graph = get_dependencies_digraph(workers=1, use_cache=False, enumeration=enumeration)
+
+    assert checked == []
+    assert {name: data['module'].is_package for name, data in snapshot_graph.nodes(data=True)} == expected
+    assert snapshot_graph.nodes['tools']['module'].file_path.endswith('tools' + os.sep)
@@ -0,0 +1,77 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+import gui.utils.graph_layout
+from gui.utils.graph_layout import force_directed_positions, layout_network
+
+
+def chain_network(node_count):
+    nodes = [{'id': f"m{i}", 'label': f"m{i}"} for i in range(node_count)]
+    edges = [{'from': f"m{i}", 'to': f"m{i + 1}"} for i in range(node_count - 1)]
+    return nodes, edges
+
+
+@pytest.mark.parametrize('force_limit', [0, 1000])
+def test_every_node_gets_distinct_integer_coordinates(monkeypatch, force_limit):
+    # A limit of 0 sends the level to the spiral layout, 1000 to the force-directed one
+    monkeypatch.setattr(gui.utils.graph_layout, 'FORCE_LAYOUT_MAX_NODES', force_limit)
+    nodes, edges = chain_network(200)
+
+    layout_network(nodes, edges)
+
+    coordinates = {(node['x'], node['y']) for node in nodes}
+    assert len(coordinates) == len(nodes)
+    assert all(isinstance(node['x'], int) and isinstance(node['y'], int) for node in nodes)
+
+
+def test_layout_is_deterministic():
+    first, edges = chain_network(50)
+    second, _ = chain_network(50)
+    layout_network(first, edges)
+    layout_network(second, edges)
+    assert first == second
+
+
+def test_force_directed_layout_keeps_clusters_together():
+    rng = np.random.default_rng(1)
+    # Two cliques of 30 nodes, joined by a single edge
+    clique = np.array([(i, j) for i in range(30) for j in range(i + 1, 30)])
+    edges = np.concatenate((clique, clique + 30, [[0, 30]]))
+    order = rng.permutation(60)
+
+    positions = force_directed_positions(60, order[edges[:, 0]], order[edges[:, 1]])
+
+    def distance(pairs):
+        return np.hypot(*(positions[order[pairs[:, 0]]] - positions[order[pairs[:, 1]]]).T).mean()
+    between = np.array([(i, j) for i in range(30) for j in range(30, 60)])
+    assert distance(clique) < distance(between)
+
+
+def test_empty_level():
+    layout_network([], [])
+
+
+@pytest.mark.parametrize('force_limit', [0, 1000])
+def test_only_new_nodes_are_placed(monkeypatch, force_limit):
+    monkeypatch.setattr(gui.utils.graph_layout, 'FORCE_LAYOUT_MAX_NODES', force_limit)
+    nodes, edges = chain_network(100)
+    layout_network(nodes, edges)
+    known_positions = {node['id']: (node['x'], node['y']) for node in nodes}
+
+    # Two new nodes: one next to m0, one without edges
+    grown, grown_edges = chain_network(100)
+    grown += [{'id': 'new', 'label': 'new'}, {'id': 'loose', 'label': 'loose'}]
+    grown_edges.append({'from': 'new', 'to': 'm0'})
+
+    assert layout_network(grown, grown_edges, known_positions) == 2
+    assert all((node['x'], node['y']) == known_positions[node['id']] for node in grown[:100])
+    coordinates = np.array([(node['x'], node['y']) for node in grown])
+    distances = np.hypot(*(coordinates[:100] - coordinates[100]).T)
+    assert np.argmin(distances) == 0 or distances[0] < np.median(distances)
+    assert len({tuple(c) for c in coordinates.tolist()}) == len(grown)
+
+    assert layout_network(grown, grown_edges, {node['id']: (node['x'], node['y']) for node in grown}) == 0
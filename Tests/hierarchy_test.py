@@ -2,7 +2,15 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from Model.graph_builder import get_module_hierarchy
+import random
+
+import networkx as nx
+
+from Model.common import get_parent_module
+from Model.compact_graph import CompactGraph
+from Model.graph_builder import get_dependencies_digraph, get_module_hierarchy
+from Model.hierarchy import ModuleHierarchy
+from Model.module import Module
 
 def test_module_hierarchy():
     """Test the hierarchical organization of modules."""
@@ -71,6 +79,79 @@ def test_module_hierarchy():
     
     print("\nTest completed!")
 
+def random_graph(seed, module_count=300):
+    """Modules in a random package tree, with dependencies anywhere in the tree."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < module_count:
+        depth = rng.randint(1, 5)
+        names.add('.'.join(f"{'abc'[rng.randrange(3)]}{rng.randrange(3)}" for _ in range(depth)))
+    # Make sure every ancestor exists, as build_graph does
+    for name in list(names):
+        parent = get_parent_module(name)
+        while parent:
+            names.add(parent)
+            parent = get_parent_module(parent)
+
+    names = sorted(names)
+    has_children = {get_parent_module(name) for name in names}
+    G = nx.DiGraph()
+    for name in names:
+        module = Module(name, get_parent_module(name), name.replace('.', '/') + '.py')
+        module.is_package = name in has_children or rng.random() < 0.1
+        G.add_node(name, module=module)
+    for name in names:
+        for dependency in rng.sample(names, rng.randint(0, 6)):
+            G.add_edge(name, dependency)
+            G.nodes[name]['module'].add_dependency(dependency)
+    # A dependency that is not a node is ignored by both implementations
+    G.nodes[names[0]]['module'].add_dependency('missing.module')
+    return G
+
+
+def assert_rollup_matches_scan(hierarchy):
+    for path in list(hierarchy.depth_dict) + ['not.a.level']:
+        assert hierarchy.get_aggregated_dependencies(path) == hierarchy.aggregate_dependencies_by_scan(path), path
+
+
+def test_rollup_matches_scan_on_random_graphs():
+    for seed in range(20):
+        assert_rollup_matches_scan(ModuleHierarchy(random_graph(seed)))
+
+
+def test_rollup_matches_scan_on_synthetic_repo(synthetic_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    hierarchy = ModuleHierarchy(G)
+    assert_rollup_matches_scan(hierarchy)
+    assert hierarchy.get_aggregated_dependencies('') == {('main', 'app'): 1, ('tools', 'app'): 1}
+    assert_rollup_matches_scan(ModuleHierarchy(CompactGraph.from_digraph(G)))
+
+
+def test_rollup_is_recomputed_after_update():
+    G = random_graph(0)
+    hierarchy = ModuleHierarchy(G)
+    assert_rollup_matches_scan(hierarchy)
+
+    module = Module('a0.b1.new', 'a0.b1', 'a0/b1/new.py')
+    G.add_node(module.name, module=module)
+    for dependency in ('c2.a0.b1', 'b2.c1', 'a0.c0.a1'):
+        if dependency in G.nodes:
+            G.add_edge(module.name, dependency)
+            module.add_dependency(dependency)
+    hierarchy.update_nodes(added=[module.name])
+    assert_rollup_matches_scan(hierarchy)
+
+def test_matches_filter(synthetic_repo):
+    hierarchy = ModuleHierarchy(get_dependencies_digraph(workers=1, use_cache=False))
+
+    assert hierarchy.matches_filter('tools.cli', '')
+    assert hierarchy.matches_filter('app.core.engine', 'app.*')
+    assert hierarchy.matches_filter('app.core.engine', 'core.*')
+    assert not hierarchy.matches_filter('tools.cli', 'core.*')
+    # A package stays visible when something below it matches
+    assert hierarchy.matches_filter('app', 'core.*')
+    assert not hierarchy.matches_filter('tools', 'core.*')
+
 if __name__ == "__main__":
     test_module_hierarchy() 
     
\ No newline at end of file
@@ -0,0 +1,32 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.graph_builder import get_dependencies_digraph
+from Model.history import HistoryAnalyser, write_history_csv
+from conftest import write_files
+from incremental_test import commit_changes, graph_state
+
+
+def test_history_matches_checkouts(synthetic_git_repo, tmp_path):
+    first = get_dependencies_digraph(workers=1, use_cache=False)
+    commit_changes(synthetic_git_repo, files={'app/core/new.py': 'import app.util.helpers\n'})
+    commit_changes(synthetic_git_repo, files={'README.md': 'Only documentation changed\n'})
+    commit_changes(synthetic_git_repo, files={'app/util/helpers.py': 'import json\n'},
+                   removed=['tools/cli.py'])
+    last = get_dependencies_digraph(workers=1, use_cache=False)
+
+    analyser = HistoryAnalyser()
+    snapshots = analyser.analyse()
+
+    assert len(snapshots) == 4
+    assert graph_state(snapshots[0].graph) == graph_state(first)
+    assert graph_state(snapshots[-1].graph) == graph_state(last)
+    # The documentation-only commit reuses the graph, and unchanged blobs are read once
+    assert snapshots[2].graph is snapshots[1].graph
+    assert analyser.blobs_read == 7 + 1 + 1
+    assert [snapshot.metrics['modules'] for snapshot in snapshots] == [7, 8, 8, 7]
+
+    csv_file = tmp_path / 'history.csv'
+    write_history_csv(snapshots, csv_file)
+    assert len(csv_file.read_text().splitlines()) == 5
@@ -0,0 +1,59 @@
+import os
+import re
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from urllib.parse import unquote, urlparse
+
+import pytest
+
+import gui.utils.html_template
+from gui.utils.html_template import network_options, render_viewer_page, vis_library_available
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def bundled_library(monkeypatch):
+    monkeypatch.setattr(gui.utils.html_template, 'VIS_LIBRARY_FOLDER', os.path.join(REPO_ROOT, 'lib'))
+
+
+def test_viewer_references_bundled_assets_and_web_channel():
+    html = render_viewer_page()
+
+    urls = re.findall(r'(?:src|href)="([^"]+)"', html)
+    assert urls[-1] == 'qrc:///qtwebchannel/qwebchannel.js'
+    for url in urls[:-1]:
+        assert url.startswith('file://')
+        assert os.path.exists(unquote(urlparse(url).path))
+    assert vis_library_available()
+
+
+def test_viewer_talks_to_the_bridge():
+    html = render_viewer_page()
+
+    assert 'new vis.DataSet([])' in html
+    for call in ('bridge.nodeClicked(', 'bridge.stableFrame(', 'bridge.pageReady()',
+                 'bridge.diffPushed.connect(', 'bridge.physicsChanged.connect('):
+        assert call in html
+    assert 'console.log' not in html
+
+
+def test_viewer_detaches_the_pending_frame_listener():
+    html = render_viewer_page()
+
+    # A stale "stabilized" listener would otherwise report the frame of a later diff
+    assert 'network.off(pendingFrame.event, pendingFrame.handler)' in html
+    assert 'network.once(' not in html
+
+
+def test_options_skip_physics_unless_live():
+    static = render_viewer_page(network_options(False))
+    live = render_viewer_page(network_options(True))
+
+    embedded = re.search(r'new vis\.Network\(container, \{nodes: nodes, edges: edges\}, (.*)\);', static).group(1)
+    assert json.loads(embedded) == network_options(False)
+    assert network_options(False)['physics']['enabled'] is False
+    assert network_options(False)['edges']['smooth']['type'] == 'continuous'
+    assert '"physics": {"forceAtlas2Based"' in live and network_options(True)['physics']['enabled'] is True
@@ -0,0 +1,55 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from Model.ignore_rules import IgnoreRules
+from Model.sources import list_sources
+from conftest import write_files
+
+
+@pytest.mark.parametrize('pattern, path, is_dir, expected', [
+    ('venv/', 'venv', True, True),
+    ('venv/', 'app/venv', True, True),
+    ('venv/', 'venv', False, False),
+    ('/build/', 'build', True, True),
+    ('/build/', 'app/build', True, False),
+    ('*.egg-info/', 'app.egg-info', True, True),
+    ('app/generated_*.py', 'app/generated_models.py', False, True),
+    ('app/generated_*.py', 'other/app/generated_models.py', False, False),
+    ('**/fixtures', 'a/b/fixtures', True, True),
+    ('docs/**', 'docs/conf.py', False, True),
+    ('test_?.py', 'pkg/test_1.py', False, True),
+    ('test_[!0-9].py', 'pkg/test_1.py', False, False),
+])
+def test_gitignore_patterns(pattern, path, is_dir, expected):
+    assert IgnoreRules([pattern]).is_ignored(path, is_dir) == expected
+
+
+def test_negation_last_rule_wins():
+    rules = IgnoreRules(['# comments and blank lines are skipped', '', '*_pb2.py', '!keep_pb2.py'])
+    assert rules.is_ignored('api/service_pb2.py', False)
+    assert not rules.is_ignored('api/keep_pb2.py', False)
+
+
+# The walk also prunes .git, which the index never lists
+@pytest.mark.parametrize('mode, pruned_directories', [('walk', 4), ('git', 3)])
+def test_ignored_directories_are_pruned(synthetic_git_repo, mode, pruned_directories):
+    write_files(synthetic_git_repo, {
+        '.arcrecoveryignore': 'tools/\n',
+        'venv/lib/site-packages/six.py': 'import os\n',
+        'app/migrations/0001_initial.py': 'import app\n',
+    })
+    if mode == 'git':
+        import git
+        git.Repo(synthetic_git_repo).git.add('--all', '--force')
+
+    listing = list_sources(mode, measure_pruned=True)
+    relative_files = sorted(os.path.relpath(file, synthetic_git_repo) for file in listing.files)
+
+    assert relative_files == ['app/__init__.py', 'app/core/__init__.py', 'app/core/engine.py',
+                              'app/util/__init__.py', 'app/util/helpers.py', 'main.py']
+    assert 'tools' not in listing.top_level_packages and 'venv' not in listing.top_level_packages
+    assert (listing.pruned.directories, listing.pruned.files) == (pruned_directories, 3)
+    assert listing.pruned.bytes > 0
@@ -0,0 +1,52 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.imports_helper import import_from_line, imports_from_file, imports_from_source
+
+
+def test_imports_from_source_multiline_statements():
+    """Continuation lines and parenthesised name lists are read as one statement."""
+    source = '''import os
+from typing import (
+    List,
+    Optional,
+)
+import json, \\
+    tools.helper as helper
+from zeeguu.core \\
+    import model
+    import indented.module
+import logging  # comment, with a comma
+importlib_version = 1
+from_cache = True
+'''
+    expected = ['os', 'typing', 'json', 'tools.helper', 'zeeguu.core', 'indented.module', 'logging']
+    assert imports_from_source(source, 'test_imports.py') == expected
+
+
+def test_imports_from_source_matches_line_parser():
+    """The single-pass engine agrees with import_from_line on one-line statements."""
+    lines = [
+        "import os", "import os, sys", "import numpy as np", "from os import path",
+        "from os.path import join", "import xml.etree.ElementTree", "from os import (path, walk)",
+        "   import os   ", "   from   os   import   path   ", "# import os", "def import_something():",
+    ]
+    for line in lines:
+        assert imports_from_source(line, 'test_imports.py') == import_from_line(line), line
+
+
+def test_imports_from_file_reading_modes(tmp_path):
+    """Raw and memory-mapped reads agree, and non-UTF-8 files do not crash the scan."""
+    source_file = tmp_path / 'generated.py'
+    source_file.write_bytes(
+        b'# -*- coding: latin-1 -*-\n'
+        b'import os, sys\n'
+        b'from typing import (\n    List,\n)\n'
+        b'GREETING = "h\xe9llo \xff"\n'
+        + b'VALUE = 1  # not an import\n' * 5000
+        + b'import json\n'
+    )
+    expected = ['os', 'sys', 'typing', 'json']
+    assert imports_from_file(str(source_file), use_mmap=False) == expected
+    assert imports_from_file(str(source_file), use_mmap=True) == expected
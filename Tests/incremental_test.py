@@ -0,0 +1,129 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import git
+import pytest
+
+import Model.incremental
+from Model.common import AnalysisCancelled
+from Model.graph_builder import get_dependencies_digraph
+from Model.hierarchy import ModuleHierarchy
+from Model.incremental import _source_descendant_counts, changed_source_files, update_dependencies_digraph
+from Model.scan_cache import ScanCache
+from conftest import write_files
+
+
+def graph_state(G):
+    nodes = {name: (data['module'].is_package, data['module'].depth, sorted(data['module'].dependencies))
+             for name, data in G.nodes(data=True)}
+    return nodes, sorted(G.edges)
+
+
+def hierarchy_state(hierarchy):
+    return {path: (sorted(module.name for module in level['modules']), sorted(level['packages']))
+            for path, level in hierarchy.depth_dict.items()}
+
+
+def commit_changes(root, files=None, removed=(), renamed=()):
+    repo = git.Repo(root)
+    write_files(root, files or {})
+    for path in removed:
+        repo.git.rm(path)
+    for old_path, new_path in renamed:
+        repo.git.mv(old_path, new_path)
+    repo.git.add('--all')
+    repo.index.commit('Change sources')
+
+
+def test_changed_source_files(synthetic_git_repo):
+    old_commit = git.Repo(synthetic_git_repo).head.commit.hexsha
+    commit_changes(synthetic_git_repo,
+                   files={'app/util/helpers.py': 'import os\n', 'app/core/new.py': 'import app.util\n'},
+                   removed=['app/core/engine.py'], renamed=[('main.py', 'launcher.py')])
+
+    changes = changed_source_files(old_commit, 'HEAD')
+
+    assert sorted(changes.added) == ['app/core/new.py', 'launcher.py']
+    assert changes.modified == ['app/util/helpers.py']
+    assert sorted(changes.deleted) == ['app/core/engine.py', 'main.py']
+
+
+def test_incremental_update_matches_full_rebuild(synthetic_git_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    hierarchy = ModuleHierarchy(G)
+
+    commit_changes(synthetic_git_repo,
+                   files={'app/util/helpers.py': 'import os\n',
+                          'app/core/new.py': 'import app.util\nfrom app.extra.deep import thing\n',
+                          'app/storage/__init__.py': '', 'app/storage/db.py': 'from app.core import new\n'},
+                   removed=['app/core/engine.py', 'app/core/__init__.py'],
+                   renamed=[('main.py', 'launcher.py')])
+
+    updated, updated_hierarchy = update_dependencies_digraph(G, hierarchy, workers=1, use_cache=False)
+    rebuilt = get_dependencies_digraph(workers=1, use_cache=False)
+
+    assert updated is G and updated_hierarchy is hierarchy
+    assert updated.graph['source_descendants'] == _source_descendant_counts(rebuilt, rebuilt.graph['sources'])
+    assert graph_state(updated) == graph_state(rebuilt)
+    assert hierarchy_state(updated_hierarchy) == hierarchy_state(ModuleHierarchy(rebuilt))
+    assert updated.graph['commit'] == rebuilt.graph['commit']
+
+
+def test_new_top_level_package_triggers_rebuild(synthetic_git_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    commit_changes(synthetic_git_repo, files={'plugins/extra.py': 'import app\n'})
+
+    updated, _ = update_dependencies_digraph(G, workers=1, use_cache=False)
+
+    assert updated is not G
+    assert 'plugins' in updated.graph['top_level_packages']
+
+
+def test_cancelled_update_leaves_graph_untouched(synthetic_git_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    hierarchy = ModuleHierarchy(G)
+    before = graph_state(G), hierarchy_state(hierarchy), G.graph['commit']
+    commit_changes(synthetic_git_repo, files={'app/util/helpers.py': 'import os\n', 'app/core/new.py': 'import app\n'},
+                   removed=['tools/cli.py'])
+
+    def cancel(stage, done=0, total=0):
+        raise AnalysisCancelled(stage)
+
+    with pytest.raises(AnalysisCancelled):
+        update_dependencies_digraph(G, hierarchy, workers=1, use_cache=False, progress=cancel)
+    assert (graph_state(G), hierarchy_state(hierarchy), G.graph['commit']) == before
+
+
+def test_incremental_update_keeps_scan_cache_of_unchanged_files(synthetic_git_repo):
+    G = get_dependencies_digraph(workers=1)
+    cached_files = len(ScanCache(Model.incremental.SCAN_CACHE_FILE, G.graph['engine']).entries)
+    commit_changes(synthetic_git_repo, files={'app/util/helpers.py': 'import os\n'})
+
+    update_dependencies_digraph(G, workers=1)
+
+    assert len(ScanCache(Model.incremental.SCAN_CACHE_FILE, G.graph['engine']).entries) == cached_files
+
+
+def test_incremental_update_includes_working_tree_edits(synthetic_git_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    write_files(synthetic_git_repo, {'app/util/helpers.py': 'import os\n'})
+
+    update_dependencies_digraph(G, workers=1, use_cache=False)
+    assert graph_state(G) == graph_state(get_dependencies_digraph(workers=1, use_cache=False))
+
+    # Reverting the edit is picked up too, although the commit never changed
+    git.Repo(synthetic_git_repo).git.checkout('--', 'app/util/helpers.py')
+    update_dependencies_digraph(G, workers=1, use_cache=False)
+    assert graph_state(G) == graph_state(get_dependencies_digraph(workers=1, use_cache=False))
+    assert G.graph['uncommitted'] == set()
+
+
+def test_ignore_file_change_triggers_rebuild(synthetic_git_repo):
+    G = get_dependencies_digraph(workers=1, use_cache=False)
+    write_files(synthetic_git_repo, {'.arcrecoveryignore': 'tools/\n'})
+
+    updated, _ = update_dependencies_digraph(G, workers=1, use_cache=False)
+
+    assert updated is not G
+    assert 'tools.cli' not in updated.nodes
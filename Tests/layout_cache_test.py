@@ -0,0 +1,59 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.utils.layout_cache import LayoutCache
+
+REPOSITORY = 'https://github.com/zeeguu/api'
+
+
+def laid_out(*positions):
+    return [{'id': node_id, 'x': x, 'y': y} for node_id, x, y in positions]
+
+
+def test_positions_survive_a_restart(tmp_path):
+    cache_file = str(tmp_path / "layout_cache.json")
+    cache = LayoutCache(cache_file)
+    cache.store(REPOSITORY, 'abc', 'app', laid_out(('core', 10, 20), ('util', -5, 0)))
+    cache.save()
+
+    reloaded = LayoutCache(cache_file)
+    assert reloaded.lookup(REPOSITORY, 'abc', 'app') == {'core': [10, 20], 'util': [-5, 0]}
+    assert reloaded.lookup(REPOSITORY, 'abc', '') == {}
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+
+
+def test_new_commit_starts_from_latest_layout_of_the_level(tmp_path):
+    cache = LayoutCache(str(tmp_path / "layout_cache.json"), max_commits=2)
+    cache.store(REPOSITORY, 'first', 'app', laid_out(('core', 0, 0)))
+    cache.store(REPOSITORY, 'second', 'app', laid_out(('core', 1, 1)))
+    assert cache.lookup(REPOSITORY, 'third', 'app') == {'core': [1, 1]}
+
+    # Storing under a known commit makes it the latest again
+    cache.store(REPOSITORY, 'first', 'app', laid_out(('util', 2, 2)))
+    assert cache.lookup(REPOSITORY, 'third', 'app') == {'core': [0, 0], 'util': [2, 2]}
+
+    cache.store(REPOSITORY, 'third', 'app', laid_out(('core', 3, 3)))
+    assert list(cache.repositories[REPOSITORY]['app']) == ['first', 'third']
+
+
+def test_layouts_are_kept_per_repository(tmp_path):
+    cache = LayoutCache(str(tmp_path / "layout_cache.json"), max_repositories=2)
+    cache.store(REPOSITORY, 'abc', 'app', laid_out(('core', 0, 0)))
+
+    # Another repository cloned into the same folder does not reuse the layout of its 'app'
+    assert cache.lookup('https://github.com/other/project', 'def', 'app') == {}
+
+    cache.store('https://github.com/other/project', 'def', 'app', laid_out(('core', 1, 1)))
+    cache.store(REPOSITORY, 'abc', 'app', laid_out(('core', 0, 0)))
+    cache.store('https://github.com/third/project', 'ghi', '', laid_out(('app', 2, 2)))
+    assert list(cache.repositories) == [REPOSITORY, 'https://github.com/third/project']
+
+
+def test_unreadable_or_outdated_cache_is_ignored(tmp_path):
+    cache_file = tmp_path / "layout_cache.json"
+    cache_file.write_text("{not json")
+    assert LayoutCache(str(cache_file)).repositories == {}
+
+    cache_file.write_text('{"version": 1, "levels": {"app": {"abc": {"core": [0, 0]}}}}')
+    assert LayoutCache(str(cache_file)).repositories == {}
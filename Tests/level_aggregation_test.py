@@ -0,0 +1,58 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter
+
+from Model.compact_graph import CompactGraph
+from Model.hierarchy import ModuleHierarchy
+from hierarchy_test import random_graph
+
+
+def cut(name, depth):
+    return '.'.join(name.split('.')[:depth + 1])
+
+
+def expected_level(G, depth, path=None):
+    counts = Counter()
+    for source, target in G.edges:
+        if path and not (source.startswith(path + '.') and target.startswith(path + '.')):
+            continue
+        if cut(source, depth) != cut(target, depth):
+            counts[(cut(source, depth), cut(target, depth))] += 1
+    return dict(counts)
+
+
+def as_names(tree, arrays):
+    sources, targets, weights = arrays
+    return {(tree.names[source], tree.names[target]): int(weight)
+            for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist())}
+
+
+def test_every_level_matches_a_python_roll_up():
+    G = random_graph(5)
+    hierarchy = ModuleHierarchy(G)
+
+    levels = hierarchy.level_edge_arrays()
+    assert sorted(levels) == list(range(5))
+    for depth, arrays in levels.items():
+        assert as_names(hierarchy.tree, arrays) == expected_level(G, depth)
+
+
+def test_levels_inside_a_package():
+    G = random_graph(6)
+    hierarchy = ModuleHierarchy(G)
+    package = sorted(hierarchy.get_level_view('')['packages'])[0]
+
+    for depth, arrays in hierarchy.level_edge_arrays(depths=[1, 2], path=package).items():
+        assert as_names(hierarchy.tree, arrays) == expected_level(G, depth, package)
+
+
+def test_compact_graph_gives_the_same_levels():
+    G = random_graph(7)
+    expected = ModuleHierarchy(G)
+    compact = ModuleHierarchy(CompactGraph.from_digraph(G))
+
+    for depth in range(5):
+        assert (as_names(compact.tree, compact.aggregator.aggregate(depth))
+                == as_names(expected.tree, expected.aggregator.aggregate(depth)))
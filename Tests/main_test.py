@@ -0,0 +1,16 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from incremental_test import commit_changes
+
+
+def test_history_command_line(synthetic_git_repo, tmp_path, capsys):
+    commit_changes(synthetic_git_repo, files={'app/core/new.py': 'import app.util.helpers\n'})
+    csv_file = tmp_path / 'history.csv'
+
+    main.main(['--history', 'HEAD', '--output', str(csv_file)])
+
+    assert len(csv_file.read_text().splitlines()) == 3
+    assert f"Metrics written to {csv_file}" in capsys.readouterr().out
@@ -0,0 +1,38 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from Model.module import Module
+
+
+def test_module_has_no_instance_dict():
+    module = Module('app.core', 'app', 'app/core/')
+
+    assert not hasattr(module, '__dict__')
+    with pytest.raises(AttributeError):
+        module.label = 'core'
+
+
+def test_dependency_storage_is_allocated_on_first_add():
+    placeholder = Module('app.util', 'app', 'app/core/engine.py')
+    other = Module('app.cli', 'app', 'app/cli.py')
+    assert placeholder.dependencies is other.dependencies
+    assert placeholder.get_number_of_dependencies() == 0
+
+    placeholder.add_dependency('app.core')
+    placeholder.add_dependency('app.core')
+    assert placeholder.dependencies == {'app.core'}
+    assert other.dependencies == frozenset()
+
+    placeholder.clear_dependencies()
+    assert placeholder.dependencies is other.dependencies
+
+
+def test_strings_are_interned():
+    parent = ''.join(['app', '.core'])
+    first = Module('app.core.engine', parent, 'app/core/engine.py')
+    second = Module('app.core.runner', ''.join(['app.', 'core']), 'app/core/runner.py')
+
+    assert first.parent_module is second.parent_module
@@ -0,0 +1,44 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.graph_builder import build_graph
+from Model.namespace_index import NamespaceIndex, INTERNAL, EXTERNAL, STDLIB
+from conftest import write_files
+
+
+def test_matches_whole_segments_only():
+    namespace = NamespaceIndex(['api', 'tools'])
+
+    assert namespace.is_internal('api')
+    assert namespace.is_internal('api.models.user')
+    assert not namespace.is_internal('apimux')
+    assert not namespace.is_internal('apimux.api')
+    assert not namespace.is_internal('tool')
+
+
+def test_longest_prefix_of_nested_namespaces():
+    namespace = NamespaceIndex(['src.app', 'src.app.core'])
+
+    assert namespace.longest_prefix('src.app.core.engine') == 'src.app.core'
+    assert namespace.longest_prefix('src.app.util') == 'src.app'
+    assert namespace.longest_prefix('src') is None
+
+
+def test_classify():
+    namespace = NamespaceIndex(['app', 'json'])
+
+    assert namespace.classify('app.core') == INTERNAL
+    assert namespace.classify('os.path') == STDLIB
+    assert namespace.classify('requests') == EXTERNAL
+    # A repository package shadowing the standard library is internal
+    assert namespace.classify('json.decoder') == INTERNAL
+
+
+def test_graph_ignores_imports_sharing_a_prefix(synthetic_repo):
+    write_files(synthetic_repo, {'tools/more.py': 'import appendix\nimport app.util\n'})
+
+    G = build_graph(workers=1, use_cache=False, enumeration='walk')
+
+    assert 'appendix' not in G.nodes
+    assert ('tools.more', 'app.util') in G.edges
@@ -0,0 +1,43 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Model.hierarchy import ModuleHierarchy
+from Model.package_tree import PackageTree
+from hierarchy_test import random_graph
+
+
+def test_depth_first_numbering():
+    tree = PackageTree(['main', 'app.util', 'app.core.engine', 'apps'])
+
+    assert tree.names == ['app', 'app.core', 'app.core.engine', 'app.util', 'apps', 'main']
+    assert tree.subtree_range('app') == (0, 4)
+    assert tree.subtree_range('app.core') == (1, 3)
+    assert tree.subtree_range('main') == (5, 6)
+    assert list(tree.children('app')) == ['app.core', 'app.util']
+    assert list(tree.children()) == ['app', 'apps', 'main']
+    assert tree.parents.tolist() == [-1, 0, 1, 0, -1, -1]
+
+
+def test_subtree_queries_match_prefix_scans():
+    G = random_graph(3)
+    tree = PackageTree(list(G.nodes))
+    names = set(tree.names)
+
+    for path in tree.names:
+        below = {name for name in names if name.startswith(path + '.')}
+        assert set(tree.descendants(path)) == below
+        assert set(tree.children(path)) == {name for name in below if '.' not in name[len(path) + 1:]}
+        for name in tree.names[::7]:
+            assert tree.contains(path, name) == (name == path or name in below)
+    assert tree.descendants() == tree.names
+
+
+def test_hierarchy_builds_on_tree():
+    G = random_graph(4)
+    hierarchy = ModuleHierarchy(G)
+    package = next(iter(hierarchy.get_level_view('')['packages']))
+
+    assert set(hierarchy.nodes_under(package)) == {name for name in G.nodes if name.startswith(package + '.')}
+    assert hierarchy.is_inside(next(iter(hierarchy.nodes_under(package))), package)
+    assert hierarchy.nodes_under('no.such.package') == []
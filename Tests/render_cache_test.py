@@ -0,0 +1,31 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gui.utils.render_cache import RenderCache
+
+
+def test_least_recently_used_level_is_evicted():
+    cache = RenderCache(max_entries=2)
+    cache.put((1, '', ''), 'root')
+    cache.put((1, 'app', ''), 'app')
+
+    assert cache.get((1, '', '')) == 'root'
+    cache.put((1, 'app.core', ''), 'core')
+
+    assert cache.get((1, 'app', '')) is None
+    assert cache.get((1, '', '')) == 'root'
+    assert cache.get((1, 'app.core', '')) == 'core'
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_keys_separate_graph_versions_and_filters():
+    cache = RenderCache()
+    cache.put((1, 'app', ''), 'all')
+    cache.put((1, 'app', 'core.*'), 'filtered')
+
+    assert cache.get((1, 'app', 'core.*')) == 'filtered'
+    assert cache.get((2, 'app', '')) is None
+
+    cache.clear()
+    assert len(cache) == 0
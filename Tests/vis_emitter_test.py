@@ -0,0 +1,135 @@
+import os
+import json
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyvis.network import Network
+
+from Model.hierarchy import ModuleHierarchy
+from gui.utils.html_template import network_options
+from gui.utils.vis_emitter import ViewerState, dataset_diff, level_network
+from hierarchy_test import random_graph
+
+
+def pyvis_level_network(hierarchy, path, module_filter):
+    """The level as the panel used to build it, node by node with pyvis."""
+    net = Network(directed=True)
+    level_view = hierarchy.get_level_view(path)
+    for package in level_view['packages']:
+        full_path = f"{path}.{package}" if path else package
+        if hierarchy.matches_filter(full_path, module_filter):
+            net.add_node(package, label=package, title=full_path, color="#ff9900", shape="box", size=25)
+    for module in level_view['modules']:
+        if not hierarchy.matches_filter(module.name, module_filter):
+            continue
+        display_name = module.name[len(path) + 1:] if path and module.name.startswith(path + '.') else module.name
+        net.add_node(display_name, label=display_name, title=module.name, color="#66ccff", shape="dot", size=15)
+
+    for (source, target), weight in hierarchy.get_aggregated_dependencies(path).items():
+        source_display, target_display = source, target
+        if path:
+            if source.startswith(path + '.') and target.startswith(path + '.'):
+                source_display, target_display = source.split('.')[-1], target.split('.')[-1]
+            elif source.startswith(path + '.'):
+                source_display = source[len(path) + 1:]
+        if source_display not in net.node_map or target_display not in net.node_map:
+            continue
+        between_packages = path and source.startswith(path + '.') and target.startswith(path + '.') and source != target
+        net.add_edge(source_display, target_display, label=str(weight),
+                     title=f"{source} → {target}: {weight} dependencies",
+                     color="#e08214" if between_packages else "#3182bd",
+                     arrows={'to': True}, width=2 if between_packages else 1.5)
+    return net.nodes, net.edges
+
+
+def test_matches_pyvis_on_every_level():
+    for seed in range(5):
+        hierarchy = ModuleHierarchy(random_graph(seed))
+        for path in hierarchy.depth_dict:
+            for module_filter in ('', 'a*', 'b1.*'):
+                nodes, edges = level_network(hierarchy, path, module_filter)
+                # Edges get an ID of their own, so the viewer can remove them again
+                assert all(edge.pop('id') == f"{edge['from']}->{edge['to']}" for edge in edges)
+                assert (nodes, edges) == pyvis_level_network(hierarchy, path, module_filter), \
+                    (seed, path, module_filter)
+
+
+def test_edges_only_join_shown_nodes():
+    hierarchy = ModuleHierarchy(random_graph(0))
+    all_nodes, _ = level_network(hierarchy, 'a0')
+    nodes, edges = level_network(hierarchy, 'a0', 'a0.c*')
+
+    node_ids = {node['id'] for node in nodes}
+    assert 0 < len(node_ids) < len(all_nodes)
+    assert all(edge['from'] in node_ids and edge['to'] in node_ids for edge in edges)
+
+
+def test_dataset_diff_between_levels():
+    hierarchy = ModuleHierarchy(random_graph(0))
+    root_nodes, root_edges = level_network(hierarchy, '')
+    nodes, edges = level_network(hierarchy, 'a0')
+
+    diff = dataset_diff({node['id']: node for node in root_nodes}, nodes)
+    shown = {node['id']: node for node in root_nodes if node['id'] not in diff['remove']}
+    shown.update((node['id'], node) for node in diff['update'])
+    assert shown == {node['id']: node for node in nodes}
+
+    assert dataset_diff({edge['id']: edge for edge in edges}, edges) == {'update': [], 'remove': []}
+    assert dataset_diff({}, root_edges) == {'update': root_edges, 'remove': []}
+
+
+class FakeViewerPage:
+    """Applies pushed payloads the way the viewer page's applyDiff and setOptions do."""
+
+    def __init__(self, live_physics):
+        self.nodes, self.edges = {}, {}
+        self.options = network_options(live_physics)
+        self.payloads = []
+
+    def apply_diff(self, payload):
+        diff = json.loads(payload)
+        self.payloads.append(diff)
+        self.options = diff.get('options', self.options)
+        for items, changes in ((self.nodes, diff['nodes']), (self.edges, diff['edges'])):
+            for item_id in changes['remove']:
+                del items[item_id]
+            items.update((item['id'], item) for item in changes['update'])
+
+    def set_options(self, payload):
+        self.options = json.loads(payload)
+
+    def shows(self, nodes, edges, live_physics):
+        return (self.nodes == {node['id']: node for node in nodes}
+                and self.edges == {edge['id']: edge for edge in edges}
+                and self.options == network_options(live_physics))
+
+
+def test_viewer_diffs_across_levels_and_physics_toggles():
+    hierarchy = ModuleHierarchy(random_graph(1))
+    levels = [level_network(hierarchy, path) for path in ('', 'a0', 'a0.b0', 'a0', '')]
+    viewer = ViewerState(live_physics=False)
+    page = FakeViewerPage(live_physics=False)
+
+    # Navigating down and back up: every push leaves the page showing exactly that level
+    for nodes, edges in levels:
+        page.apply_diff(json.dumps(viewer.level_diff(nodes, edges, live_physics=False)))
+        assert page.shows(nodes, edges, live_physics=False)
+    assert all('options' not in diff for diff in page.payloads)
+    # Showing the same level again, e.g. after a filter that matches everything, sends nothing
+    nodes, edges = levels[-1]
+    diff = viewer.level_diff(nodes, edges, live_physics=False)
+    assert diff['nodes'] == diff['edges'] == {'update': [], 'remove': []}
+
+    # Toggling physics on the shown level sends the options once, not with the next push as well
+    page.set_options(json.dumps(viewer.physics_options(True)))
+    assert viewer.physics_options(True) is None
+    nodes, edges = levels[1]
+    page.apply_diff(json.dumps(viewer.level_diff(nodes, edges, live_physics=True)))
+    assert 'options' not in page.payloads[-1]
+    assert page.shows(nodes, edges, live_physics=True)
+
+    # A level pushed with another setting than the page has carries the options itself
+    page.apply_diff(json.dumps(viewer.level_diff(nodes, edges, live_physics=False)))
+    assert page.payloads[-1]['options'] == network_options(False)
+    assert page.payloads[-1]['nodes'] == {'update': [], 'remove': []}
+    assert page.shows(nodes, edges, live_physics=False)
@@ -1,3 +1,39 @@
 CODE_ROOT_FOLDER = "./repo_for_analysis/" 
 HTML_OUTPUT_FOLDER = "./html_output/"
-ASSETS_FOLDER = "./assets/"
\ No newline at end of file
+# Bundled vis-network, tom-select and binding scripts used by the graph pages
+VIS_LIBRARY_FOLDER = "./lib/"
+
+# Number of processes used to extract imports (None uses every CPU core)
+SCAN_WORKERS = None
+# Number of files handed to a scan worker at a time
+SCAN_CHUNK_SIZE = 64
+# Imports extracted by previous scans, stored next to CODE_ROOT_FOLDER
+SCAN_CACHE_FILE = "./repo_for_analysis.scan_cache.json"
+# Import extraction engine: "regex", "ast", or "hybrid" (regex, with ast for ambiguous files)
+IMPORT_EXTRACTOR = "hybrid"
+# How source files are found: "walk" the file system, read the "git" index, or "auto" (git for clones)
+SOURCE_ENUMERATION = "auto"
+# Ignore file (gitignore syntax) read from the root of CODE_ROOT_FOLDER
+IGNORE_FILE_NAME = ".arcrecoveryignore"
+# Clone only the latest commit's Python sources (shallow, partial and sparse clone)
+LEAN_CLONE = True
+# Graph backend of the GUI analysis: "networkx" (patched incrementally) or "compact" (integer IDs, CSR arrays)
+GRAPH_BACKEND = "networkx"
+# Entries kept by each memoized module name/path helper in Model/common
+RESOLUTION_CACHE_SIZE = 1 << 16
+# Number of rendered graph levels kept in memory by the visualization panel
+RENDER_CACHE_SIZE = 32
+# Node positions of the graph levels laid out before, stored next to CODE_ROOT_FOLDER
+LAYOUT_CACHE_FILE = "./repo_for_analysis.layout_cache.json"
+# Number of commits whose layouts are kept per graph level
+LAYOUT_CACHE_COMMITS = 4
+# Number of repositories whose layouts are kept, the least recently stored are dropped
+LAYOUT_CACHE_REPOSITORIES = 4
+# Levels with up to this many nodes get a force-directed layout, larger ones a cheaper spiral
+FORCE_LAYOUT_MAX_NODES = 500
+# Steps of the force-directed layout
+LAYOUT_ITERATIONS = 50
+# Distance in pixels the layouts keep between neighbouring nodes
+NODE_SPACING = 150
+# Let vis-network move the nodes with live physics instead of showing the precomputed layout
+LIVE_PHYSICS = False
@@ -1,14 +1,20 @@
 from PyQt5.QtWidgets import QGroupBox, QVBoxLayout, QLabel, QMessageBox, QPushButton, QHBoxLayout
 from PyQt5.QtCore import QUrl
+from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
 import os
 import json
-from pyvis.network import Network
+import time
 
 from Model.graph_builder import get_dependencies_digraph
 from Model.hierarchy import ModuleHierarchy
-from constants import HTML_OUTPUT_FOLDER, ASSETS_FOLDER
-from ..utils.pyvis_assets import ensure_pyvis_assets_available, fix_html_asset_references
+from constants import HTML_OUTPUT_FOLDER, LIVE_PHYSICS
+from ..utils.graph_bridge import GraphBridge
+from ..utils.graph_layout import layout_network
+from ..utils.html_template import network_options, render_viewer_page, vis_library_available
+from ..utils.layout_cache import LayoutCache
+from ..utils.render_cache import RenderCache
+from ..utils.vis_emitter import ViewerState, level_network
 
 class CustomWebEnginePage(QWebEnginePage):
     def __init__(self, parent=None, panel=None):
@@ -16,10 +22,10 @@ class CustomWebEnginePage(QWebEnginePage):
         self.visualization_panel = panel
         
     def javaScriptConsoleMessage(self, level, message, line, source):
-        # We use this to catch console messages from the HTML page
+        # Events arrive over the web channel, the console only shows JavaScript problems
         # This is useful for debugging JavaScript issues
-        if 'click event' in message and self.visualization_panel:
-            self.visualization_panel.handle_click_event(message)
+        if level == QWebEnginePage.ErrorMessageLevel:
+            print(f"JavaScript error at line {line}: {message}")
 
 class GraphVisualizationPanel(QGroupBox):
     def __init__(self, parent=None):
@@ -29,12 +35,27 @@ class GraphVisualizationPanel(QGroupBox):
         self.path_label = None
         self.home_button = None
         self.back_button = None
+        self.physics_button = None
+        self.live_physics = LIVE_PHYSICS
+        # The viewer page is loaded once, levels are pushed to it through the bridge
+        self.bridge = GraphBridge(self)
+        self.viewer_loaded = False
+        self.page_ready = False
+        self.pending_level = None  # (nodes, edges) to push once the page is ready
+        self.viewer = ViewerState(LIVE_PHYSICS)  # What the page shows
         self.setup_ui()
         self.graph = None
         self.hierarchy = None
         self.parent = parent
         self.current_path = ''  # Start at root level
         self.navigation_history = []  # To keep track of navigation
+        self.module_filter = ''  # Glob pattern of the modules to show, '' for all
+        # Laid out nodes and edges of each level, keyed by (graph_version, path, filter)
+        self.render_cache = RenderCache()
+        self.graph_version = 0
+        self.render_started = None  # perf_counter() of the level request being shown
+        # Node positions of every level laid out before, kept across runs
+        self.layout_cache = LayoutCache()
         self.ensure_folders_exist()
         
         # Remove border around the group box
@@ -61,16 +82,23 @@ class GraphVisualizationPanel(QGroupBox):
         self.home_button.clicked.connect(self.navigate_home)
         self.home_button.setEnabled(False)  # Disabled initially
         
+        # Live physics toggle, the precomputed layout is shown without physics otherwise
+        self.physics_button = QPushButton("Live physics")
+        self.physics_button.setCheckable(True)
+        self.physics_button.setChecked(self.live_physics)
+        self.physics_button.toggled.connect(self.set_live_physics)
+        
         # Add to navigation layout
         nav_layout.addWidget(self.back_button)
         nav_layout.addWidget(self.path_label)
         nav_layout.addStretch(1)  # Push home button to the right
+        nav_layout.addWidget(self.physics_button)
         nav_layout.addWidget(self.home_button)
         
         # Add navigation layout to main layout
         main_layout.addLayout(nav_layout)
         
-        # Create a web view for the pyvis visualization
+        # Create a web view for the vis-network visualization
         self.web_view = QWebEngineView()
         self.web_view.setMinimumHeight(500)
         
@@ -79,6 +107,11 @@ class GraphVisualizationPanel(QGroupBox):
         self.custom_page = CustomWebEnginePage(self.web_view, panel=self)
         self.web_view.setPage(self.custom_page)
         
+        # Two-way bridge between the panel and the viewer page
+        self.channel = QWebChannel(self.custom_page)
+        self.channel.registerObject('bridge', self.bridge)
+        self.custom_page.setWebChannel(self.channel)
+        
         # Fill the entire space with the web view
         main_layout.addWidget(self.web_view)
         
@@ -88,35 +121,43 @@ class GraphVisualizationPanel(QGroupBox):
         self.setLayout(main_layout)
         
     def ensure_folders_exist(self):
-        """Make sure the output and assets folders exist"""
+        """Make sure the base folder of the viewer page exists"""
         os.makedirs(HTML_OUTPUT_FOLDER, exist_ok=True)
-        os.makedirs(ASSETS_FOLDER, exist_ok=True)
-        # Ensure we have the necessary pyvis assets
-        ensure_pyvis_assets_available()
     
-    def handle_click_event(self, message):
-        """Handle click events from the graph visualization"""
+    def handle_node_click(self, node_data):
+        """Handle a node clicked in the viewer, given its DataSet item"""
         try:
-            # Extract the clicked node from the message
-            # The message format is expected to be: "click event: {node_data_json}"
-            start_idx = message.find('{')
-            if start_idx > 0:
-                node_data = json.loads(message[start_idx:])
-                node_id = node_data.get('id')
-                
-                # Add some protection for null/empty node ids
-                if not node_id:
-                    return
-                    
-                print(f"Click on node: {node_id}")
+            node_id = node_data.get('id')
+            
+            # Add some protection for null/empty node ids
+            if not node_id:
+                return
                 
-                # Check if the clicked node is a package
-                if self.is_package(node_id):
-                    print(f"Navigating to package: {node_id}")
-                    self.navigate_to_package(node_id)
+            print(f"Click on node: {node_id}")
+            
+            # Check if the clicked node is a package
+            if self.is_package(node_id):
+                print(f"Navigating to package: {node_id}")
+                self.navigate_to_package(node_id)
         except Exception as e:
             print(f"Error handling click event: {str(e)}")
     
+    def handle_page_ready(self):
+        """The viewer page is connected to the bridge, show the level waiting for it"""
+        self.page_ready = True
+        if self.pending_level is not None:
+            nodes, edges = self.pending_level
+            self.pending_level = None
+            self.push_level(nodes, edges)
+    
+    def handle_stable_frame(self, page_ms):
+        """Report how long the page took to show the level in its final layout"""
+        if self.render_started is None:
+            return
+        total = time.perf_counter() - self.render_started
+        self.render_started = None
+        print(f"First stable frame: {page_ms:.0f} ms in the page, {total:.3f}s since the level was requested")
+    
     def is_package(self, node_id):
         """Check if the given node is a package"""
         # If we're at root level
@@ -181,187 +222,81 @@ class GraphVisualizationPanel(QGroupBox):
         # Visualize the root level
         self.visualize_current_level()
     
+    def set_live_physics(self, enabled):
+        """Run the vis-network physics on the shown level and the ones rendered from now on"""
+        self.live_physics = enabled
+        if self.page_ready:
+            options = self.viewer.physics_options(enabled)
+            if options is not None:
+                self.bridge.physicsChanged.emit(json.dumps(options))
+    
+    def set_filter(self, pattern):
+        """Only show the modules and packages matching a glob pattern ('' shows everything)"""
+        self.module_filter = pattern.strip()
+        self.visualize_current_level()
+    
     def visualize_current_level(self):
         """Visualize the current level based on the current_path"""
         if not self.graph or not self.hierarchy:
             return
             
-        # Check if we have required assets
-        if not os.path.exists(os.path.join(ASSETS_FOLDER, "vis-network.min.js")):
+        # Check if we have the bundled vis-network assets
+        if not vis_library_available():
             if self.parent:
                 QMessageBox.warning(self.parent, "Missing Assets", 
-                                   "Visualization assets are missing. Install the 'requests' library and try again.")
+                                   "The vis-network files in the lib folder are missing.")
             return
-            
-        # Create a pyvis network
-        net = Network(height="100%", width="100%", notebook=False, directed=True, bgcolor="#ffffff")
-        
-        # Configure network options for better visualization
-        net.set_options("""
-        var options = {
-            "nodes": {
-                "font": {
-                    "size": 14,
-                    "face": "Tahoma"
-                }
-            },
-            "edges": {
-                "color": {
-                    "inherit": false
-                },
-                "smooth": {
-                    "enabled": true,
-                    "type": "dynamic"
-                },
-                "arrows": {
-                    "to": {
-                        "enabled": true,
-                        "scaleFactor": 0.5
-                    }
-                },
-                "font": {
-                    "size": 12,
-                    "color": "#000000",
-                    "align": "middle",
-                    "background": "rgba(255, 255, 255, 0.7)",
-                    "strokeWidth": 0,
-                    "strokeColor": "#ffffff"
-                }
-            },
-            "physics": {
-                "forceAtlas2Based": {
-                    "gravitationalConstant": -50,
-                    "centralGravity": 0.01,
-                    "springLength": 150,
-                    "springConstant": 0.08
-                },
-                "minVelocity": 0.75,
-                "solver": "forceAtlas2Based",
-                "stabilization": {
-                    "enabled": true,
-                    "iterations": 1000,
-                    "updateInterval": 25
-                }
-            },
-            "interaction": {
-                "navigationButtons": true,
-                "keyboard": true,
-                "hover": true
-            }
-        }
-        """)
-        
-        # Get current level view
-        level_view = self.hierarchy.get_level_view(self.current_path)
-        
-        # Add package nodes (orange boxes)
-        packages = list(level_view['packages'])
-        for package in packages:
-            # For non-root levels, we need to ensure the correct node ID is used
-            node_id = package  # Just the package name, not the full path
-            full_path = f"{self.current_path}.{package}" if self.current_path else package
-            
-            net.add_node(node_id, label=node_id, title=full_path, 
-                        color="#ff9900", shape="box", 
-                        size=25)
-        
-        # Add module nodes (blue circles) 
-        modules = []
-        for module in level_view['modules']:
-            module_name = module.name
-            # Strip the prefix to get just the module name for this level
-            if self.current_path and module_name.startswith(self.current_path + '.'):
-                display_name = module_name[len(self.current_path) + 1:]  # +1 for the dot
-            else:
-                display_name = module_name
-                
-            modules.append(display_name)
-            net.add_node(display_name, label=display_name, title=module_name, 
-                        color="#66ccff", shape="dot",
-                        size=15)
-        
-        # Use the existing aggregated dependencies method
-        dependencies = self.hierarchy.get_aggregated_dependencies(self.current_path)
-        
-        # Process and add edges
-        for (source, target), weight in dependencies.items():
-            # For non-root levels, we need to adjust the source and target to just the final name part
-            source_display = source
-            target_display = target
-            
-            if self.current_path:
-                # Handle package->package dependencies
-                if source.startswith(self.current_path + '.') and target.startswith(self.current_path + '.'):
-                    source_display = source.split('.')[-1]
-                    target_display = target.split('.')[-1]
-                # Handle module->package dependencies    
-                elif source.startswith(self.current_path + '.'):
-                    # Module within the current package
-                    source_display = source[len(self.current_path) + 1:]
-                    if target.startswith(self.current_path + '.'):
-                        target_display = target.split('.')[-1]
-            
-            # Skip nodes that don't exist (they may be filtered out)
-            if not net.get_node(source_display) or not net.get_node(target_display):
-                continue
-                
-            # Style differently based on node types
-            if (self.current_path and source.startswith(self.current_path + '.') and 
-                target.startswith(self.current_path + '.') and 
-                source != target):
-                # Package to package (orange edges)
-                net.add_edge(source_display, target_display, 
-                            label=str(weight),  # Display the dependency count
-                            title=f"{source} → {target}: {weight} dependencies",
-                            color="#e08214",
-                            arrows={'to': True},
-                            width=2)  # Fixed width for all edges
-            else:
-                # Module to package (blue edges)
-                net.add_edge(source_display, target_display, 
-                            label=str(weight),  # Display the dependency count
-                            title=f"{source} → {target}: {weight} dependencies",
-                            color="#3182bd",
-                            arrows={'to': True},
-                            width=1.5)  # Fixed width for all edges
         
+        self.render_started = time.perf_counter()
+        # Levels seen before are shown again without rebuilding them
+        key = (self.graph_version, self.current_path, self.module_filter)
+        level = self.render_cache.get(key)
+        if level is None:
+            level = self.render_level()
+            if level is None:
+                return
+            self.render_cache.put(key, level)
+        self.push_level(*level)
+    
+    def render_level(self):
+        """Build the laid out (nodes, edges) of the current level, or None if rendering failed"""
         try:
-            # Save to the HTML output folder
-            html_file = os.path.join(HTML_OUTPUT_FOLDER, "current_level_graph.html")
-            
-            # Generate the graph HTML
-            net.save_graph(html_file)
-            
-            # Add JavaScript to handle clicks and send them to Python
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Add click handler before the closing body tag
-            click_handler = """
-            <script type="text/javascript">
-            network.on("click", function(params) {
-                if (params.nodes.length > 0) {
-                    var node = params.nodes[0];
-                    var nodeData = network.body.data.nodes.get(node);
-                    console.log("click event: " + JSON.stringify(nodeData));
-                }
-            });
-            </script>
-            """
-            content = content.replace('</body>', click_handler + '</body>')
-            
-            # Write back the modified content
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Fix HTML to use local assets instead of CDN
-            fix_html_asset_references(html_file)
-            
-            # Load the HTML file in the web view
-            self.web_view.load(QUrl.fromLocalFile(os.path.abspath(html_file)))
+            # Nodes and edges go straight to vis-network DataSet JSON, with no pyvis objects
+            nodes, edges = level_network(self.hierarchy, self.current_path, self.module_filter)
+            # Positions are computed here, so the page does not have to stabilise them.
+            # Nodes laid out before, in this commit or an earlier one, keep their place.
+            start = time.perf_counter()
+            repository, commit = self.graph.graph.get('repository', ''), self.graph.graph.get('commit')
+            known_positions = self.layout_cache.lookup(repository, commit, self.current_path)
+            placed = layout_network(nodes, edges, known_positions)
+            if placed:
+                # Written to disk on the next graph change or on shutdown, not on every render
+                self.layout_cache.store(repository, commit, self.current_path, nodes)
+            print(f"Layout of {self.current_path or 'Root'}: {placed} of {len(nodes)} nodes placed "
+                  f"in {time.perf_counter() - start:.3f}s")
+            return nodes, edges
         except Exception as e:
             if self.parent:
                 QMessageBox.critical(self.parent, "Visualization Error", f"Error generating visualization: {str(e)}")
+            return None
+    
+    def push_level(self, nodes, edges):
+        """Show a level by sending the viewer only what differs from the level it shows"""
+        if not self.page_ready:
+            # The first level waits for the viewer page to load and connect
+            self.pending_level = (nodes, edges)
+            self.load_viewer()
+            return
+        diff = self.viewer.level_diff(nodes, edges, self.live_physics)
+        self.bridge.diffPushed.emit(json.dumps(diff))
+    
+    def load_viewer(self):
+        """Load the viewer page into the web view, once"""
+        if self.viewer_loaded:
+            return
+        self.viewer_loaded = True
+        html = render_viewer_page(network_options(self.viewer.physics))
+        self.web_view.setHtml(html, QUrl.fromLocalFile(os.path.abspath(HTML_OUTPUT_FOLDER) + os.sep))
     
     def visualize_root_level(self):
         """Visualize the root level of the repository graph"""
@@ -372,8 +307,16 @@ class GraphVisualizationPanel(QGroupBox):
         self.home_button.setEnabled(False)
         self.visualize_current_level()
     
+    def save_layouts(self):
+        """Write the layouts of the levels laid out since the last save to disk"""
+        self.layout_cache.save()
+
     def set_graph_data(self, graph=None, hierarchy=None):
         """Set the graph data and trigger visualization"""
+        # A new analysis (even one patching the same graph) invalidates every rendered level
+        self.graph_version += 1
+        self.save_layouts()
+        self.render_cache.clear()
         if graph:
             self.graph = graph
         else:
@@ -1,16 +1,61 @@
 from PyQt5.QtWidgets import (QGroupBox, QVBoxLayout, QPushButton, 
-                           QLineEdit, QLabel, QMessageBox)
-import git
+                           QLineEdit, QLabel, QMessageBox, QComboBox, QCheckBox, QProgressBar,
+                           QApplication)
+from PyQt5.QtCore import QThread
 
-from Model.graph_builder import get_dependencies_digraph
+from Model.graph_builder import get_dependencies_digraph, build_compact_graph
 from Model.hierarchy import ModuleHierarchy
-from ..utils.github_utils import is_valid_github_url, clone_repository, clear_repository
-from constants import CODE_ROOT_FOLDER
+from Model.extractors import EXTRACTORS
+from Model.incremental import update_dependencies_digraph
+from Model.common import report_progress
+from ..utils.analysis_worker import AnalysisWorker, describe_progress
+from ..utils.github_utils import is_valid_github_url, clone_repository, clear_repository, pull_repository
+from constants import CODE_ROOT_FOLDER, IMPORT_EXTRACTOR, LEAN_CLONE, GRAPH_BACKEND
 import os
 
+
+def analyse(engine, graph=None, hierarchy=None, progress=None):
+    """
+    Build, or patch, the dependency graph and hierarchy of the cloned repository.
+
+    Runs on the analysis worker, so it must not touch any widget.
+
+    Args:
+        engine: Import extraction engine
+        graph: Graph of the last analysis, patched when it used the same engine
+        hierarchy: ModuleHierarchy of that graph
+        progress: Progress callback of the worker
+
+    Returns:
+        tuple: (graph, hierarchy)
+    """
+    if GRAPH_BACKEND == "compact":
+        # Compact graphs are read-only, so every analysis rebuilds them
+        graph = build_compact_graph(engine=engine, progress=progress)
+        report_progress(progress, 'hierarchy')
+        hierarchy = ModuleHierarchy(graph)
+    elif graph is not None and graph.graph.get('engine') == engine:
+        # Only patch what changed in git since the last analysis
+        graph, hierarchy = update_dependencies_digraph(graph, hierarchy, progress=progress)
+    else:
+        # Build the graph and hierarchy
+        graph = get_dependencies_digraph(engine=engine, progress=progress)
+        report_progress(progress, 'hierarchy')
+        hierarchy = ModuleHierarchy(graph)
+    # Roll every level up here, rather than on the GUI thread at the first render
+    hierarchy.get_aggregated_dependencies()
+    return graph, hierarchy
+
+
 class RepositoryPanel(QGroupBox):
     def __init__(self, parent=None):
         super().__init__("Repository Controls", parent)
+        # Results of the last analysis, patched on later analyses of the same clone
+        self.graph = None
+        self.hierarchy = None
+        # Clone or analysis running in the background, if any
+        self.worker = None
+        self.worker_thread = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -22,20 +67,50 @@ class RepositoryPanel(QGroupBox):
         layout.addWidget(QLabel("GitHub Repo URL:"))
         layout.addWidget(self.url_input)
         
+        # Import extraction engine used by the next analysis
+        self.engine_input = QComboBox()
+        self.engine_input.addItems(EXTRACTORS.keys())
+        self.engine_input.setCurrentText(IMPORT_EXTRACTOR)
+        layout.addWidget(QLabel("Import Extraction:"))
+        layout.addWidget(self.engine_input)
+        
         # Repository buttons
         self.analyse_button = QPushButton("Analyse")
         self.analyse_button.clicked.connect(self.analyse_repository)
         self.check_directory()
         layout.addWidget(self.analyse_button)
         
+        # Lean clones skip history and non-Python files; history mode needs a full clone
+        self.lean_clone_input = QCheckBox("Lean clone (latest Python sources only)")
+        self.lean_clone_input.setChecked(LEAN_CLONE)
+        layout.addWidget(self.lean_clone_input)
+        
         self.clone_button = QPushButton("Clone")
         self.clone_button.clicked.connect(self.clone_repository)
         layout.addWidget(self.clone_button)
         
+        self.pull_button = QPushButton("Pull && Update")
+        self.pull_button.clicked.connect(self.pull_repository)
+        layout.addWidget(self.pull_button)
+        
         self.clear_button = QPushButton("Clear")
         self.clear_button.clicked.connect(self.clear_repository)
         layout.addWidget(self.clear_button)
         
+        # Progress of the running clone or analysis
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.progress_label = QLabel("")
+        self.progress_label.setWordWrap(True)
+        layout.addWidget(self.progress_label)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_task)
+        self.cancel_button.setVisible(False)
+        layout.addWidget(self.cancel_button)
+
         self.setLayout(layout)
 
     def clone_repository(self):
@@ -46,18 +121,36 @@ class RepositoryPanel(QGroupBox):
                               "Please enter a valid GitHub repository URL.")
             return
             
-        try:
-            clone_repository(url, CODE_ROOT_FOLDER)
-            self.check_directory()
-            QMessageBox.information(self, "Success", 
-                                  "Repository cloned successfully!")
-        except git.exc.GitCommandError as e:
-            QMessageBox.critical(self, "Error", 
-                               f"Failed to clone repository: {str(e)}")
-            clear_repository(CODE_ROOT_FOLDER)
+        lean = self.lean_clone_input.isChecked()
+        self.start_task(lambda progress: clone_repository(url, CODE_ROOT_FOLDER, lean=lean, progress=progress),
+                        self.on_clone_complete, "Failed to clone repository", cleanup=self.on_clone_stopped)
+
+    def on_clone_complete(self, _):
+        self.graph = None
+        self.hierarchy = None
+        self.check_directory()
+        QMessageBox.information(self, "Success",
+                              "Repository cloned successfully!")
+
+    def on_clone_stopped(self):
+        # A failed or cancelled clone leaves nothing usable behind
+        clear_repository(CODE_ROOT_FOLDER)
+        self.check_directory()
+
+    def pull_repository(self):
+        engine = self.engine_input.currentText()
+        graph, hierarchy = self.graph, self.hierarchy
+
+        def pull_and_analyse(progress):
+            pull_repository(CODE_ROOT_FOLDER, progress)
+            return analyse(engine, graph, hierarchy, progress)
+        self.start_task(pull_and_analyse, self.on_analysis_done, "Failed to pull repository",
+                        patches_graph=self.patches_graph(engine))
 
     def clear_repository(self):
         clear_repository(CODE_ROOT_FOLDER)
+        self.graph = None
+        self.hierarchy = None
         self.check_directory()
 
     def check_directory(self):
@@ -68,11 +161,112 @@ class RepositoryPanel(QGroupBox):
             self.analyse_button.setEnabled(False) 
     
     def analyse_repository(self):
-        # Build the graph and hierarchy
-        graph = get_dependencies_digraph()
-        hierarchy = ModuleHierarchy(graph)
+        engine = self.engine_input.currentText()
+        graph, hierarchy = self.graph, self.hierarchy
+        self.start_task(lambda progress: analyse(engine, graph, hierarchy, progress), self.on_analysis_done,
+                        "Failed to analyse repository", patches_graph=self.patches_graph(engine))
+
+    def patches_graph(self, engine):
+        """True if analysing with engine patches the graph of the last analysis in place"""
+        return GRAPH_BACKEND != "compact" and self.graph is not None and self.graph.graph.get('engine') == engine
+
+    def on_analysis_done(self, result):
+        graph, hierarchy = result
+        self.graph = graph
+        self.hierarchy = hierarchy
         
         # Signal that visualization should be updated
         # This will be connected to the main window
         if hasattr(self, 'on_analysis_complete') and callable(self.on_analysis_complete):
-            self.on_analysis_complete(graph, hierarchy)
\ No newline at end of file
+            self.on_analysis_complete(graph, hierarchy)
+
+    def start_task(self, task, on_complete, error_title, cleanup=None, patches_graph=False):
+        """
+        Run a clone or analysis task on a worker thread, keeping the window responsive.
+
+        Args:
+            task: Callable taking a progress callback
+            on_complete: Called on the GUI thread with what the task returned
+            error_title: Start of the message shown when the task fails
+            cleanup: Called on the GUI thread when the task failed or was cancelled
+            patches_graph: The task patches the graph shown by the visualization in place
+        """
+        if self.worker is not None:
+            return
+        self.worker = AnalysisWorker(task)
+        self.worker_thread = QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+
+        self.worker.progress.connect(self.show_progress)
+        self.worker.completed.connect(on_complete)
+        self.worker.failed.connect(lambda message: self.on_task_failed(error_title, message, cleanup))
+        self.worker.cancelled.connect(lambda: self.on_task_cancelled(cleanup))
+        for signal in (self.worker.completed, self.worker.failed, self.worker.cancelled):
+            signal.connect(self.worker_thread.quit)
+        self.worker_thread.finished.connect(self.on_task_finished)
+
+        self.set_busy(True)
+        if hasattr(self, 'on_analysis_started') and callable(self.on_analysis_started):
+            self.on_analysis_started(patches_graph)
+        self.worker_thread.start()
+
+    def show_progress(self, stage, done, total, rate):
+        if total:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+        else:
+            # Busy indicator while the size of the stage is unknown
+            self.progress_bar.setRange(0, 0)
+        self.progress_label.setText(describe_progress(stage, done, total, rate))
+
+    def cancel_task(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.progress_label.setText("Cancelling...")
+
+    def stop_task(self):
+        """Cancel the running task and wait for its thread to end, e.g. when the window closes"""
+        if self.worker is None:
+            return
+        self.worker.cancel()
+        # Ends the thread as soon as the task returns, without waiting on the blocked GUI thread
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        # Deliver the task's last signals, so a cancelled clone is still cleaned up
+        QApplication.processEvents()
+
+    def on_task_failed(self, error_title, message, cleanup):
+        if cleanup:
+            cleanup()
+        QMessageBox.critical(self, "Error", f"{error_title}: {message}")
+
+    def on_task_cancelled(self, cleanup):
+        if cleanup:
+            cleanup()
+        print("Cancelled")
+
+    def on_task_finished(self):
+        self.worker_thread.deleteLater()
+        self.worker.deleteLater()
+        self.worker = None
+        self.worker_thread = None
+        self.set_busy(False)
+        if hasattr(self, 'on_analysis_stopped') and callable(self.on_analysis_stopped):
+            self.on_analysis_stopped()
+
+    def set_busy(self, busy):
+        """Lock the repository buttons and show the progress widgets while a task runs"""
+        for button in (self.clone_button, self.pull_button, self.clear_button):
+            button.setEnabled(not busy)
+        if busy:
+            self.analyse_button.setEnabled(False)
+            self.progress_bar.setRange(0, 0)
+            self.progress_label.setText("Starting...")
+        else:
+            self.check_directory()
+            self.progress_label.setText("")
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+        self.cancel_button.setEnabled(busy)
@@ -59,6 +59,12 @@ class MainWindow(QMainWindow):
         
         # Connect repository panel's analysis completion to the visualization panel
         self.repository_panel.on_analysis_complete = self.on_analysis_complete
+        self.repository_panel.on_analysis_started = self.on_analysis_started
+        self.repository_panel.on_analysis_stopped = self.on_analysis_stopped
+        
+        # Apply the module filter when it is confirmed or cleared
+        self.filter_panel.module_filter_input.returnPressed.connect(self.on_filter_changed)
+        self.filter_panel.clear_filter_button.clicked.connect(self.on_filter_cleared)
         
         self.control_layout.addWidget(self.repository_panel)
         self.control_layout.addWidget(self.filter_panel)
@@ -68,6 +74,29 @@ class MainWindow(QMainWindow):
         self.result_label = QLabel("")
         self.control_layout.addWidget(self.result_label)
         
+    def closeEvent(self, event):
+        """Stop a running clone or analysis, so its thread is not destroyed while running, and keep the layouts"""
+        self.repository_panel.stop_task()
+        self.graph_visualization_panel.save_layouts()
+        super().closeEvent(event)
+
     def on_analysis_complete(self, graph, hierarchy):
         """Handle the analysis completion event by updating the visualization"""
-        self.graph_visualization_panel.set_graph_data(graph, hierarchy) 
\ No newline at end of file
+        self.graph_visualization_panel.set_graph_data(graph, hierarchy)
+
+    def on_analysis_started(self, patches_graph):
+        """Lock the visualization and filter while the worker patches the graph they are showing"""
+        if patches_graph:
+            self.graph_visualization_panel.setEnabled(False)
+            self.filter_panel.setEnabled(False)
+
+    def on_analysis_stopped(self):
+        self.graph_visualization_panel.setEnabled(True)
+        self.filter_panel.setEnabled(True)
+    
+    def on_filter_changed(self):
+        self.graph_visualization_panel.set_filter(self.filter_panel.module_filter_input.text())
+    
+    def on_filter_cleared(self):
+        self.filter_panel.module_filter_input.clear()
+        self.graph_visualization_panel.set_filter('')
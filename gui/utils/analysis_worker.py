@@ -0,0 +1,97 @@
+import threading
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from Model.common import AnalysisCancelled
+
+# Minimum seconds between two progress signals within a stage
+PROGRESS_INTERVAL = 0.05
+
+
+class AnalysisWorker(QObject):
+    """Runs a clone or analysis task on a QThread, away from the GUI thread.
+
+    The task gets the worker's report method as its progress callback and
+    passes it down to the Model, which calls it at its checkpoints. Each call
+    is turned into a progress signal (throttled to one per PROGRESS_INTERVAL
+    within a stage) and raises AnalysisCancelled once cancel() was called,
+    so cancellation is cooperative and happens at the next checkpoint.
+
+    Usage:
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+    """
+
+    # stage, items done, items in the stage (0 if unknown), items per second
+    progress = pyqtSignal(str, int, int, float)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, task):
+        """
+        Args:
+            task: Callable taking a progress callback; what it returns is sent with completed
+        """
+        super().__init__()
+        self.task = task
+        self._cancel_requested = threading.Event()
+        self._stage = None
+        self._stage_started = 0.0
+        # Items already done when the stage started (e.g. files found in the scan cache)
+        self._stage_start_done = 0
+        self._last_signal = 0.0
+
+    def cancel(self):
+        """Ask the task to stop at its next checkpoint. Safe to call from any thread."""
+        self._cancel_requested.set()
+
+    def is_cancel_requested(self):
+        return self._cancel_requested.is_set()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.task(self.report)
+        except AnalysisCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+        else:
+            self.completed.emit(result)
+
+    def report(self, stage, done=0, total=0):
+        """Progress callback of the task, raising AnalysisCancelled when cancel() was called."""
+        if self._cancel_requested.is_set():
+            raise AnalysisCancelled(stage)
+        now = time.perf_counter()
+        if stage != self._stage:
+            self._stage = stage
+            self._stage_started = now
+            self._stage_start_done = done
+        elif done < total and now - self._last_signal < PROGRESS_INTERVAL:
+            return
+        self._last_signal = now
+        elapsed = now - self._stage_started
+        rate = (done - self._stage_start_done) / elapsed if elapsed > 0 else 0.0
+        self.progress.emit(stage, done, total, rate)
+
+
+def describe_progress(stage, done, total, rate):
+    """
+    One line summary of a progress signal, with the throughput and an ETA when they are known.
+
+    Example:
+        ('scan', 1200, 5000, 800.0) -> 'scan: 1200/5000 (800/s, ETA 5s)'
+    """
+    if not total:
+        return f"{stage}..."
+    text = f"{stage}: {done}/{total}"
+    if rate <= 0 or done >= total:
+        return text
+    seconds = round((total - done) / rate)
+    eta = f"{seconds // 60}m {seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
+    return f"{text} ({rate:.0f}/s, ETA {eta})"
@@ -1,18 +1,124 @@
 import re
 import git
+from git.cmd import handle_process_output
+from git.util import finalize_process
 import os
 import shutil
+from pathlib import Path
+
+from Model.common import AnalysisCancelled, report_progress
+from constants import IGNORE_FILE_NAME, LEAN_CLONE
+
+# Everything a lean clone checks out (sparse-checkout patterns, gitignore syntax)
+LEAN_CLONE_PATTERNS = ['*.py', f'/{IGNORE_FILE_NAME}']
 
 def is_valid_github_url(url):
     github_pattern = r'^https?://github\.com/[a-zA-Z0-9-]+/[a-zA-Z0-9._-]+/?$'
     return bool(re.match(github_pattern, url))
 
-def clone_repository(url, path):
-    """Clone a repository from URL to path."""
+class CloneProgress(git.RemoteProgress):
+    """Forwards git's clone progress ('receiving objects 120/4000', ...) to a progress callback.
+
+    git reports progress on a reader thread, where an exception would only
+    stop the reading. A cancellation is therefore recorded here, the git
+    process given to run_git() is terminated, and check_cancelled() raises
+    AnalysisCancelled once the command returned.
+    """
+
+    STAGES = {
+        git.RemoteProgress.COUNTING: 'clone: counting objects',
+        git.RemoteProgress.COMPRESSING: 'clone: compressing objects',
+        git.RemoteProgress.RECEIVING: 'clone: receiving objects',
+        git.RemoteProgress.RESOLVING: 'clone: resolving deltas',
+        git.RemoteProgress.CHECKING_OUT: 'clone: checking out files',
+    }
+
+    def __init__(self, progress):
+        super().__init__()
+        self.progress = progress
+        self.cancelled = False
+        # git process reporting to this object, terminated on cancellation
+        self.process = None
+
+    def update(self, op_code, cur_count, max_count=None, message=''):
+        stage = self.STAGES.get(op_code & self.OP_MASK, 'clone')
+        try:
+            report_progress(self.progress, stage, int(cur_count or 0), int(max_count or 0))
+        except AnalysisCancelled:
+            self.cancelled = True
+            if self.process is not None:
+                self.process.proc.terminate()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise AnalysisCancelled('clone')
+
+
+def run_git(clone_progress, command, *args, working_dir=None, **options):
+    """
+    Run a git command with --progress, reporting to clone_progress.
+
+    Unlike Repo.clone_from, this keeps the git process, so a cancellation
+    stops it right away rather than after a large clone has finished.
+
+    Args:
+        clone_progress: CloneProgress told about the command's progress
+        command: git command to run ('clone', 'checkout', ...)
+        working_dir: Repository to run it in, None for the current directory
+        options: Command options in GitPython's keyword form (depth=1 for --depth=1)
+    """
+    process = getattr(git.Git(working_dir), command)(*args, progress=True, as_process=True,
+                                                      universal_newlines=True, **options)
+    clone_progress.process = process
+    try:
+        handle_process_output(process, None, clone_progress.new_message_handler(), finalize_process,
+                              decode_streams=False)
+    except git.GitCommandError:
+        # A terminated git exits with an error
+        clone_progress.check_cancelled()
+        raise
+    finally:
+        clone_progress.process = None
+    clone_progress.check_cancelled()
+
+
+def clone_repository(url, path, lean=LEAN_CLONE, progress=None):
+    """Clone a repository from URL to path.
+    
+    A lean clone only fetches the latest commit (shallow), downloads file
+    contents on demand (partial clone, blob:none filter) and checks out
+    nothing but Python sources (sparse checkout). Servers that do not support
+    filtering fall back to sending every blob of that one commit.
+    
+    A progress callback is told about every step of the clone. Cancelling
+    it terminates the running git command.
+    """
     if os.path.exists(path):
         shutil.rmtree(path)
     os.makedirs(path)
-    git.Repo.clone_from(url, path)
+    if lean:
+        lean_clone_repository(url, path, progress)
+    else:
+        run_git(CloneProgress(progress), 'clone', '--', url, path)
+
+def lean_clone_repository(url, path, progress=None):
+    """Shallow, blob-filtered clone with a sparse checkout of LEAN_CLONE_PATTERNS."""
+    # git ignores --depth and --filter for plain local paths, but not for file:// URLs
+    if os.path.isdir(url):
+        url = Path(os.path.abspath(url)).as_uri()
+    run_git(CloneProgress(progress), 'clone', '--', url, path, depth=1, filter='blob:none', sparse=True,
+            no_checkout=True)
+    report_progress(progress, 'clone: sparse checkout')
+    repo = git.Repo(path)
+    repo.git.sparse_checkout('set', '--no-cone', *LEAN_CLONE_PATTERNS)
+    # The checkout downloads the blobs of the Python sources, the bulk of a lean clone
+    run_git(CloneProgress(progress), 'checkout', working_dir=path)
+    return repo
+
+def pull_repository(path, progress=None):
+    """Pull the latest commits of the current branch of the repository at path."""
+    report_progress(progress, 'pull')
+    git.Repo(path).remotes.origin.pull()
 
 def clear_repository(path):
     """Clear the contents of a directory."""
@@ -0,0 +1,39 @@
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class GraphBridge(QObject):
+    """Object shared with the graph viewer page over QWebChannel, as `bridge`.
+
+    Python to page: diffPushed carries the node and edge changes of a level
+    as JSON (one string crosses the channel much faster than nested
+    QVariants), physicsChanged carries the JSON network options that switch
+    live physics on or off.
+    Page to Python: the slots below, with structured arguments, replacing
+    messages scraped from the console.
+    """
+
+    diffPushed = pyqtSignal(str)
+    physicsChanged = pyqtSignal(str)
+
+    def __init__(self, panel):
+        """
+        Args:
+            panel: GraphVisualizationPanel handling the page's events
+        """
+        super().__init__()
+        self.panel = panel
+
+    @pyqtSlot()
+    def pageReady(self):
+        """The page has connected to the channel and can take diffs."""
+        self.panel.handle_page_ready()
+
+    @pyqtSlot('QVariantMap')
+    def nodeClicked(self, node):
+        """A node was clicked, with its DataSet item (id, label, title, ...)."""
+        self.panel.handle_node_click(node)
+
+    @pyqtSlot(float)
+    def stableFrame(self, milliseconds):
+        """The last pushed diff is drawn in its final layout, milliseconds after it arrived."""
+        self.panel.handle_stable_frame(milliseconds)
@@ -0,0 +1,213 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from constants import FORCE_LAYOUT_MAX_NODES, LAYOUT_ITERATIONS, NODE_SPACING
+
+# Angle between consecutive points of a sunflower spiral
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+# Pull of the force-directed layout towards the centre, relative to the distance from it
+GRAVITY = 1.0
+
+
+def layout_network(nodes, edges, known_positions=None, seed=0):
+    """
+    Give every vis node fixed x/y coordinates, so the page can skip physics.
+
+    Levels of up to FORCE_LAYOUT_MAX_NODES nodes get a force-directed layout;
+    larger ones a spiral in breadth-first order, which is linear in the
+    size of the level. Nodes with a known position keep it and only the
+    others are placed, next to their neighbours.
+
+    Args:
+        nodes: vis node dicts, updated in place with 'x' and 'y'
+        edges: vis edge dicts referring to the node IDs
+        known_positions: {node ID: (x, y)} of nodes laid out before
+        seed: Seed of the random start positions
+
+    Returns:
+        int: Number of nodes that had to be placed
+    """
+    if not nodes:
+        return 0
+    known_positions = known_positions or {}
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    sources = np.fromiter((index[edge['from']] for edge in edges), dtype=np.int64, count=len(edges))
+    targets = np.fromiter((index[edge['to']] for edge in edges), dtype=np.int64, count=len(edges))
+    pinned = np.fromiter((node['id'] in known_positions for node in nodes), dtype=bool, count=len(nodes))
+
+    if pinned.any():
+        positions = np.zeros((len(nodes), 2))
+        positions[pinned] = [known_positions[node['id']] for node in nodes if node['id'] in known_positions]
+        if not pinned.all():
+            known = positions[pinned]
+            positions = seed_new_positions(positions, pinned, sources, targets, seed=seed)
+            if len(nodes) <= FORCE_LAYOUT_MAX_NODES:
+                positions = force_directed_positions(len(nodes), sources, targets, seed=seed,
+                                                     initial=positions, pinned=pinned)
+            positions[pinned] = known
+    elif len(nodes) <= FORCE_LAYOUT_MAX_NODES:
+        positions = force_directed_positions(len(nodes), sources, targets, seed=seed)
+    else:
+        positions = spiral_positions(len(nodes), sources, targets)
+
+    for node, (x, y) in zip(nodes, np.rint(positions).astype(int).tolist()):
+        node['x'] = x
+        node['y'] = y
+    return int(len(nodes) - pinned.sum())
+
+
+def force_directed_positions(node_count, sources, targets, iterations=LAYOUT_ITERATIONS, seed=0,
+                             initial=None, pinned=None):
+    """
+    Fruchterman-Reingold layout with every pairwise repulsion computed as one array operation.
+
+    Args:
+        node_count: Number of nodes
+        sources: Node indices of the edge sources
+        targets: Node indices of the edge targets
+        iterations: Number of simulation steps
+        seed: Seed of the random start positions
+        initial: (node_count, 2) start positions, random when not given
+        pinned: Boolean mask of the nodes that must not move
+
+    Returns:
+        np.ndarray: (node_count, 2) positions, scaled so the ideal distance is NODE_SPACING
+        and centred on 0 when no start positions were given
+    """
+    # Ideal distance between nodes when they fill the unit square
+    k = 1 / math.sqrt(node_count)
+    scale = NODE_SPACING / k
+    if initial is None:
+        rng = np.random.default_rng(seed)
+        x, y = (rng.random((2, node_count)) - 0.5).astype(np.float32)
+    else:
+        x, y = (np.asarray(initial).T / scale).astype(np.float32)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    not_self = sources != targets
+    sources, targets = sources[not_self], targets[not_self]
+
+    for _ in range(iterations):
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        # Repulsion k^2 / d along the unit vector between every pair of nodes
+        factor = dx * dx
+        factor += dy * dy
+        np.maximum(factor, 1e-6, out=factor)
+        np.divide(k * k, factor, out=factor)
+        move_x = (dx * factor).sum(axis=1)
+        move_y = (dy * factor).sum(axis=1)
+
+        # Attraction d^2 / k along each edge
+        edge_x = x[sources] - x[targets]
+        edge_y = y[sources] - y[targets]
+        pull = np.sqrt(edge_x * edge_x + edge_y * edge_y) / k
+        np.add.at(move_x, sources, -edge_x * pull)
+        np.add.at(move_x, targets, edge_x * pull)
+        np.add.at(move_y, sources, -edge_y * pull)
+        np.add.at(move_y, targets, edge_y * pull)
+
+        # Gravity towards the centre, so unconnected nodes do not drift off
+        move_x -= GRAVITY * x
+        move_y -= GRAVITY * y
+
+        length = np.maximum(np.sqrt(move_x * move_x + move_y * move_y), 1e-9)
+        step = np.minimum(length, temperature) / length
+        if pinned is not None:
+            step[pinned] = 0
+        x += move_x * step
+        y += move_y * step
+        temperature -= cooling
+
+    positions = np.column_stack((x, y)).astype(np.float64)
+    if initial is None:
+        positions -= positions.mean(axis=0)
+    return positions * scale
+
+
+def seed_new_positions(positions, pinned, sources, targets, seed=0):
+    """
+    Start positions of the nodes missing from an earlier layout.
+
+    A new node goes near the average position of its pinned neighbours. New
+    nodes without any go on a spiral around the nodes already placed.
+
+    Args:
+        positions: (node_count, 2) positions, read for the pinned nodes
+        pinned: Boolean mask of the nodes that keep their position
+        sources: Node indices of the edge sources
+        targets: Node indices of the edge targets
+        seed: Seed of the random offsets
+
+    Returns:
+        np.ndarray: Copy of positions with the new nodes filled in
+    """
+    positions = positions.copy()
+    new = ~pinned
+    totals = np.zeros_like(positions)
+    counts = np.zeros(len(positions))
+    for node, neighbour in ((sources, targets), (targets, sources)):
+        linked = new[node] & pinned[neighbour]
+        np.add.at(totals, node[linked], positions[neighbour[linked]])
+        np.add.at(counts, node[linked], 1)
+
+    rng = np.random.default_rng(seed)
+    near = new & (counts > 0)
+    positions[near] = totals[near] / counts[near, None] + rng.normal(scale=NODE_SPACING / 2, size=(near.sum(), 2))
+
+    # Continue the spiral outwards from the known layout, one NODE_SPACING-sized area per node
+    loose = np.flatnonzero(new & (counts == 0))
+    inner_radius = np.hypot(*positions[pinned].T).max() + NODE_SPACING
+    steps = np.arange(len(loose))
+    radius = np.sqrt(inner_radius ** 2 + (steps + 0.5) * NODE_SPACING ** 2 / math.pi)
+    positions[loose, 0] = radius * np.cos(steps * GOLDEN_ANGLE)
+    positions[loose, 1] = radius * np.sin(steps * GOLDEN_ANGLE)
+    return positions
+
+
+def spiral_positions(node_count, sources, targets):
+    """
+    Sunflower spiral filled in breadth-first order from the best connected nodes.
+
+    Neighbours end up on nearby turns of the spiral and unconnected nodes on
+    the outside, at NODE_SPACING apart.
+
+    Args:
+        node_count: Number of nodes
+        sources: Node indices of the edge sources
+        targets: Node indices of the edge targets
+
+    Returns:
+        np.ndarray: (node_count, 2) positions
+    """
+    neighbours = [[] for _ in range(node_count)]
+    for source, target in zip(sources.tolist(), targets.tolist()):
+        neighbours[source].append(target)
+        neighbours[target].append(source)
+
+    degrees = np.bincount(np.concatenate((sources, targets)), minlength=node_count)
+    order = []
+    visited = np.zeros(node_count, dtype=bool)
+    for start in np.argsort(-degrees, kind='stable').tolist():
+        if visited[start]:
+            continue
+        visited[start] = True
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbour in neighbours[node]:
+                if not visited[neighbour]:
+                    visited[neighbour] = True
+                    queue.append(neighbour)
+
+    # A point per NODE_SPACING-sized area: r = c * sqrt(i) with pi * c^2 = NODE_SPACING^2
+    steps = np.arange(node_count)
+    radius = NODE_SPACING / math.sqrt(math.pi) * np.sqrt(steps + 0.5)
+    angle = steps * GOLDEN_ANGLE
+    positions = np.empty((node_count, 2))
+    positions[order, 0] = radius * np.cos(angle)
+    positions[order, 1] = radius * np.sin(angle)
+    return positions
@@ -0,0 +1,184 @@
+import copy
+import json
+import os
+from pathlib import Path
+
+from constants import LIVE_PHYSICS, VIS_LIBRARY_FOLDER
+
+# Bundled vis-network files, relative to VIS_LIBRARY_FOLDER
+VIS_SCRIPT = "vis-9.1.2/vis-network.min.js"
+VIS_STYLESHEET = "vis-9.1.2/vis-network.css"
+
+NETWORK_OPTIONS = {
+    "nodes": {
+        "font": {
+            "size": 14,
+            "face": "Tahoma"
+        }
+    },
+    "edges": {
+        "color": {
+            "inherit": False
+        },
+        "smooth": {
+            "enabled": True,
+            "type": "dynamic"
+        },
+        "arrows": {
+            "to": {
+                "enabled": True,
+                "scaleFactor": 0.5
+            }
+        },
+        "font": {
+            "size": 12,
+            "color": "#000000",
+            "align": "middle",
+            "background": "rgba(255, 255, 255, 0.7)",
+            "strokeWidth": 0,
+            "strokeColor": "#ffffff"
+        }
+    },
+    "physics": {
+        "forceAtlas2Based": {
+            "gravitationalConstant": -50,
+            "centralGravity": 0.01,
+            "springLength": 150,
+            "springConstant": 0.08
+        },
+        "minVelocity": 0.75,
+        "solver": "forceAtlas2Based",
+        "stabilization": {
+            "enabled": True,
+            "iterations": 1000,
+            "updateInterval": 25
+        }
+    },
+    "interaction": {
+        "navigationButtons": True,
+        "keyboard": True,
+        "hover": True
+    }
+}
+
+# The persistent viewer of the visualization panel. It is loaded once with
+# empty DataSets; GraphBridge then pushes the changes of every level shown, and
+# the page reports clicks and stable frames back, all over QWebChannel.
+VIEWER_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<link rel="stylesheet" href="{stylesheet}">
+<script src="{script}"></script>
+<script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+<style type="text/css">
+html, body {{ margin: 0; width: 100%; height: 100%; }}
+#mynetwork {{ width: 100%; height: 100%; background-color: #ffffff; }}
+</style>
+</head>
+<body>
+<div id="mynetwork"></div>
+<script type="text/javascript">
+var nodes = new vis.DataSet([]);
+var edges = new vis.DataSet([]);
+var container = document.getElementById("mynetwork");
+var network = new vis.Network(container, {{nodes: nodes, edges: edges}}, {options});
+var bridge = null;
+// Listener waiting to report the frame of the last diff, if it has not fired yet
+var pendingFrame = null;
+network.on("click", function(params) {{
+    if (bridge && params.nodes.length > 0) {{
+        bridge.nodeClicked(nodes.get(params.nodes[0]));
+    }}
+}});
+function setOptions(options) {{
+    // Physics and edge smoothing are switched together, as network_options() sets them
+    network.setOptions(options);
+}}
+function applyDiff(diff) {{
+    var started = performance.now();
+    if (diff.options) {{
+        network.setOptions(diff.options);
+    }}
+    // A diff that moves nothing may never stabilize, so it only waits for the redraw
+    var changed = diff.nodes.remove.length + diff.nodes.update.length
+        + diff.edges.remove.length + diff.edges.update.length > 0;
+    var frameEvent = diff.physics && changed ? "stabilized" : "afterDrawing";
+    // A listener left over from the previous diff would report this level's frame
+    if (pendingFrame) {{
+        network.off(pendingFrame.event, pendingFrame.handler);
+    }}
+    pendingFrame = {{event: frameEvent, handler: function() {{
+        network.off(frameEvent, pendingFrame.handler);
+        pendingFrame = null;
+        bridge.stableFrame(performance.now() - started);
+    }}}};
+    network.on(frameEvent, pendingFrame.handler);
+    edges.remove(diff.edges.remove);
+    nodes.remove(diff.nodes.remove);
+    nodes.update(diff.nodes.update);
+    edges.update(diff.edges.update);
+    // Fitting redraws the view, so a level without changes still reports its frame
+    network.fit();
+    if (diff.physics) {{
+        network.startSimulation();
+    }}
+}}
+new QWebChannel(qt.webChannelTransport, function(channel) {{
+    bridge = channel.objects.bridge;
+    bridge.diffPushed.connect(function(payload) {{ applyDiff(JSON.parse(payload)); }});
+    bridge.physicsChanged.connect(function(payload) {{ setOptions(JSON.parse(payload)); }});
+    bridge.pageReady();
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def vis_library_path(relative_path):
+    return os.path.join(os.path.abspath(VIS_LIBRARY_FOLDER), relative_path)
+
+
+def vis_library_available():
+    return os.path.exists(vis_library_path(VIS_SCRIPT))
+
+
+def network_options(live_physics=LIVE_PHYSICS):
+    """
+    NETWORK_OPTIONS for nodes placed by the precomputed layout.
+
+    Args:
+        live_physics: Keep the physics simulation running, starting from the layout
+
+    Returns:
+        dict: A copy of NETWORK_OPTIONS
+    """
+    options = copy.deepcopy(NETWORK_OPTIONS)
+    options["physics"]["enabled"] = live_physics
+    if not live_physics:
+        # Dynamic smoothing adds support nodes to the physics simulation
+        options["edges"]["smooth"] = {"enabled": True, "type": "continuous"}
+    return options
+
+
+def render_viewer_page(options=None):
+    """
+    Build the persistent viewer page, whose levels are pushed over QWebChannel.
+
+    Args:
+        options: vis-network options, network_options() when not given
+
+    Returns:
+        str: The complete page
+    """
+    return VIEWER_PAGE_TEMPLATE.format(
+        stylesheet=Path(vis_library_path(VIS_STYLESHEET)).as_uri(),
+        script=Path(vis_library_path(VIS_SCRIPT)).as_uri(),
+        options=_script_json(network_options() if options is None else options),
+    )
+
+
+def _script_json(value):
+    # '</' would end the script element early if a name or title contained it
+    return json.dumps(value).replace('</', '<\\/')
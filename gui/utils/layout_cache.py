@@ -0,0 +1,99 @@
+import json
+import os
+
+from constants import LAYOUT_CACHE_FILE, LAYOUT_CACHE_COMMITS, LAYOUT_CACHE_REPOSITORIES
+
+# Bump whenever the layouts stored by an older version should not be reused
+CACHE_VERSION = 2
+
+
+class LayoutCache:
+    """On-disk cache of the node positions of every graph level seen.
+
+    Positions are kept per repository, hierarchy path and commit, as
+    {node ID: [x, y]}. A level of a commit without positions of its own
+    starts from those of the most recently stored commit of the same
+    repository, so after a small change only the new nodes need placing.
+    Only the LAYOUT_CACHE_COMMITS latest commits of a level, and the
+    LAYOUT_CACHE_REPOSITORIES most recently stored repositories, are kept.
+    """
+
+    def __init__(self, cache_file=LAYOUT_CACHE_FILE, max_commits=LAYOUT_CACHE_COMMITS,
+                 max_repositories=LAYOUT_CACHE_REPOSITORIES):
+        self.cache_file = cache_file
+        self.max_commits = max_commits
+        self.max_repositories = max_repositories
+        # {repository: {path: {commit: {node ID: [x, y]}}}}, repositories and the
+        # commits of a path both ordered from least to most recently stored
+        self.repositories = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Read the cache file, starting empty if it is missing, corrupt or outdated."""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable layout cache {self.cache_file}: {str(e)}")
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.repositories = data.get('repositories', {})
+
+    def save(self):
+        """Write the cache back to disk if anything changed since it was loaded."""
+        if not self._dirty:
+            return
+        temp_file = self.cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'repositories': self.repositories}, f)
+        os.replace(temp_file, self.cache_file)
+        self._dirty = False
+
+    def lookup(self, repository, commit, path):
+        """
+        Get the known node positions of a level.
+
+        Args:
+            repository: Identity of the analysed repository (see current_repository)
+            commit: Commit of the analysed repository (None outside git)
+            path: Hierarchy path of the level
+
+        Returns:
+            dict: {node ID: [x, y]} of this commit, else of the latest stored commit, else empty
+        """
+        commits = self.repositories.get(repository, {}).get(path)
+        if not commits:
+            self.misses += 1
+            return {}
+        self.hits += 1
+        positions = commits.get(commit or '')
+        if positions is None:
+            positions = commits[next(reversed(commits))]
+        return positions
+
+    def store(self, repository, commit, path, nodes):
+        """Record the positions of laid out vis nodes, keeping those of nodes not shown now."""
+        commit = commit or ''
+        if next(reversed(self.repositories), None) != repository:
+            # Reinserting keeps the repositories ordered from least to most recently stored
+            self.repositories[repository] = self.repositories.pop(repository, {})
+            while len(self.repositories) > self.max_repositories:
+                del self.repositories[next(iter(self.repositories))]
+            self._dirty = True
+        commits = self.repositories[repository].setdefault(path, {})
+        positions = commits.pop(commit, {})
+        for node in nodes:
+            position = [node['x'], node['y']]
+            if positions.get(node['id']) != position:
+                positions[node['id']] = position
+                self._dirty = True
+        # Reinserting keeps the commits ordered from least to most recently stored
+        commits[commit] = positions
+        while len(commits) > self.max_commits:
+            del commits[next(iter(commits))]
+            self._dirty = True
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+from constants import RENDER_CACHE_SIZE
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered graph levels.
+    
+    Entries are keyed by (graph version, level path, active filter), so a
+    level that was looked at before is shown again without rebuilding its
+    network. Clear it whenever a new analysis replaces or patches the graph.
+    """
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Rendered output for key, or None if it is not cached."""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, rendered):
+        self.entries[key] = rendered
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,144 @@
+from constants import LIVE_PHYSICS
+from .html_template import network_options
+
+PACKAGE_NODE_STYLE = {"color": "#ff9900", "shape": "box", "size": 25}
+MODULE_NODE_STYLE = {"color": "#66ccff", "shape": "dot", "size": 15}
+PACKAGE_EDGE_STYLE = {"color": "#e08214", "width": 2}
+MODULE_EDGE_STYLE = {"color": "#3182bd", "width": 1.5}
+
+
+def level_network(hierarchy, path='', module_filter=''):
+    """
+    Nodes and edges of one hierarchy level, as vis-network DataSet items.
+
+    Builds the plain dicts vis.DataSet takes straight from the level view and
+    its aggregated dependencies. Node IDs are kept in a set, so the cost is
+    linear in the size of the level, where pyvis' Network checks every new
+    node and edge against a list of all nodes so far.
+
+    Args:
+        hierarchy: ModuleHierarchy of the analysed graph
+        path: Package path of the level ('' for the root)
+        module_filter: Glob pattern of the modules and packages to show, '' for all
+
+    Returns:
+        tuple: (nodes, edges) as lists of dicts, ready for vis DataSets
+    """
+    level_view = hierarchy.get_level_view(path)
+    prefix = path + '.' if path else ''
+    nodes = []
+    node_ids = set()
+
+    def add_node(node_id, title, style):
+        # The first node with an ID wins, as with pyvis
+        if node_id not in node_ids:
+            node_ids.add(node_id)
+            nodes.append({"id": node_id, "label": node_id, "title": title, **style})
+
+    # Package nodes (orange boxes), keyed by their name within the level
+    for package in level_view['packages']:
+        full_path = prefix + package
+        if hierarchy.matches_filter(full_path, module_filter):
+            add_node(package, full_path, PACKAGE_NODE_STYLE)
+
+    # Module nodes (blue circles), keyed by their name relative to the level
+    for module in level_view['modules']:
+        module_name = module.name
+        if not hierarchy.matches_filter(module_name, module_filter):
+            continue
+        display_name = module_name[len(prefix):] if prefix and module_name.startswith(prefix) else module_name
+        add_node(display_name, module_name, MODULE_NODE_STYLE)
+
+    edges = []
+    for (source, target), weight in hierarchy.get_aggregated_dependencies(path).items():
+        source_display, target_display = _edge_ends(prefix, source, target)
+        # Skip edges to nodes that are not shown (they may be filtered out)
+        if source_display not in node_ids or target_display not in node_ids:
+            continue
+
+        between_packages = prefix and source.startswith(prefix) and target.startswith(prefix) and source != target
+        edges.append({
+            "id": f"{source_display}->{target_display}",
+            "from": source_display,
+            "to": target_display,
+            "label": str(weight),  # Display the dependency count
+            "title": f"{source} → {target}: {weight} dependencies",
+            "arrows": {"to": True},
+            **(PACKAGE_EDGE_STYLE if between_packages else MODULE_EDGE_STYLE),
+        })
+    return nodes, edges
+
+
+def _edge_ends(prefix, source, target):
+    """Node IDs of an aggregated dependency's ends within the level."""
+    if not prefix:
+        return source, target
+    source_inside = source.startswith(prefix)
+    target_inside = target.startswith(prefix)
+    if source_inside and target_inside:
+        # Package to package
+        return source.rpartition('.')[2], target.rpartition('.')[2]
+    if source_inside:
+        # Module within the current package to a package
+        return source[len(prefix):], target
+    return source, target
+
+
+def dataset_diff(shown, items):
+    """
+    Changes that turn the items of a vis DataSet into new ones.
+
+    Args:
+        shown: {ID: item} of the items in the DataSet now
+        items: Items it should hold instead, each with an 'id'
+
+    Returns:
+        dict: {'update': new or changed items, 'remove': IDs of the items to drop},
+        for DataSet.update and DataSet.remove
+    """
+    ids = {item['id'] for item in items}
+    return {
+        'update': [item for item in items if shown.get(item['id']) != item],
+        'remove': [item_id for item_id in shown if item_id not in ids],
+    }
+
+
+class ViewerState:
+    """What the persistent viewer page shows, so every change is sent as a diff against it."""
+
+    def __init__(self, live_physics=LIVE_PHYSICS):
+        self.nodes = {}  # {ID: item} in the page's DataSets
+        self.edges = {}
+        self.physics = live_physics  # Physics setting of the options in the page
+
+    def level_diff(self, nodes, edges, live_physics):
+        """
+        Payload of diffPushed that shows a level, recorded as shown from now on.
+
+        Args:
+            nodes: vis nodes of the level
+            edges: vis edges of the level
+            live_physics: Physics setting the level should be shown with
+
+        Returns:
+            dict: DataSet diffs of the nodes and edges, with the network options
+            only when the physics setting differs from the page's
+        """
+        diff = {
+            'nodes': dataset_diff(self.nodes, nodes),
+            'edges': dataset_diff(self.edges, edges),
+            'physics': live_physics,
+        }
+        options = self.physics_options(live_physics)
+        if options is not None:
+            diff['options'] = options
+        self.nodes = {node['id']: node for node in nodes}
+        self.edges = {edge['id']: edge for edge in edges}
+        return diff
+
+    def physics_options(self, live_physics):
+        """Network options that switch the page to a physics setting, or None if it has it already."""
+        if live_physics == self.physics:
+            return None
+        self.physics = live_physics
+        return network_options(live_physics)
@@ -1,30 +1,49 @@
 #!/usr/bin/env python3
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from GUI.main_window import MainWindow
-from constants import CODE_ROOT_FOLDER, HTML_OUTPUT_FOLDER, ASSETS_FOLDER
-from GUI.utils.pyvis_assets import ensure_pyvis_assets_available
+import argparse
+from constants import CODE_ROOT_FOLDER, HTML_OUTPUT_FOLDER
+from Model.history import HistoryAnalyser, write_history_csv
 
 
 def ensure_folders_exist():
     """Make sure all required folders exist"""
     os.makedirs(CODE_ROOT_FOLDER, exist_ok=True)
     os.makedirs(HTML_OUTPUT_FOLDER, exist_ok=True)
-    os.makedirs(ASSETS_FOLDER, exist_ok=True)
-    ensure_pyvis_assets_available()
 
 
 def run_with_gui():
+    # Qt is only imported here, so history mode runs without a display
+    from PyQt5.QtWidgets import QApplication
+    from gui.main_window import MainWindow
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
     sys.exit(app.exec_())
 
 
-def main():
-    ensure_folders_exist()
-    run_with_gui()
+def run_history(revision_range, max_commits, csv_file):
+    snapshots = HistoryAnalyser().analyse(revision_range, max_commits)
+    for snapshot in snapshots:
+        print(f"{snapshot.commit[:8]} {snapshot.committed_date:%Y-%m-%d} {snapshot.metrics}")
+    if csv_file:
+        write_history_csv(snapshots, csv_file)
+        print(f"Metrics written to {csv_file}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ArcRecovery")
+    parser.add_argument('--history', metavar='RANGE',
+                        help="analyse the commits in RANGE (e.g. v1.0..HEAD) of the cloned repository instead of opening the GUI")
+    parser.add_argument('--max-commits', type=int, default=None)
+    parser.add_argument('--output', metavar='CSV', help="write the history metrics to this CSV file")
+    args = parser.parse_args(argv)
+
+    if args.history:
+        run_history(args.history, args.max_commits, args.output)
+    else:
+        ensure_folders_exist()
+        run_with_gui()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file